@@ -0,0 +1,148 @@
+# examples/load_test.py
+"""Closed-loop load test for the HTTP API.
+
+    python -m examples.load_test --spawn --concurrency 32 --duration 20
+
+With ``--spawn`` a local server is started on the offline fake backend
+(``LLM_BACKEND=fake``, ``FAKE_LLM_LATENCY`` per model call), so the test
+measures the serving stack rather than the model provider.
+"""
+from typing import Dict, List
+from collections import Counter
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+import numpy as np
+
+QUERIES = [
+    "What is the current ER wait time?",
+    "How many ICU beds are available right now?",
+    "Is the surgery department adequately staffed tonight?",
+    "Show patient satisfaction trends for the weekly report",
+    "URGENT: ER overflow, where can we divert incoming patients?",
+    "What equipment maintenance is due in pediatrics?",
+    "Which departments are over the optimal bed utilization?",
+    "How long are patients waiting in the emergency room?"
+]
+
+
+def _worker(host: str, port: int, stop: float, index: int, statuses: Counter,
+            latencies: List[float], lock: threading.Lock) -> None:
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    sent = 0
+    while time.monotonic() < stop:
+        body = json.dumps({"query": QUERIES[(index + sent) % len(QUERIES)]})
+        started = time.perf_counter()
+        try:
+            connection.request("POST", "/v1/query", body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=60)
+            status = "connection error"
+        elapsed = time.perf_counter() - started
+        with lock:
+            statuses[status] += 1
+            latencies.append(elapsed)
+        sent += 1
+        if status == 503:
+            time.sleep(0.05)
+    connection.close()
+
+
+def _metrics(host: str, port: int) -> Dict[str, float]:
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    connection.request("GET", "/metrics")
+    text = connection.getresponse().read().decode()
+    connection.close()
+    metrics = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            metrics[name] = float(value)
+    return metrics
+
+
+def _wait_ready(host: str, port: int, timeout: float = 30) -> None:
+    stop = time.monotonic() + timeout
+    while time.monotonic() < stop:
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on {host}:{port} did not become ready")
+
+
+def run(url: str, concurrency: int, duration: float) -> None:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    statuses: Counter = Counter()
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(host, port, stop, i, statuses, latencies, lock))
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = np.array(latencies) * 1000
+    print(f"{len(samples)} requests in {elapsed:.1f}s, {len(samples) / elapsed:.1f} req/s "
+          f"({concurrency} connections)")
+    print("statuses:", dict(statuses))
+    if len(samples):
+        print("latency ms: " + ", ".join(
+            f"p{pct}={np.percentile(samples, pct):.1f}" for pct in (50, 90, 95, 99)
+        ))
+    metrics = _metrics(host, port)
+    for name in ("healthcare_semantic_cache_hit_rate", "healthcare_coalescing_ratio", "healthcare_llm_calls_total"):
+        if name in metrics:
+            print(f"{name}: {metrics[name]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--spawn", action="store_true", help="start a local server on the fake backend")
+    parser.add_argument("--workers", type=int, default=1, help="server processes with --spawn")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        parts = urlsplit(args.url)
+        env = {"LLM_BACKEND": "fake", "FAKE_LLM_LATENCY": "0.05", "LOG_LEVEL": "WARNING", **os.environ}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.serving.server", "--host", parts.hostname,
+             "--port", str(parts.port or 80), "--workers", str(args.workers)],
+            env=env
+        )
+    try:
+        if server is not None:
+            _wait_ready(urlsplit(args.url).hostname, urlsplit(args.url).port or 80)
+        run(args.url, args.concurrency, args.duration)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 # src/agent.py
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Callable
+from collections import OrderedDict
+import re
+import time
 import uuid
 from datetime import datetime
 from langchain_core.messages import HumanMessage, SystemMessage, AnyMessage
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
 
 # Remove this line as it's causing the error
 # from langgraph.checkpoint import BaseCheckpointSaver
@@ -24,11 +26,22 @@ from .nodes import (
     StaffSchedulerNode,
     OutputSynthesizerNode
 )
+from .metrics import (
+    MetricsProvider,
+    get_metrics_provider,
+    get_metrics_archive,
+    get_anomaly_detector
+)
+from .llm import ModelPool, get_usage_ledger, get_rate_limiter
+from .llm.context import current_deadline, has_budget, request_scope
+from .serving.coalescing import SingleFlight
+from .serving.semantic_cache import SemanticCache
 from .tools import (
     PatientTools,
     ResourceTools,
     QualityTools,
-    SchedulingTools
+    SchedulingTools,
+    get_tool_executor
 )
 
 from .utils.logger import setup_logger
@@ -36,14 +49,22 @@ from .utils.error_handlers import (
     ErrorHandler, 
     HealthcareError, 
     ValidationError,  # Add this import
-    ProcessingError   # Add this import
+    ProcessingError,  # Add this import
+    DeadlineExceededError
 )
 
 
 logger = setup_logger(__name__)
 
+# Last full answers kept per query, served when a request has no time left
+RECENT_RESPONSES = 128
+
 class HealthcareAgent:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        metrics_provider: Optional[MetricsProvider] = None
+    ):
         try:
             # Initialize settings and validate
             self.settings = Settings()
@@ -51,21 +72,31 @@ class HealthcareAgent:
                 self.settings.OPENAI_API_KEY = api_key
             self.settings.validate_settings()
             
-            # Initialize LLM
-            self.llm = ChatOpenAI(
-                model=self.settings.MODEL_NAME,
-                temperature=self.settings.MODEL_TEMPERATURE,
-                api_key=self.settings.OPENAI_API_KEY
+            # Initialize LLM clients, shared per model configuration
+            self.model_pool = ModelPool(
+                overrides={"api_key": self.settings.OPENAI_API_KEY},
+                limiter=get_rate_limiter()
             )
+            self.llm = self.model_pool.for_node("default")
+            
+            # Shared, versioned metrics snapshot handed to every request
+            self.metrics_provider = metrics_provider or get_metrics_provider()
             
-            # Initialize tools
+            # Initialize tools; heavy computations run in the tool process pool
             self.tools = self._initialize_tools()
+            self.tool_executor = get_tool_executor()
             
             # Initialize nodes
             self.nodes = self._initialize_nodes()
             
             # Initialize conversation states (replacing checkpointer)
             self.conversation_states = {}
+            self.recent_responses: OrderedDict = OrderedDict()
+            
+            # Identical concurrent queries share one graph execution, and
+            # paraphrases of answered queries reuse the answer
+            self.single_flight = SingleFlight()
+            self.semantic_cache = SemanticCache() if Settings.SEMANTIC_CACHE_SIZE > 0 else None
             
             # Build graph
             self.graph = self._build_graph()
@@ -92,13 +123,21 @@ class HealthcareAgent:
     def _initialize_nodes(self) -> Dict:
         """Initialize all nodes in the agent workflow"""
         return {
-            "input_analyzer": InputAnalyzerNode(self.llm),
+            "input_analyzer": InputAnalyzerNode(self.model_pool.for_node("input_analyzer")),
             "task_router": TaskRouterNode(),
-            "patient_flow": PatientFlowNode(self.llm),
-            "resource_manager": ResourceManagerNode(self.llm),
-            "quality_monitor": QualityMonitorNode(self.llm),
-            "staff_scheduler": StaffSchedulerNode(self.llm),
-            "output_synthesizer": OutputSynthesizerNode(self.llm)
+            "patient_flow": PatientFlowNode(
+                self.model_pool.for_node("patient_flow"), self.metrics_provider
+            ),
+            "resource_manager": ResourceManagerNode(self.model_pool.for_node("resource_manager")),
+            "quality_monitor": QualityMonitorNode(
+                self.model_pool.for_node("quality_monitor"),
+                get_metrics_archive(),
+                get_anomaly_detector()
+            ),
+            "staff_scheduler": StaffSchedulerNode(self.model_pool.for_node("staff_scheduler")),
+            "output_synthesizer": OutputSynthesizerNode(
+                self.model_pool.for_node("output_synthesizer")
+            )
         }
 
     def _build_graph(self) -> StateGraph:
@@ -107,8 +146,14 @@ class HealthcareAgent:
             # Initialize graph
             builder = StateGraph(HospitalState)
             
-            # Add all nodes
+            # Add all nodes; model-calling nodes before synthesis leave
+            # time for the final answer and hand over when out of time, and
+            # nodes after classification call models in its priority lane
             for name, node in self.nodes.items():
+                if name not in ("task_router", "output_synthesizer"):
+                    node = self._with_synthesis_reserve(name, node)
+                if name != "input_analyzer":
+                    node = self._in_priority_lane(node)
                 builder.add_node(name, node)
             
             # Set entry point
@@ -159,23 +204,89 @@ class HealthcareAgent:
                 details={"error": str(e)}
             )
 
+    def _with_synthesis_reserve(self, name: str, node: Callable) -> Callable:
+        """Run a node with ``SYNTHESIS_RESERVE`` seconds kept back from its deadline"""
+        def run(state: HospitalState) -> Dict:
+            deadline = current_deadline()
+            reserve = None if deadline is None else deadline - Settings.SYNTHESIS_RESERVE
+            try:
+                with request_scope(deadline=reserve):
+                    return node(state)
+            except DeadlineExceededError:
+                logger.warning(f"{name} ran out of time, continuing to synthesis")
+                context = state.get("context", {})
+                return {
+                    "context": {
+                        **context,
+                        "degraded": list(context.get("degraded", [])) + [f"{name} timed out"]
+                    }
+                }
+        return run
+
+    @staticmethod
+    def _in_priority_lane(node: Callable) -> Callable:
+        """Run a node with the classified ``priority_level`` as the rate limiter lane"""
+        def run(state: HospitalState) -> Dict:
+            with request_scope(priority=state.get("priority_level")):
+                return node(state)
+        return run
+
+    @staticmethod
+    def _query_key(input_text: str) -> str:
+        """Query normalized for matching: lowercase words, no punctuation"""
+        return " ".join(re.findall(r"\w+", input_text.lower()))
+
+    def _cached_response(self, input_text: str) -> Optional[Dict]:
+        """Most recent full answer to the same query, marked as cached"""
+        cached = self.recent_responses.get(self._query_key(input_text))
+        if cached is None:
+            return None
+        return {**cached, "degraded": ["cached response"]}
+
+    def _remember_response(self, input_text: str, response: Dict) -> None:
+        key = self._query_key(input_text)
+        self.recent_responses[key] = response
+        self.recent_responses.move_to_end(key)
+        while len(self.recent_responses) > RECENT_RESPONSES:
+            self.recent_responses.popitem(last=False)
+
     @ErrorHandler.error_decorator
     def process(
         self,
         input_text: str,
         thread_id: Optional[str] = None,
-        context: Optional[Dict] = None
+        context: Optional[Dict] = None,
+        deadline: Optional[float] = None
     ) -> Dict:
-        """Process input through the healthcare operations workflow"""
+        """Process input through the healthcare operations workflow.
+
+        ``deadline`` is a ``time.monotonic()`` timestamp; it defaults to
+        ``Settings.REQUEST_TIMEOUT`` seconds from now. Model calls get the
+        remaining time as their timeout, and when time runs short the
+        specialist node is skipped or a recent answer is returned.
+
+        Concurrent requests for the same normalized query, context and
+        metrics version share one graph execution; each caller gets the
+        result under its own ``thread_id``. Without caller context, a
+        paraphrase of a query already answered for the current metrics
+        version is served from the semantic cache.
+        """
         try:
             # Validate input
             ErrorHandler.validate_input(input_text)
             
+            if deadline is None:
+                deadline = time.monotonic() + Settings.REQUEST_TIMEOUT
+            
             # Create or use thread ID
             thread_id = thread_id or str(uuid.uuid4())
             
-            # Initialize state
-            initial_state = create_initial_state(thread_id)
+            # Initialize state with the current shared metrics snapshot
+            metrics_version = self.metrics_provider.current
+            initial_state = create_initial_state(
+                thread_id, metrics_version.metrics, metrics_version.snapshot
+            )
+            initial_state["context"]["metrics_version"] = metrics_version.version
             
             # Add input message as HumanMessage object
             initial_state["messages"].append(
@@ -192,14 +303,45 @@ class HealthcareAgent:
             # Store state in conversation states
             self.conversation_states[thread_id] = initial_state
             
-            # Process through graph
-            result = self.graph.invoke(initial_state)
+            # Reuse the answer to a similar question about the same metrics
+            use_cache = self.semantic_cache is not None and not context
+            if use_cache:
+                cached = self.semantic_cache.lookup(input_text, metrics_version.version)
+                if cached is not None:
+                    return {**cached, "thread_id": thread_id}
             
-            return self._format_response(result)
+            # Process through graph, joining an identical in-flight request
+            key = (
+                self._query_key(input_text),
+                metrics_version.version,
+                repr(sorted(context.items())) if context else None
+            )
+            try:
+                response, shared = self.single_flight.do(
+                    key,
+                    lambda: self._run_graph(input_text, initial_state, deadline),
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except TimeoutError:
+                response = self._cached_response(input_text)
+                if response is None:
+                    raise DeadlineExceededError(
+                        message="Deadline passed waiting for an identical request",
+                        details={"thread_id": thread_id}
+                    )
+            else:
+                if use_cache and not shared and not response["degraded"]:
+                    self.semantic_cache.store(input_text, metrics_version.version, response)
+            
+            return {**response, "thread_id": thread_id}
             
         except ValidationError as ve:
             logger.error(f"Validation error: {str(ve)}")
             raise
+        except HealthcareError as he:
+            # Keep RATE_LIMITED, CIRCUIT_OPEN and DEADLINE_EXCEEDED for callers
+            logger.error(f"Error processing input: {he.message}")
+            raise
         except Exception as e:
             logger.error(f"Error processing input: {str(e)}")
             raise HealthcareError(
@@ -208,6 +350,21 @@ class HealthcareAgent:
                 details={"error": str(e)}
             )
 
+    def _run_graph(self, input_text: str, initial_state: HospitalState, deadline: float) -> Dict:
+        """Run the graph within the request deadline and format its result"""
+        with request_scope(deadline=deadline):
+            if not has_budget(Settings.NODE_MIN_BUDGET + Settings.SYNTHESIS_RESERVE):
+                cached = self._cached_response(input_text)
+                if cached is not None:
+                    logger.warning("Request deadline too close, returning cached response")
+                    return cached
+            result = self.graph.invoke(initial_state)
+        
+        response = self._format_response(result)
+        if not response["degraded"]:
+            self._remember_response(input_text, response)
+        return response
+
     def _format_response(self, result: Dict) -> Dict:
         """Format the final response from the graph execution"""
         try:
@@ -218,11 +375,13 @@ class HealthcareAgent:
                     details={"result": str(result)}
                 )
                 
+            analysis = result.get("analysis") or {}
             return {
                 "response": result["messages"][-1].content if result["messages"] else "",
-                "analysis": result.get("analysis", {}),
+                "analysis": analysis,
                 "metrics": result.get("metrics", {}),
-                "timestamp": datetime.now()
+                "timestamp": datetime.now(),
+                "degraded": list(analysis.get("degraded", []))
             }
         except Exception as e:
             logger.error(f"Error formatting response: {str(e)}")
@@ -253,7 +412,10 @@ class HealthcareAgent:
     ) -> bool:
         """Reset conversation state for a specific thread"""
         try:
-            self.conversation_states[thread_id] = create_initial_state(thread_id)
+            current = self.metrics_provider.current
+            self.conversation_states[thread_id] = create_initial_state(
+                thread_id, current.metrics, current.snapshot
+            )
             return True
         except Exception as e:
             logger.error(f"Error resetting conversation: {str(e)}")
@@ -261,4 +423,18 @@ class HealthcareAgent:
                 message="Failed to reset conversation",
                 error_code="RESET_ERROR",
                 details={"error": str(e)}
-            )
\ No newline at end of file
+            )
+    def get_usage_report(self) -> Dict:
+        """Per-node model usage plus rate limiting, resilience, caching and tool statistics"""
+        ledger = get_usage_ledger()
+        limiter = self.model_pool.limiter
+        return {
+            "nodes": ledger.summary(),
+            "totals": ledger.totals(),
+            "clients": len(self.model_pool),
+            "rate_limiter": limiter.stats() if limiter is not None else None,
+            "resilience": self.model_pool.resilience_stats(),
+            "coalescing": self.single_flight.stats(),
+            "semantic_cache": self.semantic_cache.stats() if self.semantic_cache is not None else None,
+            "tools": self.tool_executor.stats()
+        }
@@ -23,6 +23,7 @@ Current input: {input}""",
 - Waiting times: {wait_times} minutes
 - Department capacity: {department_capacity}
 - Admission rate: {admission_rate} per hour
+- Discharge rate: {discharge_rate} per hour
 
 Provide specific recommendations for optimization.""",
 
@@ -35,10 +36,7 @@ Provide specific recommendations for optimization.""",
 Recommend optimal resource distribution.""",
 
     "quality_monitor": """Review quality metrics:
-- Patient satisfaction: {satisfaction_score}/10
-- Care outcomes: {care_outcomes}
-- Compliance rates: {compliance_rates}%
-- Incident reports: {incident_count}
+{quality_metrics}
 
 Identify areas for improvement.""",
 
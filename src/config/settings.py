@@ -12,6 +12,41 @@ class Settings:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     MODEL_NAME = "gpt-4o-mini-2024-07-18"
     MODEL_TEMPERATURE = 0
+    FAST_MODEL_NAME = os.getenv("FAST_MODEL_NAME", "gpt-4.1-nano")  # Classification and routing
+    SYNTHESIS_MODEL_NAME = os.getenv("SYNTHESIS_MODEL_NAME", MODEL_NAME)  # Final answer; e.g. gpt-4o for quality
+    
+    # Per-node overrides of the default model configuration
+    NODE_MODELS = {
+        "input_analyzer": {"model": FAST_MODEL_NAME, "max_tokens": 150},
+        "output_synthesizer": {"model": SYNTHESIS_MODEL_NAME}
+    }
+    
+    # USD per million (input, output) tokens, for cost reporting
+    MODEL_PRICING = {
+        "gpt-4o-mini-2024-07-18": (0.15, 0.60),
+        "gpt-4o-mini": (0.15, 0.60),
+        "gpt-4o": (2.50, 10.00),
+        "gpt-4.1-nano": (0.10, 0.40),
+        "gpt-4.1-mini": (0.40, 1.60),
+        "gpt-4.1": (2.00, 8.00)
+    }
+    
+    # Model Backend and Rate Limits (0 requests/min disables limiting)
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")  # "openai" or offline "fake"
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+    LLM_SHED_AFTER = float(os.getenv("LLM_SHED_AFTER", "10"))  # Max queue wait for LOW priority
+    FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0"))  # Seconds per call on the fake backend
+    
+    # Model Call Resilience (attempts per call come from MAX_RETRIES)
+    LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    LLM_RETRY_BUDGET = float(os.getenv("LLM_RETRY_BUDGET", "0.2"))  # Retries earned per call
+    LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))  # Consecutive failures
+    LLM_BREAKER_RECOVERY = float(os.getenv("LLM_BREAKER_RECOVERY", "30"))  # Seconds before probing
+    HEDGED_NODES = [node for node in os.getenv("HEDGED_NODES", "").split(",") if node]  # e.g. output_synthesizer
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))  # Node latency before duplicating a call
+    HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", "0.1"))  # Max extra calls per call
     
     # LangGraph Configuration
     MEMORY_TYPE = os.getenv("MEMORY_TYPE", "sqlite")
@@ -26,8 +61,37 @@ class Settings:
     
     # Application Settings
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
-    REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
+    REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))  # Default end-to-end deadline
+    SYNTHESIS_RESERVE = float(os.getenv("SYNTHESIS_RESERVE", "5"))  # Seconds kept for the final answer
+    NODE_MIN_BUDGET = float(os.getenv("NODE_MIN_BUDGET", "3"))  # Below this, skip the specialist node
     BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10"))
+    PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "800"))  # Per node prompt
+    STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "true").lower() == "true"  # JSON mode
+    
+    # Request Scheduling
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "4"))  # Concurrent graph runs
+    SCHEDULER_AGING_SECONDS = float(os.getenv("SCHEDULER_AGING_SECONDS", "30"))  # Wait worth one LOW slot
+    SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "1024"))  # Cached answers, 0 disables
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))  # Min cosine similarity
+    
+    # HTTP Server
+    SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8080"))
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))  # Processes sharing the port
+    SERVER_MAX_QUEUE = int(os.getenv("SERVER_MAX_QUEUE", "64"))  # Queued requests before 503
+    SERVER_KEEP_ALIVE = float(os.getenv("SERVER_KEEP_ALIVE", "15"))  # Idle connection timeout
+    
+    # Tool Execution
+    TOOL_POOL_WORKERS = int(os.getenv("TOOL_POOL_WORKERS", "0"))  # Processes, 0 = CPU count
+    TOOL_INLINE_BYTES = int(os.getenv("TOOL_INLINE_BYTES", "262144"))  # Smaller inputs run inline
+    TOOL_POOL_TOOLS = [tool for tool in os.getenv("TOOL_POOL_TOOLS", "").split(",") if tool]  # Always pooled
+    
+    # Metrics Provider Configuration
+    METRICS_SOURCE = os.getenv("METRICS_SOURCE")  # JSON or CSV file drop
+    METRICS_REFRESH_INTERVAL = float(os.getenv("METRICS_REFRESH_INTERVAL", "60"))
+    ADT_EVENT_FILE = os.getenv("ADT_EVENT_FILE")  # Append-only admit/discharge/transfer feed
+    ADT_CHECKPOINT_FILE = os.getenv("ADT_CHECKPOINT_FILE", "logs/adt_checkpoint.json")
+    METRICS_ARCHIVE_DIR = os.getenv("METRICS_ARCHIVE_DIR")  # Memory-mapped metric history
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -54,6 +118,11 @@ class Settings:
             "api_key": cls.OPENAI_API_KEY
         }
     
+    @classmethod
+    def get_node_model_config(cls, node: str) -> Dict[str, Any]:
+        """Get model configuration for a node, with its overrides applied"""
+        return {**cls.get_model_config(), **cls.NODE_MODELS.get(node, {})}
+    
     @classmethod
     def validate_settings(cls) -> bool:
         """Validate required settings"""
@@ -63,6 +132,9 @@ class Settings:
             "MEMORY_TYPE"
         ]
         
+        if cls.LLM_BACKEND == "fake":
+            required_settings.remove("OPENAI_API_KEY")
+        
         for setting in required_settings:
             if not getattr(cls, setting):
                 raise ValueError(f"Missing required setting: {setting}")
@@ -0,0 +1,31 @@
+# src/llm/__init__.py
+from .usage import UsageLedger, get_usage_ledger, model_cost
+from .prompting import PromptBuilder, PromptSection, count_tokens, format_table
+from .pool import ModelPool, NodeModel
+from .structured import StructuredOutputParser, OUTPUT_SCHEMAS
+from .hedging import HedgePolicy
+from .rate_limit import RateLimiter, TokenBucket, get_rate_limiter
+from .context import request_scope, current_priority
+from .fake import FakeChatBackend, FakeBackendError
+
+__all__ = [
+    'UsageLedger',
+    'get_usage_ledger',
+    'model_cost',
+    'PromptBuilder',
+    'PromptSection',
+    'count_tokens',
+    'format_table',
+    'ModelPool',
+    'NodeModel',
+    'StructuredOutputParser',
+    'OUTPUT_SCHEMAS',
+    'HedgePolicy',
+    'RateLimiter',
+    'TokenBucket',
+    'get_rate_limiter',
+    'request_scope',
+    'current_priority',
+    'FakeChatBackend',
+    'FakeBackendError'
+]
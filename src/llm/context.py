@@ -0,0 +1,51 @@
+# src/llm/context.py
+from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from ..models.state import PriorityLevel
+
+# Request-scoped call settings; LangGraph runs nodes in a copy of the
+# caller's context, so values set around graph.invoke reach every node.
+_priority: ContextVar[PriorityLevel] = ContextVar("llm_priority", default=PriorityLevel.MEDIUM)
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+def current_priority() -> PriorityLevel:
+    return _priority.get()
+
+
+def current_deadline() -> Optional[float]:
+    """``time.monotonic`` timestamp the request must finish by, if any"""
+    return _deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the request deadline (None without one)"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def has_budget(seconds: float) -> bool:
+    remaining = remaining_time()
+    return remaining is None or remaining >= seconds
+
+
+@contextmanager
+def request_scope(priority: Optional[PriorityLevel] = None, deadline: Optional[float] = None):
+    """Set the priority and deadline used by model calls made inside the block.
+
+    A nested scope can only tighten the deadline, never extend it.
+    """
+    priority_token = _priority.set(PriorityLevel(priority)) if priority is not None else None
+    deadline_token = None
+    if deadline is not None:
+        outer = _deadline.get()
+        deadline_token = _deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        if deadline_token is not None:
+            _deadline.reset(deadline_token)
+        if priority_token is not None:
+            _priority.reset(priority_token)
@@ -0,0 +1,120 @@
+# src/llm/fake.py
+from typing import Dict, List, Optional, Any, Callable, Sequence, Union
+import asyncio
+import itertools
+import random
+import threading
+import time
+from langchain_core.messages import AIMessage
+from .prompting import count_tokens
+
+DEFAULT_FAKE_RESPONSE = (
+    '{"summary": "Operations are within normal ranges.", "findings": [], '
+    '"recommendations": ["Continue monitoring"], "action_items": []}'
+)
+
+
+class FakeBackendError(Exception):
+    """Injected failure from the fake backend"""
+
+    def __init__(self, message: str = "Injected backend failure", status_code: int = 503):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class FakeChatBackend:
+    """Offline chat model with injectable latency and failures.
+
+    Drop-in for the chat clients created by ``ModelPool`` (``invoke`` /
+    ``ainvoke`` returning an ``AIMessage`` with usage metadata), used for
+    tests and load tests. ``latency`` is a fixed number of seconds, a
+    sequence cycled per call, or a callable drawing a sample from a
+    ``random.Random``.
+    """
+
+    def __init__(
+        self,
+        responses: Optional[Sequence[str]] = None,
+        latency: Union[float, Sequence[float], Callable[[random.Random], float]] = 0.0,
+        error_rate: float = 0.0,
+        error: Optional[Callable[[], Exception]] = None,
+        seed: Optional[int] = None,
+        model: str = "fake"
+    ):
+        self.responses = itertools.cycle(responses or [DEFAULT_FAKE_RESPONSE])
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error = error or FakeBackendError
+        self.model = model
+        self.random = random.Random(seed)
+        self._latencies = itertools.cycle(latency) if isinstance(latency, (list, tuple)) else None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    def _next(self, messages) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+            if self._latencies is not None:
+                delay = next(self._latencies)
+            elif callable(self.latency):
+                delay = self.latency(self.random)
+            else:
+                delay = self.latency
+            fail = self.random.random() < self.error_rate
+            content = next(self.responses)
+        prompt = "\n".join(str(getattr(message, "content", message)) for message in messages) \
+            if not isinstance(messages, str) else messages
+        return {"delay": max(delay, 0.0), "fail": fail, "content": content, "prompt": prompt}
+
+    def _respond(self, call: Dict[str, Any]) -> AIMessage:
+        if call["fail"]:
+            raise self.error()
+        return AIMessage(
+            content=call["content"],
+            usage_metadata={
+                "input_tokens": count_tokens(call["prompt"]),
+                "output_tokens": count_tokens(call["content"]),
+                "total_tokens": count_tokens(call["prompt"]) + count_tokens(call["content"])
+            },
+            response_metadata={"model_name": self.model}
+        )
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def invoke(self, messages, timeout: Optional[float] = None, **kwargs) -> AIMessage:
+        call = self._next(messages)
+        self._enter()
+        try:
+            if timeout is not None and call["delay"] > timeout:
+                time.sleep(timeout)
+                raise TimeoutError(f"Fake backend timed out after {timeout:.2f}s")
+            time.sleep(call["delay"])
+            return self._respond(call)
+        finally:
+            self._exit()
+
+    async def ainvoke(self, messages, timeout: Optional[float] = None, **kwargs) -> AIMessage:
+        call = self._next(messages)
+        self._enter()
+        try:
+            if timeout is not None and call["delay"] > timeout:
+                await asyncio.sleep(timeout)
+                raise TimeoutError(f"Fake backend timed out after {timeout:.2f}s")
+            await asyncio.sleep(call["delay"])
+            return self._respond(call)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.cancelled += 1
+            raise
+        finally:
+            self._exit()
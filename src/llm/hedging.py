@@ -0,0 +1,155 @@
+# src/llm/hedging.py
+from typing import Dict, Optional, Any, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import asyncio
+import contextvars
+import threading
+from ..config.settings import Settings
+from ..utils.logger import setup_logger
+from .usage import get_usage_ledger
+
+logger = setup_logger(__name__)
+
+# Threads running hedged synchronous calls (two per in-flight hedged call)
+HEDGE_WORKERS = 32
+
+
+class HedgePolicy:
+    """When to send a duplicate model call, and how many to allow.
+
+    A call that has not returned after the node's recent ``percentile``
+    latency gets one duplicate; the first success wins and the other is
+    cancelled (or, for synchronous clients, abandoned). The hedge budget
+    earns ``budget_ratio`` hedges per call, up to ``budget_burst``, which
+    caps the extra model cost at about that fraction.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget_ratio: float = 0.1,
+        budget_burst: float = 5.0,
+        min_samples: int = 20,
+        min_delay: float = 0.01
+    ):
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._budget = budget_burst
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _node_stats(self, node: str) -> Dict[str, int]:
+        stats = self._stats.get(node)
+        if stats is None:
+            stats = self._stats[node] = {"calls": 0, "hedged": 0, "hedge_wins": 0, "budget_exhausted": 0}
+        return stats
+
+    def delay(self, node: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None while latency history is short"""
+        latency = get_usage_ledger().latency_percentile(node, self.percentile, self.min_samples)
+        return None if latency is None else max(latency, self.min_delay)
+
+    def start(self, node: str) -> None:
+        with self._lock:
+            self._node_stats(node)["calls"] += 1
+            self._budget = min(self.budget_burst, self._budget + self.budget_ratio)
+
+    def try_hedge(self, node: str) -> bool:
+        """Spend one hedge from the budget"""
+        with self._lock:
+            stats = self._node_stats(node)
+            if self._budget < 1:
+                stats["budget_exhausted"] += 1
+                return False
+            self._budget -= 1
+            stats["hedged"] += 1
+            return True
+
+    def record_win(self, node: str) -> None:
+        with self._lock:
+            self._node_stats(node)["hedge_wins"] += 1
+
+    def submit(self, operation: Callable[[], Any]) -> Future:
+        """Run ``operation`` on the hedging threads in a copy of the caller's context"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+        return self._executor.submit(contextvars.copy_context().run, operation)
+
+    def call(self, node: str, operation: Callable[[], Any]) -> Any:
+        """Run a blocking call, hedging it once it is slower than usual"""
+        self.start(node)
+        delay = self.delay(node)
+        if delay is None:
+            return operation()
+
+        primary = self.submit(operation)
+        if wait([primary], timeout=delay).done or not self.try_hedge(node):
+            return primary.result()
+        hedge = self.submit(operation)
+
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.record_win(node)
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+            if not pending:
+                # Both failed; report the original call's error
+                return primary.result()
+
+    async def acall(self, node: str, operation: Callable[[], Any]) -> Any:
+        """Like ``call`` for a coroutine function; the losing call is cancelled"""
+        self.start(node)
+        delay = self.delay(node)
+        if delay is None:
+            return await operation()
+
+        primary = asyncio.ensure_future(operation())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.try_hedge(node):
+                return await primary
+            hedge = asyncio.ensure_future(operation())
+            tasks.add(hedge)
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.record_win(node)
+                        return task.result()
+                if not pending:
+                    return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-node hedge counts and current hedge delay"""
+        with self._lock:
+            nodes = {node: dict(stats) for node, stats in self._stats.items()}
+            budget = round(self._budget, 2)
+        for node, stats in nodes.items():
+            delay = self.delay(node)
+            stats["delay_ms"] = round(delay * 1000, 1) if delay is not None else None
+        return {"budget_available": budget, "nodes": nodes}
+
+
+def create_hedge_policy() -> HedgePolicy:
+    return HedgePolicy(
+        percentile=Settings.HEDGE_PERCENTILE,
+        budget_ratio=Settings.HEDGE_BUDGET
+    )
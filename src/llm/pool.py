@@ -0,0 +1,289 @@
+# src/llm/pool.py
+from typing import Dict, Optional, Any, Callable, Tuple
+import asyncio
+import threading
+import time
+from ..config.settings import Settings
+from ..utils.error_handlers import CircuitBreaker, DeadlineExceededError, RetryPolicy
+from ..utils.logger import setup_logger
+from .context import current_deadline, current_priority, remaining_time
+from .hedging import HedgePolicy, create_hedge_policy
+from .prompting import count_tokens
+from .rate_limit import RateLimiter
+from .usage import get_usage_ledger
+
+logger = setup_logger(__name__)
+
+# Output tokens reserved from the rate limit when max_tokens is not configured
+DEFAULT_OUTPUT_TOKENS = 400
+
+
+def _create_chat_model(config: Dict[str, Any]):
+    if Settings.LLM_BACKEND == "fake":
+        from .fake import FakeChatBackend
+        return FakeChatBackend(latency=Settings.FAKE_LLM_LATENCY, model=config["model"])
+    from langchain_openai import ChatOpenAI
+    # Retries are handled by NodeModel's RetryPolicy, not per client
+    return ChatOpenAI(**{"max_retries": 0, **config})
+
+
+def _message_text(messages) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(getattr(message, "content", message)) for message in messages)
+
+
+def _usage(messages, response) -> Tuple[int, int]:
+    """(input, output) tokens reported by the provider, else estimated locally"""
+    usage = getattr(response, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens") or count_tokens(_message_text(messages))
+    output_tokens = usage.get("output_tokens") or count_tokens(str(getattr(response, "content", "")))
+    return input_tokens, output_tokens
+
+
+def create_retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=Settings.MAX_RETRIES,
+        base_delay=Settings.LLM_RETRY_BASE_DELAY,
+        max_delay=Settings.LLM_RETRY_MAX_DELAY,
+        budget_ratio=Settings.LLM_RETRY_BUDGET
+    )
+
+
+class NodeModel:
+    """Chat model bound to one node.
+
+    Each attempt passes the model's circuit breaker, waits for the shared
+    rate limiter in the request's priority lane, then records latency,
+    tokens and cost for the node. Transient failures are retried by the
+    retry policy; an open circuit fails the call immediately. Inside a
+    ``request_scope`` with a deadline, the remaining time is passed to the
+    client as ``timeout`` and running out raises ``DeadlineExceededError``.
+    With a ``hedge`` policy, slow attempts are duplicated (see ``HedgePolicy``).
+    """
+
+    def __init__(
+        self,
+        node: str,
+        client: Any,
+        model: str,
+        limiter: Optional[RateLimiter] = None,
+        max_output_tokens: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: Optional[HedgePolicy] = None
+    ):
+        self.node = node
+        self.client = client
+        self.model = model
+        self.limiter = limiter
+        self.max_output_tokens = max_output_tokens or DEFAULT_OUTPUT_TOKENS
+        self.retry = retry or RetryPolicy(max_attempts=1)
+        self.breaker = breaker
+        self.hedge = hedge
+
+    def _estimate(self, messages) -> int:
+        return count_tokens(_message_text(messages)) + self.max_output_tokens
+
+    def _record(self, messages, response, started: float, reserved: int, error: bool = False) -> None:
+        input_tokens, output_tokens = _usage(messages, response) if response is not None else (0, 0)
+        if self.limiter is not None and reserved:
+            self.limiter.settle(reserved, input_tokens + output_tokens if response is not None else reserved)
+        get_usage_ledger().record_call(
+            self.node,
+            self.model,
+            time.perf_counter() - started,
+            input_tokens,
+            output_tokens,
+            error
+        )
+
+    def _failed(self, messages, started: float, reserved: int, error: Exception) -> None:
+        self._record(messages, None, started, reserved, error=True)
+        if self.breaker is not None:
+            self.breaker.record_failure(error)
+
+    def _succeeded(self, messages, response, started: float, reserved: int) -> None:
+        self._record(messages, response, started, reserved)
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def _with_timeout(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Call arguments with the remaining request budget as ``timeout``"""
+        remaining = remaining_time()
+        if remaining is None:
+            return kwargs
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                message=f"No time left for {self.node} model call",
+                details={"node": self.node, "overrun": round(-remaining, 3)}
+            )
+        return {**kwargs, "timeout": min(remaining, kwargs.get("timeout") or remaining)}
+
+    def _deadline_error(self, error: Exception) -> Exception:
+        """A failure caused by the request deadline, reported as such"""
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0 and not isinstance(error, DeadlineExceededError):
+            deadline_error = DeadlineExceededError(
+                message=f"{self.node} model call exceeded the request deadline",
+                details={"node": self.node, "error": str(error)}
+            )
+            deadline_error.__cause__ = error
+            return deadline_error
+        return error
+
+    def _attempt(self, messages, **kwargs):
+        kwargs = self._with_timeout(kwargs)
+        if self.breaker is not None:
+            self.breaker.allow()
+        reserved = 0
+        if self.limiter is not None:
+            reserved = self._estimate(messages)
+            try:
+                self.limiter.acquire(reserved, current_priority(), kwargs.get("timeout"))
+            except Exception as e:
+                # Frees a half-open probe slot; shedding is not a backend failure
+                e = self._deadline_error(e)
+                if self.breaker is not None:
+                    self.breaker.record_failure(e)
+                raise e
+        started = time.perf_counter()
+        try:
+            response = self.client.invoke(messages, **kwargs)
+        except Exception as e:
+            e = self._deadline_error(e)
+            self._failed(messages, started, reserved, e)
+            raise e
+        self._succeeded(messages, response, started, reserved)
+        return response
+
+    async def _attempt_async(self, messages, **kwargs):
+        kwargs = self._with_timeout(kwargs)
+        if self.breaker is not None:
+            self.breaker.allow()
+        reserved = 0
+        if self.limiter is not None:
+            reserved = self._estimate(messages)
+            try:
+                await self.limiter.acquire_async(reserved, current_priority(), kwargs.get("timeout"))
+            except asyncio.CancelledError as e:
+                # Lost a hedge race while queued: the limiter has left the
+                # queue, so only the half-open probe slot is left to free
+                if self.breaker is not None:
+                    self.breaker.record_failure(e)
+                raise
+            except Exception as e:
+                # Frees a half-open probe slot; shedding is not a backend failure
+                e = self._deadline_error(e)
+                if self.breaker is not None:
+                    self.breaker.record_failure(e)
+                raise e
+        started = time.perf_counter()
+        try:
+            response = await self.client.ainvoke(messages, **kwargs)
+        except asyncio.CancelledError as e:
+            # Lost a hedge race: free a half-open probe slot, record nothing
+            if self.breaker is not None:
+                self.breaker.record_failure(e)
+            raise
+        except Exception as e:
+            e = self._deadline_error(e)
+            self._failed(messages, started, reserved, e)
+            raise e
+        self._succeeded(messages, response, started, reserved)
+        return response
+
+    def _call(self, messages, kwargs: Dict[str, Any]):
+        if self.hedge is None:
+            return self._attempt(messages, **kwargs)
+        return self.hedge.call(self.node, lambda: self._attempt(messages, **kwargs))
+
+    async def _call_async(self, messages, kwargs: Dict[str, Any]):
+        if self.hedge is None:
+            return await self._attempt_async(messages, **kwargs)
+        return await self.hedge.acall(self.node, lambda: self._attempt_async(messages, **kwargs))
+
+    def invoke(self, messages, **kwargs):
+        return self.retry.call(lambda: self._call(messages, kwargs), current_deadline())
+
+    async def ainvoke(self, messages, **kwargs):
+        return await self.retry.acall(lambda: self._call_async(messages, kwargs), current_deadline())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+class ModelPool:
+    """Chat clients shared per distinct model configuration.
+
+    Nodes configured with the same model settings reuse one client (and
+    its HTTP connection pool); ``for_node`` wraps the shared client so each
+    call is still attributed to the node that made it. All nodes share one
+    retry budget, and nodes using the same model share its circuit breaker.
+    Nodes listed in ``Settings.HEDGED_NODES`` share one hedge budget.
+    """
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        overrides: Optional[Dict[str, Any]] = None,
+        limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None
+    ):
+        self.factory = factory or _create_chat_model
+        self.overrides = overrides or {}
+        self.limiter = limiter
+        self.retry = retry or create_retry_policy()
+        self.hedge = hedge or create_hedge_policy()
+        self._clients: Dict[Tuple, Any] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def client(self, config: Dict[str, Any]) -> Any:
+        config = {**config, **self.overrides}
+        key = tuple(sorted((name, repr(value)) for name, value in config.items()))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                logger.info(f"Creating model client for {config.get('model')}")
+                client = self._clients[key] = self.factory(config)
+            return client
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = self._breakers[model] = CircuitBreaker(
+                    model,
+                    failure_threshold=Settings.LLM_BREAKER_THRESHOLD,
+                    recovery_timeout=Settings.LLM_BREAKER_RECOVERY
+                )
+            return breaker
+
+    def for_node(self, node: str) -> NodeModel:
+        """Tracked client configured by ``Settings.get_node_model_config``"""
+        config = Settings.get_node_model_config(node)
+        return NodeModel(
+            node,
+            self.client(config),
+            config["model"],
+            limiter=self.limiter,
+            max_output_tokens=config.get("max_tokens"),
+            retry=self.retry,
+            breaker=self.breaker(config["model"]),
+            hedge=self.hedge if node in Settings.HEDGED_NODES else None
+        )
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Retry, hedging and circuit breaker state"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            "retry": self.retry.stats(),
+            "hedging": self.hedge.stats(),
+            "circuits": {model: breaker.stats() for model, breaker in breakers.items()}
+        }
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -0,0 +1,144 @@
+# src/llm/prompting.py
+from typing import Dict, List, Optional, Any, Callable, Sequence, Tuple
+import re
+from ..config.settings import Settings
+from ..utils.logger import setup_logger
+from .usage import get_usage_ledger
+
+logger = setup_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+CHARS_PER_TOKEN = 4
+
+# Fraction of a section kept on each shrinking step
+SHRINK_FACTOR = 0.75
+
+
+def count_tokens(text: str) -> int:
+    """Local token estimate close to the OpenAI BPE tokenizers.
+
+    Punctuation counts as one token each and words as one token per four
+    characters, which tracks real counts for English and numeric tables
+    without a tokenizer download.
+    """
+    return sum(
+        -(-len(piece) // CHARS_PER_TOKEN)
+        for piece in TOKEN_PATTERN.findall(text)
+    )
+
+
+def format_table(headers: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    """Compact pipe-separated table (no padding) for prompt inputs"""
+    lines = ["|".join(str(header) for header in headers)]
+    lines.extend("|".join(str(value) for value in row) for row in rows)
+    return "\n".join(lines)
+
+
+class PromptSection:
+    """List-valued prompt field that can be trimmed to fit a token budget.
+
+    ``items`` must already be in priority order (most critical first). When
+    the section is cut to its top ``limit`` items, ``summarize`` receives the
+    omitted items and returns one aggregated line describing them.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Any],
+        render: Callable[[Any], str] = str,
+        summarize: Optional[Callable[[Sequence[Any]], str]] = None,
+        header: Optional[str] = None,
+        separator: str = "\n",
+        min_items: int = 1,
+        empty: str = "None reported"
+    ):
+        self.items = list(items)
+        self.render_item = render
+        self.summarize = summarize or (lambda omitted: f"... {len(omitted)} more not shown")
+        self.header = header
+        self.separator = separator
+        self.min_items = min_items
+        self.empty = empty
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def render(self, limit: Optional[int] = None) -> str:
+        if not self.items:
+            return self.empty
+        limit = len(self.items) if limit is None else limit
+        lines = [self.render_item(item) for item in self.items[:limit]]
+        if self.header is not None:
+            lines.insert(0, self.header)
+        if limit < len(self.items):
+            lines.append(self.summarize(self.items[limit:]))
+        return self.separator.join(lines)
+
+
+class PromptBuilder:
+    """Formats a prompt template within a per-node token budget.
+
+    Plain fields are formatted as-is; ``PromptSection`` fields are cut back,
+    largest first, until the prompt fits the budget or every section is at
+    its minimum. ``suffix`` (e.g. output format instructions) is appended
+    verbatim. Every build records its token statistics in the usage ledger.
+    """
+
+    def __init__(
+        self,
+        node: str,
+        template: str,
+        budget: Optional[int] = None,
+        suffix: str = ""
+    ):
+        self.node = node
+        self.template = template
+        self.budget = budget if budget is not None else Settings.PROMPT_TOKEN_BUDGET
+        self.suffix = f"\n\n{suffix}" if suffix else ""
+
+    def _format(self, fields: Dict[str, Any]) -> str:
+        return self.template.format(**fields) + self.suffix
+
+    def build(self, **fields: Any) -> Tuple[str, Dict[str, Any]]:
+        """Return (prompt, stats)"""
+        sections = {
+            name: value for name, value in fields.items()
+            if isinstance(value, PromptSection)
+        }
+        limits = {name: len(section) for name, section in sections.items()}
+        rendered = {name: section.render() for name, section in sections.items()}
+
+        prompt = self._format({**fields, **rendered})
+        raw_tokens = tokens = count_tokens(prompt)
+
+        while tokens > self.budget:
+            shrinkable = [
+                name for name, section in sections.items()
+                if limits[name] > section.min_items
+            ]
+            if not shrinkable:
+                break
+            name = max(shrinkable, key=lambda candidate: count_tokens(rendered[candidate]))
+            section = sections[name]
+            limits[name] = max(section.min_items, int(limits[name] * SHRINK_FACTOR))
+            rendered[name] = section.render(limits[name])
+            prompt = self._format({**fields, **rendered})
+            tokens = count_tokens(prompt)
+
+        stats = {
+            "node": self.node,
+            "tokens": tokens,
+            "budget": self.budget,
+            "raw_tokens": raw_tokens,
+            "trimmed_tokens": raw_tokens - tokens,
+            "omitted_items": {
+                name: len(section) - limits[name]
+                for name, section in sections.items()
+                if limits[name] < len(section)
+            },
+            "over_budget": tokens > self.budget
+        }
+        if stats["over_budget"]:
+            logger.warning(f"{self.node} prompt is {tokens} tokens, over its budget of {self.budget}")
+        get_usage_ledger().record_prompt(stats)
+        return prompt, stats
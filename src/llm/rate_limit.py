@@ -0,0 +1,242 @@
+# src/llm/rate_limit.py
+from typing import Dict, List, Optional, Any, Callable
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from ..config.settings import Settings
+from ..models.state import PriorityLevel
+from ..utils.error_handlers import RateLimitError
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TokenBucket:
+    """Refills continuously at ``rate_per_minute`` up to ``capacity``"""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.clock = clock
+        self.level = self.capacity
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Refund (positive) or charge (negative) after the real usage is known"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Process-wide request and token rate limits with priority lanes.
+
+    Callers queue by ``PriorityLevel`` (highest first, FIFO within a level)
+    and only the head of the queue may draw from the requests/min and
+    tokens/min buckets, so a CRITICAL call overtakes every queued LOW one.
+    LOW-priority calls are shed with ``RateLimitError`` instead of queueing
+    once the expected wait exceeds ``shed_after`` seconds.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        shed_after: float = 10.0,
+        shed_priority: PriorityLevel = PriorityLevel.LOW,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self.shed_after = shed_after
+        self.shed_priority = shed_priority
+        self.clock = clock
+        self._queue: List = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stats: Dict[int, Dict[str, float]] = {
+            int(level): {"admitted": 0, "shed": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            for level in PriorityLevel
+        }
+
+    def _estimated_wait(self, tokens: int) -> float:
+        """Wait for everything already queued plus this call"""
+        queued_tokens = sum(entry[2] for entry in self._queue)
+        return max(
+            self.requests.wait_time(len(self._queue) + 1),
+            self.tokens.wait_time(queued_tokens + tokens)
+        )
+
+    def _shed(self, priority: PriorityLevel, reason: str) -> None:
+        self._stats[int(priority)]["shed"] += 1
+        raise RateLimitError(
+            message=f"Request shed by rate limiter: {reason}",
+            details={"priority": int(priority), "queue_depth": len(self._queue)}
+        )
+
+    def acquire(
+        self,
+        tokens: int,
+        priority: PriorityLevel = PriorityLevel.MEDIUM,
+        timeout: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None
+    ) -> float:
+        """Block until the call may proceed; returns seconds waited.
+
+        Setting ``cancelled`` (and notifying waiters) abandons the wait.
+        """
+        priority = PriorityLevel(priority)
+        started = self.clock()
+        with self._condition:
+            if priority <= self.shed_priority and self._estimated_wait(tokens) > self.shed_after:
+                self._shed(priority, "expected wait exceeds shedding deadline")
+
+            entry = [-int(priority), next(self._sequence), tokens]
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    if cancelled is not None and cancelled.is_set():
+                        raise RateLimitError(
+                            message="Cancelled while waiting for rate limit",
+                            details={"priority": int(priority)}
+                        )
+                    if self._queue[0] is entry:
+                        wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                        if wait == 0:
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            break
+                    else:
+                        wait = None
+
+                    elapsed = self.clock() - started
+                    if priority <= self.shed_priority and elapsed > self.shed_after:
+                        self._shed(priority, "queued past shedding deadline")
+                    if timeout is not None:
+                        if elapsed >= timeout:
+                            raise RateLimitError(
+                                message="Timed out waiting for rate limit",
+                                details={"priority": int(priority), "waited": elapsed}
+                            )
+                        wait = timeout - elapsed if wait is None else min(wait, timeout - elapsed)
+                    self._condition.wait(wait)
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._condition.notify_all()
+
+        waited = self.clock() - started
+        stats = self._stats[int(priority)]
+        stats["admitted"] += 1
+        stats["wait_seconds"] += waited
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+        return waited
+
+    async def acquire_async(
+        self,
+        tokens: int,
+        priority: PriorityLevel = PriorityLevel.MEDIUM,
+        timeout: Optional[float] = None
+    ) -> float:
+        """``acquire`` on a worker thread; cancelling the caller leaves the queue.
+
+        A waiter admitted just as its caller is cancelled hands its request
+        slot and tokens back, so nothing is consumed on behalf of a call
+        that will never run.
+        """
+        cancelled = threading.Event()
+        admitted = []
+
+        def wait() -> float:
+            waited = self.acquire(tokens, priority, timeout, cancelled)
+            with self._condition:
+                if cancelled.is_set():
+                    self._refund(tokens)
+                else:
+                    admitted.append(waited)
+            return waited
+
+        try:
+            return await asyncio.to_thread(wait)
+        except asyncio.CancelledError:
+            with self._condition:
+                cancelled.set()
+                if admitted:
+                    self._refund(tokens)
+                self._condition.notify_all()
+            raise
+
+    def _refund(self, tokens: int) -> None:
+        """Return an admitted call's request slot and tokens (caller holds the lock)"""
+        self.requests.adjust(1)
+        self.tokens.adjust(tokens)
+        self._condition.notify_all()
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the real usage of a call is known"""
+        with self._condition:
+            self.tokens.adjust(estimated_tokens - actual_tokens)
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth per priority, admissions, sheds and waits"""
+        with self._condition:
+            depth = {int(level): 0 for level in PriorityLevel}
+            for entry in self._queue:
+                depth[-entry[0]] += 1
+            return {
+                "queue_depth": len(self._queue),
+                "queue_depth_by_priority": {PriorityLevel(level).name: count for level, count in depth.items()},
+                "requests_available": round(self.requests.level, 2),
+                "tokens_available": round(self.tokens.level, 2),
+                "by_priority": {
+                    PriorityLevel(level).name: {
+                        **stats,
+                        "avg_wait_seconds": round(stats["wait_seconds"] / stats["admitted"], 4)
+                        if stats["admitted"] else 0.0
+                    }
+                    for level, stats in self._stats.items()
+                }
+            }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Shared limiter from ``Settings.LLM_REQUESTS_PER_MINUTE`` (None when disabled)"""
+    global _limiter
+    if Settings.LLM_REQUESTS_PER_MINUTE <= 0:
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                Settings.LLM_REQUESTS_PER_MINUTE,
+                Settings.LLM_TOKENS_PER_MINUTE,
+                shed_after=Settings.LLM_SHED_AFTER
+            )
+        return _limiter
@@ -0,0 +1,222 @@
+# src/llm/structured.py
+from typing import Dict, List, Optional, Any, Tuple
+import json
+import re
+from ..config.settings import Settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Field type names: "text", "list" (of strings), "map" (str -> value),
+# "actions" (list of {"action", "owner", "timeline"})
+OUTPUT_SCHEMAS = {
+    "input_analyzer": {
+        "task_type": "text",
+        "priority": "text",
+        "department": "text",
+        "context": "map"
+    },
+    "patient_flow": {
+        "findings": "list",
+        "recommendations": "list",
+        "action_items": "list",
+        "metrics_impact": "map"
+    },
+    "resource_manager": {
+        "resource_optimization": "list",
+        "supply_management": "list",
+        "equipment_maintenance": "list",
+        "budget_allocation": "list",
+        "priority_actions": "list"
+    },
+    "quality_monitor": {
+        "recommendations": "list",
+        "priority_improvements": "list"
+    },
+    "staff_scheduler": {
+        "shift_adjustments": "list",
+        "staff_assignments": "map",
+        "overtime_recommendations": "list",
+        "training_needs": "list",
+        "efficiency_improvements": "list"
+    },
+    "output_synthesizer": {
+        "summary": "text",
+        "key_findings": "list",
+        "recommendations": "list",
+        "action_items": "actions"
+    }
+}
+
+FIELD_DESCRIPTIONS = {
+    "text": "string",
+    "list": "list of short strings",
+    "map": "object of name -> value",
+    "actions": 'list of {"action", "owner", "timeline"} objects'
+}
+
+# Heading keywords that open a section in free-text answers, checked in order
+SECTION_KEYWORDS = (
+    ("key_findings", ("key finding", "key insight")),
+    ("findings", ("finding", "insight", "observation", "assessment")),
+    ("priority_actions", ("priority action",)),
+    ("priority_improvements", ("priority improvement", "area for improvement", "areas for improvement")),
+    ("action_items", ("action item", "action", "next step", "implementation")),
+    ("shift_adjustments", ("shift",)),
+    ("overtime_recommendations", ("overtime",)),
+    ("training_needs", ("training",)),
+    ("efficiency_improvements", ("efficiency",)),
+    ("staff_assignments", ("assignment",)),
+    ("supply_management", ("supply", "supplies", "inventory")),
+    ("equipment_maintenance", ("equipment", "maintenance")),
+    ("budget_allocation", ("budget", "cost")),
+    ("resource_optimization", ("resource", "allocation", "utilization")),
+    ("metrics_impact", ("impact", "expected outcome")),
+    ("summary", ("summary", "overview")),
+    ("recommendations", ("recommend", "suggest")),
+)
+
+FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+HEADING_PATTERN = re.compile(
+    r"^\s*(?:#+\s*(?P<markdown>[^#]+?)\s*#*"
+    r"|(?:[-*]\s+|\d+[.)]\s*)?\*\*(?P<bold>[^*]+?):?\*\*:?"
+    r"|(?:[-*]\s+|\d+[.)]\s*)?(?P<label>[A-Za-z][^:]{0,60}):)\s*$"
+)
+ITEM_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(?P<item>.+)$")
+KEY_VALUE_PATTERN = re.compile(r"^(?P<key>[^:]{1,60}):\s*(?P<value>.+)$")
+
+
+def _empty(kind: str) -> Any:
+    return "" if kind == "text" else {} if kind == "map" else []
+
+
+def _clean(text: str) -> str:
+    return text.strip().strip("*_").strip()
+
+
+class StructuredOutputParser:
+    """Parses a node's model output into its ``OUTPUT_SCHEMAS`` fields.
+
+    The model is asked for a JSON object; the fast path is a single
+    ``json.loads`` plus type coercion. Answers that are not valid JSON are
+    read by a one-pass section parser that maps headings to fields and
+    collects bulleted or numbered items, so no re-prompting is needed.
+    """
+
+    def __init__(self, node: str):
+        self.node = node
+        self.schema = OUTPUT_SCHEMAS[node]
+        self.stats = {"json": 0, "sections": 0}
+
+    @property
+    def instructions(self) -> str:
+        """Format instructions appended to the node's prompt"""
+        fields = ", ".join(
+            f'"{name}" ({FIELD_DESCRIPTIONS[kind]})' for name, kind in self.schema.items()
+        )
+        return f"Respond only with a JSON object with the keys: {fields}."
+
+    @property
+    def invoke_kwargs(self) -> Dict[str, Any]:
+        """Extra model call arguments enabling JSON mode when configured"""
+        if not Settings.STRUCTURED_OUTPUT:
+            return {}
+        return {"response_format": {"type": "json_object"}}
+
+    def parse(self, response: str) -> Dict[str, Any]:
+        return self.parse_with_mode(response)[0]
+
+    def parse_with_mode(self, response: str) -> Tuple[Dict[str, Any], str]:
+        """(fields, "json" or "sections")"""
+        data = self.parse_json(response)
+        mode = "json"
+        if data is None:
+            data = self._parse_sections(response)
+            mode = "sections"
+        self.stats[mode] += 1
+        return data, mode
+
+    def parse_json(self, response: str) -> Optional[Dict[str, Any]]:
+        """Schema fields from a JSON answer, or None if it is not one"""
+        text = FENCE_PATTERN.sub("", response.strip())
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            return None
+        try:
+            raw = json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+        if not isinstance(raw, dict) or not raw.keys() & self.schema.keys():
+            return None
+        return {name: self._coerce(raw.get(name), kind) for name, kind in self.schema.items()}
+
+    def _coerce(self, value: Any, kind: str) -> Any:
+        if value is None:
+            return _empty(kind)
+        if kind == "text":
+            return value if isinstance(value, str) else json.dumps(value)
+        if kind == "map":
+            return dict(value) if isinstance(value, dict) else {"value": value}
+        items = value if isinstance(value, list) else [value]
+        if kind == "actions":
+            return [
+                item if isinstance(item, dict) else {"action": str(item)}
+                for item in items
+            ]
+        return [
+            item if isinstance(item, str) else json.dumps(item)
+            for item in items
+        ]
+
+    def _section_for(self, title: str) -> Optional[str]:
+        title = title.lower()
+        for field, keywords in SECTION_KEYWORDS:
+            if field in self.schema and any(keyword in title for keyword in keywords):
+                return field
+        return None
+
+    def _parse_sections(self, response: str) -> Dict[str, Any]:
+        result = {name: _empty(kind) for name, kind in self.schema.items()}
+        section: Optional[str] = None
+        loose: List[str] = []
+
+        for line in response.splitlines():
+            if not line.strip():
+                continue
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                title = heading.group("markdown") or heading.group("bold") or heading.group("label")
+                field = self._section_for(title)
+                if field is not None:
+                    section = field
+                    continue
+
+            item = ITEM_PATTERN.match(line)
+            text = _clean(item.group("item") if item else line)
+            target = section
+            if target is None and "recommendations" in self.schema \
+                    and re.search(r"recommend|suggest", text, re.I):
+                target = "recommendations"
+            if target is None:
+                loose.append(text)
+                continue
+            self._add(result, target, text)
+
+        if "summary" in result and not result["summary"]:
+            result["summary"] = loose[0] if loose else response.strip().split("\n")[0]
+        return result
+
+    def _add(self, result: Dict[str, Any], field: str, text: str) -> None:
+        kind = self.schema[field]
+        if kind == "text":
+            result[field] = f"{result[field]} {text}".strip()
+        elif kind == "map":
+            pair = KEY_VALUE_PATTERN.match(text)
+            if pair:
+                result[field][_clean(pair.group("key"))] = pair.group("value").strip()
+            else:
+                result[field][text] = True
+        elif kind == "actions":
+            result[field].append({"action": text})
+        else:
+            result[field].append(text)
@@ -0,0 +1,120 @@
+# src/llm/usage.py
+from typing import Dict, Optional, Any
+from collections import deque
+import threading
+import numpy as np
+from ..config.settings import Settings
+
+PROMPT_COUNTERS = ("prompts", "prompt_tokens", "raw_prompt_tokens", "trimmed_tokens", "over_budget")
+CALL_COUNTERS = ("calls", "errors", "input_tokens", "output_tokens", "cost_usd", "latency_seconds")
+
+# Recent latencies kept per node for percentiles
+LATENCY_SAMPLES = 512
+
+
+def model_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """USD cost of one call from ``Settings.MODEL_PRICING`` (0 if unpriced)"""
+    input_price, output_price = Settings.MODEL_PRICING.get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+class UsageLedger:
+    """Process-wide per-node totals of prompt tokens, model calls, latency and cost"""
+
+    def __init__(self):
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def _node(self, node: str) -> Dict[str, Any]:
+        totals = self._nodes.get(node)
+        if totals is None:
+            totals = self._nodes[node] = {
+                **dict.fromkeys(PROMPT_COUNTERS, 0),
+                **dict.fromkeys(CALL_COUNTERS, 0),
+                "model": None
+            }
+            self._latencies[node] = deque(maxlen=LATENCY_SAMPLES)
+        return totals
+
+    def record_prompt(self, stats: Dict[str, Any]) -> None:
+        """Add the statistics of one ``PromptBuilder.build`` call"""
+        with self._lock:
+            totals = self._node(stats["node"])
+            totals["prompts"] += 1
+            totals["prompt_tokens"] += stats["tokens"]
+            totals["raw_prompt_tokens"] += stats["raw_tokens"]
+            totals["trimmed_tokens"] += stats["trimmed_tokens"]
+            totals["over_budget"] += int(stats["over_budget"])
+
+    def record_call(
+        self,
+        node: str,
+        model: str,
+        latency: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        error: bool = False
+    ) -> None:
+        """Add one model call made on behalf of ``node``"""
+        with self._lock:
+            totals = self._node(node)
+            totals["model"] = model
+            totals["calls"] += 1
+            totals["errors"] += int(error)
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+            totals["cost_usd"] += model_cost(model, input_tokens, output_tokens)
+            totals["latency_seconds"] += latency
+            self._latencies[node].append(latency)
+
+    def latency_percentile(self, node: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Recent ``percentile`` call latency of a node in seconds (None if too few samples)"""
+        with self._lock:
+            latencies = self._latencies.get(node)
+            if latencies is None or len(latencies) < min_samples:
+                return None
+            return float(np.percentile(np.array(latencies), percentile))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Totals, averages and latency percentiles per node"""
+        with self._lock:
+            report = {}
+            for node, totals in self._nodes.items():
+                prompts = totals["prompts"] or 1
+                calls = totals["calls"] or 1
+                latencies = np.array(self._latencies[node]) * 1000
+                report[node] = {
+                    **totals,
+                    "cost_usd": round(totals["cost_usd"], 6),
+                    "avg_prompt_tokens": round(totals["prompt_tokens"] / prompts, 1),
+                    "avg_latency_ms": round(totals["latency_seconds"] * 1000 / calls, 1),
+                    "p50_latency_ms": round(float(np.percentile(latencies, 50)), 1) if len(latencies) else 0.0,
+                    "p95_latency_ms": round(float(np.percentile(latencies, 95)), 1) if len(latencies) else 0.0
+                }
+            return report
+
+    def totals(self) -> Dict[str, float]:
+        """Calls, tokens and cost across all nodes"""
+        with self._lock:
+            return {
+                counter: sum(totals[counter] for totals in self._nodes.values())
+                for counter in CALL_COUNTERS
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+            self._latencies.clear()
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger() -> UsageLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+        return _ledger
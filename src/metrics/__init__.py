@@ -0,0 +1,31 @@
+# src/metrics/__init__.py
+from .provider import (
+    MetricsProvider,
+    MetricsVersion,
+    FileMetricsSource,
+    get_metrics_provider,
+    freeze,
+    thaw
+)
+from .ingestion import EventIngestor, CensusState, parse_event
+from .windows import RateWindows
+from .archive import MetricsArchive, get_metrics_archive
+from .anomaly import AnomalyDetector, ControlChart, get_anomaly_detector
+
+__all__ = [
+    'MetricsProvider',
+    'MetricsVersion',
+    'FileMetricsSource',
+    'get_metrics_provider',
+    'freeze',
+    'thaw',
+    'EventIngestor',
+    'CensusState',
+    'parse_event',
+    'RateWindows',
+    'MetricsArchive',
+    'get_metrics_archive',
+    'AnomalyDetector',
+    'ControlChart',
+    'get_anomaly_detector'
+]
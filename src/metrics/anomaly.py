@@ -0,0 +1,211 @@
+# src/metrics/anomaly.py
+from typing import Dict, List, Optional, Any
+from collections.abc import Mapping
+import math
+import threading
+from ..utils.logger import setup_logger
+from .archive import ARCHIVED_METRICS, ARCHIVED_DEPARTMENT_METRICS, ALL_DEPARTMENTS, _to_epoch
+
+logger = setup_logger(__name__)
+
+# Metrics where a downward shift is an improvement; all others improve upward
+LOWER_IS_BETTER = {
+    "patient_flow.waiting_patients",
+    "patient_flow.average_wait_time",
+    "quality.incident_count",
+    "staffing.overtime_hours",
+    "wait_time"
+}
+
+# Control chart defaults
+BASELINE_ALPHA = 0.02     # smoothing of the in-control mean and variance
+EWMA_LAMBDA = 0.2         # weight of the EWMA chart
+EWMA_LIMIT = 3.0          # EWMA control limit in sigmas
+CUSUM_K = 0.5             # CUSUM allowance in sigmas
+CUSUM_H = 5.0             # CUSUM decision interval in sigmas
+WARMUP_SAMPLES = 20       # observations before any flag is raised
+MIN_SIGMA = 1e-6
+
+
+class ControlChart:
+    """EWMA and two-sided CUSUM control charts for one metric series.
+
+    After an equal-weight warm-up, the in-control mean and variance are
+    exponentially weighted estimates, so every observation is an O(1)
+    update with constant memory. A shift is
+    flagged when the EWMA leaves its control limits or either CUSUM sum
+    exceeds the decision interval. The baseline stops adapting while the
+    series is out of control, so a sustained shift stays flagged.
+    """
+
+    __slots__ = (
+        "lower_is_better", "count", "mean", "variance", "ewma",
+        "cusum_high", "cusum_low", "last_value", "signal"
+    )
+
+    def __init__(self, lower_is_better: bool = False):
+        self.lower_is_better = lower_is_better
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.ewma = 0.0
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+        self.last_value: Optional[float] = None
+        self.signal: Optional[str] = None
+
+    @property
+    def sigma(self) -> float:
+        return max(math.sqrt(self.variance), MIN_SIGMA, abs(self.mean) * 1e-3)
+
+    def update(self, value: float) -> Optional[str]:
+        """Add an observation; returns "up", "down" or None"""
+        self.count += 1
+        self.last_value = value
+
+        if self.count <= WARMUP_SAMPLES:
+            # Equal-weight baseline until there is enough data to chart
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.variance += (delta * (value - self.mean) - self.variance) / self.count
+            self.ewma = self.mean
+            return None
+
+        sigma = self.sigma
+        z = (value - self.mean) / sigma
+        self.ewma = EWMA_LAMBDA * value + (1 - EWMA_LAMBDA) * self.ewma
+        self.cusum_high = max(0.0, self.cusum_high + z - CUSUM_K)
+        self.cusum_low = max(0.0, self.cusum_low - z - CUSUM_K)
+
+        limit = EWMA_LIMIT * sigma * math.sqrt(EWMA_LAMBDA / (2 - EWMA_LAMBDA))
+        signal = None
+        if self.ewma - self.mean > limit or self.cusum_high > CUSUM_H:
+            signal = "up"
+        elif self.mean - self.ewma > limit or self.cusum_low > CUSUM_H:
+            signal = "down"
+        self.signal = signal
+
+        if signal is None:
+            delta = value - self.mean
+            self.mean += BASELINE_ALPHA * delta
+            self.variance = (1 - BASELINE_ALPHA) * (self.variance + BASELINE_ALPHA * delta * delta)
+        return signal
+
+    @property
+    def trend(self) -> str:
+        if self.count <= WARMUP_SAMPLES:
+            return "Unknown"
+        if self.signal is None:
+            return "Stable"
+        improving = (self.signal == "down") == self.lower_is_better
+        return "Improving" if improving else "Declining"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "value": self.last_value,
+            "baseline": round(self.mean, 4),
+            "sigma": round(self.sigma, 4),
+            "ewma": round(self.ewma, 4),
+            "signal": self.signal,
+            "trend": self.trend,
+            "flagged": self.signal is not None,
+            "samples": self.count
+        }
+
+
+class AnomalyDetector:
+    """Control charts per (metric, department), fed from metric snapshots"""
+
+    def __init__(self):
+        self._charts: Dict[str, ControlChart] = {}
+        self._fed_at: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(metric: str, department: str) -> str:
+        return f"{department}|{metric}"
+
+    def observe(self, metric: str, value: float, department: str = ALL_DEPARTMENTS) -> Dict[str, Any]:
+        key = self._key(metric, department)
+        with self._lock:
+            chart = self._charts.get(key)
+            if chart is None:
+                chart = self._charts[key] = ControlChart(metric in LOWER_IS_BETTER)
+            chart.update(float(value))
+            return chart.status()
+
+    def observe_snapshot(self, metrics: Mapping, min_interval_seconds: int = 60) -> List[Dict[str, Any]]:
+        """Update the archived metrics of a snapshot that are new observations; returns new flags.
+
+        Publishes that leave a series unchanged are not samples of it: a
+        series is only fed when its value changed or ``min_interval_seconds``
+        have passed since it was last fed (as of the snapshot's
+        ``last_updated``), so sample counts follow the data, not the
+        publish rate.
+        """
+        flags = []
+        timestamp = _to_epoch(metrics.get("last_updated"))
+
+        def observe(metric: str, value, department: str) -> None:
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return
+            key = self._key(metric, department)
+            with self._lock:
+                chart = self._charts.get(key)
+                last_fed = self._fed_at.get(key)
+                if (chart is not None and chart.last_value == float(value)
+                        and last_fed is not None and timestamp - last_fed < min_interval_seconds):
+                    return
+                self._fed_at[key] = timestamp
+            status = self.observe(metric, value, department)
+            if status["flagged"]:
+                flags.append({"metric": metric, "department": department, **status})
+
+        try:
+            for name in ARCHIVED_METRICS:
+                category, field = name.split(".", 1)
+                observe(name, metrics.get(category, {}).get(field), ALL_DEPARTMENTS)
+
+            departments = metrics.get("patient_flow", {}).get("department_metrics", {})
+            for department, values in departments.items():
+                for field in ARCHIVED_DEPARTMENT_METRICS:
+                    observe(field, values.get(field), department)
+
+        except Exception as e:
+            logger.error(f"Error updating control charts: {str(e)}")
+            raise
+
+        if flags:
+            logger.info(f"{len(flags)} metric shift(s) flagged")
+        return flags
+
+    def status(self, metric: str, department: str = ALL_DEPARTMENTS) -> Optional[Dict[str, Any]]:
+        chart = self._charts.get(self._key(metric, department))
+        return chart.status() if chart is not None else None
+
+    def is_warm(self, metric: str, department: str = ALL_DEPARTMENTS) -> bool:
+        chart = self._charts.get(self._key(metric, department))
+        return chart is not None and chart.count > WARMUP_SAMPLES
+
+    def flagged(self, prefix: str = "") -> List[Dict[str, Any]]:
+        """Currently flagged series whose metric name starts with ``prefix``"""
+        with self._lock:
+            flags = []
+            for key, chart in self._charts.items():
+                department, metric = key.split("|", 1)
+                if chart.signal is not None and metric.startswith(prefix):
+                    flags.append({"metric": metric, "department": department, **chart.status()})
+            return sorted(flags, key=lambda flag: (flag["metric"], flag["department"]))
+
+
+_detector: Optional[AnomalyDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_anomaly_detector() -> AnomalyDetector:
+    """Shared detector updated from every published metrics version"""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = AnomalyDetector()
+        return _detector
@@ -0,0 +1,295 @@
+# src/metrics/archive.py
+from typing import Dict, List, Optional, Tuple, Sequence
+from collections.abc import Mapping
+from datetime import datetime
+import json
+import os
+import re
+import threading
+import numpy as np
+from ..config.settings import Settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Fixed-width record: epoch seconds + value (16 bytes)
+RECORD_DTYPE = np.dtype([("timestamp", "<i8"), ("value", "<f8")])
+
+ALL_DEPARTMENTS = "*"
+
+# Hospital-level metrics archived from each published snapshot
+ARCHIVED_METRICS = (
+    "patient_flow.occupied_beds",
+    "patient_flow.waiting_patients",
+    "patient_flow.average_wait_time",
+    "patient_flow.admission_rate",
+    "patient_flow.discharge_rate",
+    "resources.resource_utilization",
+    "quality.patient_satisfaction",
+    "quality.compliance_rate",
+    "quality.incident_count",
+    "staffing.overtime_hours",
+    "staffing.staff_satisfaction"
+)
+
+# Department-level metrics archived from department_metrics
+ARCHIVED_DEPARTMENT_METRICS = ("current_occupancy", "wait_time")
+
+# Relative change in slope per day below which a trend counts as stable
+STABLE_TREND_THRESHOLD = 0.005
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+
+
+def _to_epoch(value) -> int:
+    if value is None:
+        return int(datetime.now().timestamp())
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+class MetricsArchive:
+    """Append-only, memory-mapped history of metric values.
+
+    Every (department, metric) series is a file of fixed-width
+    (timestamp, value) records in time order. Because timestamps are
+    sorted, the timestamp column is the time index: a range lookup is two
+    binary searches (O(log n)) and returns zero-copy NumPy views into the
+    memory-mapped file, so aggregations run directly on the mapped pages.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._catalog_path = os.path.join(directory, "catalog.json")
+        self._catalog: Dict[str, str] = {}
+        self._maps: Dict[str, Tuple[int, np.ndarray]] = {}
+        self._last_timestamp: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self._catalog_path):
+            with open(self._catalog_path) as f:
+                self._catalog = json.load(f)
+
+    @staticmethod
+    def _key(metric: str, department: str) -> str:
+        return f"{department}|{metric}"
+
+    def _path(self, key: str, create: bool = False) -> Optional[str]:
+        filename = self._catalog.get(key)
+        if filename is None:
+            if not create:
+                return None
+            filename = re.sub(r"[^A-Za-z0-9_.-]", "_", key) + f"-{len(self._catalog)}.bin"
+            self._catalog[key] = filename
+            temporary = f"{self._catalog_path}.tmp"
+            with open(temporary, "w") as f:
+                json.dump(self._catalog, f, indent=2)
+            os.replace(temporary, self._catalog_path)
+        return os.path.join(self.directory, filename)
+
+    def series_names(self) -> List[Tuple[str, str]]:
+        """All archived (department, metric) pairs"""
+        return [tuple(key.split("|", 1)) for key in sorted(self._catalog)]
+
+    def append_many(
+        self,
+        metric: str,
+        timestamps: Sequence,
+        values: Sequence[float],
+        department: str = ALL_DEPARTMENTS
+    ) -> None:
+        """Append records; timestamps must not go backwards"""
+        records = np.empty(len(values), dtype=RECORD_DTYPE)
+        records["timestamp"] = [_to_epoch(t) for t in timestamps]
+        records["value"] = values
+        if len(records) == 0:
+            return
+        if np.any(np.diff(records["timestamp"]) < 0):
+            raise ValueError("Archive records must be appended in time order")
+
+        key = self._key(metric, department)
+        with self._lock:
+            last = self._last_timestamp.get(key)
+            if last is None:
+                existing = self._records(key)
+                last = int(existing["timestamp"][-1]) if len(existing) else None
+            if last is not None and records["timestamp"][0] < last:
+                raise ValueError(f"Out-of-order append to {key}")
+
+            with open(self._path(key, create=True), "ab") as f:
+                f.write(records.tobytes())
+            self._last_timestamp[key] = int(records["timestamp"][-1])
+
+    def append(
+        self,
+        metric: str,
+        value: float,
+        timestamp=None,
+        department: str = ALL_DEPARTMENTS
+    ) -> None:
+        self.append_many(metric, [_to_epoch(timestamp)], [value], department)
+
+    def last_timestamp(self, metric: str, department: str = ALL_DEPARTMENTS) -> Optional[int]:
+        key = self._key(metric, department)
+        if key not in self._last_timestamp:
+            records = self._records(key)
+            self._last_timestamp[key] = int(records["timestamp"][-1]) if len(records) else None
+        return self._last_timestamp[key]
+
+    def _records(self, key: str) -> np.ndarray:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return np.empty(0, dtype=RECORD_DTYPE)
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == count:
+            return cached[1]
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        mapped = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+        self._maps[key] = (count, mapped)
+        return mapped
+
+    def range(
+        self,
+        metric: str,
+        start=None,
+        end=None,
+        department: str = ALL_DEPARTMENTS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values) views for start <= t < end"""
+        records = self._records(self._key(metric, department))
+        timestamps = records["timestamp"]
+        lo = 0 if start is None else np.searchsorted(timestamps, _to_epoch(start), side="left")
+        hi = len(timestamps) if end is None else np.searchsorted(timestamps, _to_epoch(end), side="left")
+        return timestamps[lo:hi], records["value"][lo:hi]
+
+    def rolling_mean(
+        self,
+        metric: str,
+        window_seconds: int,
+        start=None,
+        end=None,
+        department: str = ALL_DEPARTMENTS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Time-based rolling mean over (t - window, t] for every point in the range"""
+        timestamps, values = self.range(metric, start, end, department)
+        if len(values) == 0:
+            return timestamps, np.empty(0)
+        cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        left = np.searchsorted(timestamps, timestamps - window_seconds, side="right")
+        right = np.arange(1, len(values) + 1)
+        return timestamps, (cumulative[right] - cumulative[left]) / (right - left)
+
+    def trend(
+        self,
+        metric: str,
+        start=None,
+        end=None,
+        department: str = ALL_DEPARTMENTS,
+        higher_is_better: bool = True
+    ) -> Dict:
+        """Least-squares trend over a time range"""
+        timestamps, values = self.range(metric, start, end, department)
+        if len(values) < 2 or timestamps[-1] == timestamps[0]:
+            return {"direction": "Unknown", "slope_per_day": 0.0, "samples": int(len(values))}
+
+        days = (timestamps - timestamps[0]) / SECONDS_PER_DAY
+        slope, _ = np.polyfit(days, values, 1)
+        mean = float(values.mean())
+        relative = slope / abs(mean) if mean else slope
+
+        if abs(relative) < STABLE_TREND_THRESHOLD:
+            direction = "Stable"
+        elif (slope > 0) == higher_is_better:
+            direction = "Improving"
+        else:
+            direction = "Declining"
+
+        return {
+            "direction": direction,
+            "slope_per_day": float(slope),
+            "mean": mean,
+            "samples": int(len(values))
+        }
+
+    def week_over_week(
+        self,
+        metric: str,
+        now=None,
+        department: str = ALL_DEPARTMENTS
+    ) -> Dict:
+        """Mean of the last 7 days against the 7 days before"""
+        now = _to_epoch(now)
+        _, this_week = self.range(metric, now - SECONDS_PER_WEEK, now + 1, department)
+        _, last_week = self.range(
+            metric, now - 2 * SECONDS_PER_WEEK, now - SECONDS_PER_WEEK, department
+        )
+        current = float(this_week.mean()) if len(this_week) else None
+        previous = float(last_week.mean()) if len(last_week) else None
+        change = current - previous if current is not None and previous is not None else None
+        return {
+            "this_week": current,
+            "last_week": previous,
+            "change": change,
+            "change_pct": (change / previous * 100
+                           if change is not None and previous else None)
+        }
+
+    def record_snapshot(
+        self,
+        metrics: Mapping,
+        timestamp=None,
+        min_interval_seconds: int = 60
+    ) -> int:
+        """Archive the numeric metrics of a snapshot; returns records written.
+
+        Series already written within ``min_interval_seconds`` are skipped so
+        frequent publishes keep roughly minute-level resolution.
+        """
+        timestamp = _to_epoch(timestamp)
+        written = 0
+
+        def archive(metric: str, value, department: str) -> None:
+            nonlocal written
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return
+            last = self.last_timestamp(metric, department)
+            if last is not None and timestamp - last < min_interval_seconds:
+                return
+            self.append(metric, float(value), timestamp, department)
+            written += 1
+
+        try:
+            for name in ARCHIVED_METRICS:
+                category, field = name.split(".", 1)
+                archive(name, metrics.get(category, {}).get(field), ALL_DEPARTMENTS)
+
+            departments = metrics.get("patient_flow", {}).get("department_metrics", {})
+            for department, values in departments.items():
+                for field in ARCHIVED_DEPARTMENT_METRICS:
+                    archive(field, values.get(field), department)
+
+        except Exception as e:
+            logger.error(f"Error archiving metrics snapshot: {str(e)}")
+            raise
+
+        return written
+
+
+_archive: Optional[MetricsArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_metrics_archive() -> Optional[MetricsArchive]:
+    """Shared archive in ``Settings.METRICS_ARCHIVE_DIR`` (None if not configured)"""
+    global _archive
+    if not Settings.METRICS_ARCHIVE_DIR:
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = MetricsArchive(Settings.METRICS_ARCHIVE_DIR)
+        return _archive
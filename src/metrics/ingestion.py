@@ -0,0 +1,371 @@
+# src/metrics/ingestion.py
+from typing import Dict, List, Optional, Any, Callable
+from datetime import datetime
+import json
+import os
+import re
+import threading
+import time
+from ..utils.logger import setup_logger
+from .provider import MetricsProvider
+from .windows import RateWindows
+
+logger = setup_logger(__name__)
+
+ADMIT = "admit"
+DISCHARGE = "discharge"
+TRANSFER = "transfer"
+ARRIVE = "arrive"
+EVENT_TYPES = (ADMIT, DISCHARGE, TRANSFER, ARRIVE)
+
+# HL7 ADT trigger events mapped to event types
+HL7_EVENT_CODES = {
+    "A01": ADMIT,
+    "A02": TRANSFER,
+    "A03": DISCHARGE,
+    "A04": ARRIVE
+}
+
+# Window reported as the headline admission/discharge rate
+HEADLINE_RATE_WINDOW = "1h"
+
+# Department used for events that do not name one
+UNASSIGNED_DEPARTMENT = "Unassigned"
+
+# HL7 v2 TS: YYYYMMDD[HH[MM[SS]]][.fraction][+/-ZZZZ]
+HL7_TIMESTAMP = re.compile(r"(\d{8}(?:\d{2}){0,3})(\.\d{1,4})?([+-]\d{4})?")
+HL7_FORMATS = {8: "%Y%m%d", 10: "%Y%m%d%H", 12: "%Y%m%d%H%M", 14: "%Y%m%d%H%M%S"}
+
+DEPARTMENT_COUNTERS = (
+    "current_occupancy",
+    "waiting",
+    "admissions",
+    "discharges",
+    "transfers_in",
+    "transfers_out"
+)
+
+
+def _parse_hl7_timestamp(value: str) -> Optional[float]:
+    """Epoch seconds for an HL7 TS string (local time without an offset), else None"""
+    match = HL7_TIMESTAMP.fullmatch(value)
+    if not match:
+        return None
+    digits, fraction, offset = match.groups()
+    try:
+        parsed = datetime.strptime(digits + (offset or ""), HL7_FORMATS[len(digits)] + ("%z" if offset else ""))
+    except ValueError:
+        return None
+    if parsed.year < 1900:
+        # A 10-digit epoch timestamp, not YYYYMMDDHH
+        return None
+    return parsed.timestamp() + float(fraction or 0)
+
+
+def _parse_timestamp(value: Any) -> float:
+    if value in (None, ""):
+        return datetime.now().timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    timestamp = _parse_hl7_timestamp(value)
+    if timestamp is not None:
+        return timestamp
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def parse_event(line: str) -> Optional[Dict]:
+    """Parse one event line.
+
+    JSONL: {"type": "admit", "department": "ER", "to_department": ...,
+    "patient_id": ..., "timestamp": ISO-8601, HL7 TS or epoch seconds}.
+    Pipe-delimited (HL7-like): ``ADT|A01|timestamp|patient_id|department|to_department``,
+    where timestamps are HL7 TS (``YYYYMMDDHHMMSS``) or epoch seconds.
+    Returns None for blank lines.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if line.startswith("{"):
+        record = json.loads(line)
+        event_type = str(record["type"]).lower()
+        department = record.get("department")
+        to_department = record.get("to_department")
+        patient_id = record.get("patient_id")
+        timestamp = record.get("timestamp")
+    else:
+        fields = line.split("|") + [""] * 6
+        if fields[0] != "ADT" or fields[1] not in HL7_EVENT_CODES:
+            raise ValueError(f"Unsupported event record: {line[:40]}")
+        event_type = HL7_EVENT_CODES[fields[1]]
+        timestamp, patient_id, department, to_department = fields[2:6]
+
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown event type: {event_type}")
+
+    return {
+        "type": event_type,
+        "department": department or None,
+        "to_department": to_department or None,
+        "patient_id": patient_id or None,
+        "timestamp": _parse_timestamp(timestamp)
+    }
+
+
+class CensusState:
+    """Occupancy, waiting and flow counters maintained in O(1) per event"""
+
+    def __init__(
+        self,
+        occupied_beds: int = 0,
+        waiting_patients: int = 0,
+        departments: Optional[Dict[str, Dict[str, int]]] = None
+    ):
+        self.occupied_beds = occupied_beds
+        self.waiting_patients = waiting_patients
+        self.departments: Dict[str, Dict[str, int]] = departments or {}
+        self.rate_windows = RateWindows()
+        self.events_processed = 0
+
+    @classmethod
+    def from_metrics(cls, metrics: Dict) -> "CensusState":
+        """Seed counters from the current hospital metrics"""
+        patient_flow = metrics["patient_flow"]
+        departments = {
+            name: {
+                **dict.fromkeys(DEPARTMENT_COUNTERS, 0),
+                "current_occupancy": dept.get("current_occupancy", 0)
+            }
+            for name, dept in patient_flow.get("department_metrics", {}).items()
+        }
+        return cls(
+            occupied_beds=patient_flow.get("occupied_beds", 0),
+            waiting_patients=patient_flow.get("waiting_patients", 0),
+            departments=departments
+        )
+
+    def _department(self, name: Optional[str]) -> Dict[str, int]:
+        name = name or UNASSIGNED_DEPARTMENT
+        counters = self.departments.get(name)
+        if counters is None:
+            counters = self.departments[name] = dict.fromkeys(DEPARTMENT_COUNTERS, 0)
+        return counters
+
+    def apply(self, event: Dict) -> None:
+        """Apply a single parsed event"""
+        self.events_processed += 1
+        event_type = event["type"]
+        name = event["department"] or UNASSIGNED_DEPARTMENT
+        department = self._department(name)
+        self.rate_windows.record(event_type, name, event["timestamp"])
+
+        if event_type == ARRIVE:
+            department["waiting"] += 1
+            self.waiting_patients += 1
+        elif event_type == ADMIT:
+            if department["waiting"] > 0:
+                department["waiting"] -= 1
+                self.waiting_patients = max(self.waiting_patients - 1, 0)
+            department["current_occupancy"] += 1
+            department["admissions"] += 1
+            self.occupied_beds += 1
+        elif event_type == DISCHARGE:
+            department["current_occupancy"] = max(department["current_occupancy"] - 1, 0)
+            department["discharges"] += 1
+            self.occupied_beds = max(self.occupied_beds - 1, 0)
+        elif event_type == TRANSFER:
+            target = self._department(event["to_department"])
+            department["current_occupancy"] = max(department["current_occupancy"] - 1, 0)
+            department["transfers_out"] += 1
+            target["current_occupancy"] += 1
+            target["transfers_in"] += 1
+
+    def rate_metrics(self, now: Optional[float] = None) -> Dict:
+        """Only the admission/discharge rate fields, as of ``now``"""
+        now = now if now is not None else datetime.now().timestamp()
+        windows = self.rate_windows
+        admission = windows.rates(ADMIT, now=now)
+        discharge = windows.rates(DISCHARGE, now=now)
+
+        return {
+            "patient_flow": {
+                "admission_rate": admission[HEADLINE_RATE_WINDOW],
+                "discharge_rate": discharge[HEADLINE_RATE_WINDOW],
+                "rate_windows": {"admission": admission, "discharge": discharge},
+                "department_metrics": {
+                    name: {
+                        "admission_rate": windows.rate(ADMIT, HEADLINE_RATE_WINDOW, name, now),
+                        "discharge_rate": windows.rate(DISCHARGE, HEADLINE_RATE_WINDOW, name, now)
+                    }
+                    for name in list(self.departments)
+                }
+            }
+        }
+
+    def to_metrics(self, now: Optional[float] = None) -> Dict:
+        """Partial ``HospitalMetrics`` to publish, with rates as of ``now``"""
+        metrics = self.rate_metrics(now)
+        flow = metrics["patient_flow"]
+        flow["occupied_beds"] = self.occupied_beds
+        flow["waiting_patients"] = self.waiting_patients
+        for name, counters in self.departments.items():
+            flow["department_metrics"][name] = {
+                "name": name,
+                **counters,
+                **flow["department_metrics"][name]
+            }
+        return metrics
+
+    def to_dict(self) -> Dict:
+        return {
+            "occupied_beds": self.occupied_beds,
+            "waiting_patients": self.waiting_patients,
+            "departments": self.departments,
+            "rate_windows": self.rate_windows.to_dict(),
+            "events_processed": self.events_processed
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CensusState":
+        census = cls(data["occupied_beds"], data["waiting_patients"], data["departments"])
+        census.rate_windows = RateWindows.from_dict(data.get("rate_windows", {}))
+        census.events_processed = data.get("events_processed", 0)
+        return census
+
+
+class EventIngestor:
+    """Tail an append-only ADT event file into a ``MetricsProvider``.
+
+    Each poll reads only the complete lines appended since the last offset,
+    applies them to the census in O(1) per event, publishes one new metrics
+    version and checkpoints the offset together with the counters so that a
+    restart resumes without recomputation. Polls without new events still
+    republish the rate fields once they change as the windows slide, so
+    rates decay to zero during quiet periods.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        provider: MetricsProvider,
+        checkpoint_path: Optional[str] = None,
+        poll_interval: float = 1.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.provider = provider
+        self.checkpoint_path = checkpoint_path
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.offset = 0
+        self.errors = 0
+        self._published_rates: Optional[Dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        provider.ingestor = self
+
+        checkpoint = self._load_checkpoint()
+        if checkpoint:
+            self.offset = checkpoint["offset"]
+            self.census = CensusState.from_dict(checkpoint["census"])
+        else:
+            self.census = CensusState.from_metrics(provider.current.metrics)
+
+    def _load_checkpoint(self) -> Optional[Dict]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Ignoring unreadable ingestion checkpoint: {str(e)}")
+            return None
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"offset": self.offset, "census": self.census.to_dict()}, f)
+        os.replace(temporary, self.checkpoint_path)
+
+    def poll(self) -> int:
+        """Ingest newly appended events; returns the number applied"""
+        try:
+            if not os.path.exists(self.path):
+                return 0
+            checkpointed = self.offset
+            if os.path.getsize(self.path) < self.offset:
+                logger.warning(f"Event file {self.path} was truncated; restarting from the beginning")
+                self.offset = 0
+
+            applied = 0
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Partial write; pick it up on the next poll
+                        break
+                    self.offset += len(line)
+                    try:
+                        event = parse_event(line.decode("utf-8"))
+                    except Exception as e:
+                        self.errors += 1
+                        logger.warning(f"Skipping malformed event: {str(e)}")
+                        continue
+                    if event is not None:
+                        self.census.apply(event)
+                        applied += 1
+
+            now = self.clock()
+            if applied:
+                metrics = self.census.to_metrics(now)
+                self.provider.publish(metrics)
+                self._published_rates = self.census.rate_metrics(now)
+            else:
+                self._refresh_rates(now)
+            if self.offset != checkpointed:
+                self._save_checkpoint()
+            return applied
+
+        except Exception as e:
+            logger.error(f"Error ingesting events from {self.path}: {str(e)}")
+            raise
+
+    def rate_metrics(self) -> Dict:
+        """Rate fields as of the ingestor's clock, independent of the last poll"""
+        return self.census.rate_metrics(self.clock())
+
+    def _refresh_rates(self, now: float) -> None:
+        """Republish rates that moved as the windows slid past old events"""
+        rates = self.census.rate_metrics(now)
+        if self._published_rates is not None and rates != self._published_rates:
+            self.provider.publish(rates)
+        self._published_rates = rates
+
+    def start(self) -> None:
+        """Poll the event file from a background daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-ingestor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # poll() already logged the failure; keep tailing
+                pass
+            self._stop.wait(self.poll_interval)
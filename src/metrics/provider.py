@@ -0,0 +1,273 @@
+# src/metrics/provider.py
+from typing import Dict, List, Optional, Any, Callable
+from types import MappingProxyType
+from collections.abc import Mapping
+from datetime import datetime
+import csv
+import json
+import os
+import threading
+from ..config.settings import Settings
+from ..models.state import HospitalMetrics, default_metrics
+from ..models.metrics_store import MetricsSnapshot
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Metric keys parsed back into datetimes when loading JSON
+DATETIME_KEYS = ("last_updated", "last_audit_date")
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of ``freeze``: mutable deep copy as plain dicts and lists"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def merge_metrics(base: Dict, update: Mapping) -> Dict:
+    """Deep-merge ``update`` into a copy of ``base``"""
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            merged[key] = merge_metrics(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class MetricsVersion:
+    """One immutable, versioned view of hospital metrics"""
+
+    __slots__ = ("version", "metrics", "snapshot", "loaded_at")
+
+    def __init__(self, version: int, metrics: Mapping, snapshot: MetricsSnapshot):
+        self.version = version
+        self.metrics = metrics
+        self.snapshot = snapshot
+        self.loaded_at = datetime.now()
+
+
+class FileMetricsSource:
+    """Metrics from a file drop, re-read only when the file changes.
+
+    JSON files hold (partial) ``HospitalMetrics`` in the nested dict form.
+    CSV files hold one department per row (``name``, ``capacity``,
+    ``current_occupancy``, ``wait_time`` and ``staff_<role>`` columns);
+    hospital bed totals are derived from the rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime: Optional[float] = None
+
+    def load(self) -> Optional[Dict]:
+        """Return new metrics if the file changed since the last load"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            logger.warning(f"Metrics source not found: {self.path}")
+            return None
+        if mtime == self._mtime:
+            return None
+
+        if self.path.lower().endswith(".csv"):
+            metrics = self._load_csv()
+        else:
+            metrics = self._load_json()
+        self._mtime = mtime
+        return metrics
+
+    def _load_json(self) -> Dict:
+        with open(self.path) as f:
+            metrics = json.load(f)
+
+        def parse_dates(values: Dict) -> None:
+            for key, value in values.items():
+                if isinstance(value, dict):
+                    parse_dates(value)
+                elif key in DATETIME_KEYS and isinstance(value, str):
+                    values[key] = datetime.fromisoformat(value)
+
+        parse_dates(metrics)
+        return metrics
+
+    def _load_csv(self) -> Dict:
+        departments = {}
+        with open(self.path, newline="") as f:
+            for row in csv.DictReader(f):
+                name = row["name"]
+                departments[name] = {
+                    "id": row.get("id") or name,
+                    "name": name,
+                    "capacity": int(row.get("capacity") or 0),
+                    "current_occupancy": int(row.get("current_occupancy") or 0),
+                    "staff_count": {
+                        key[len("staff_"):]: int(value or 0)
+                        for key, value in row.items()
+                        if key.startswith("staff_")
+                    },
+                    "wait_time": int(float(row.get("wait_time") or 0))
+                }
+
+        patient_flow: Dict[str, Any] = {"department_metrics": departments}
+        if departments:
+            patient_flow["total_beds"] = sum(d["capacity"] for d in departments.values())
+            patient_flow["occupied_beds"] = sum(
+                d["current_occupancy"] for d in departments.values()
+            )
+            patient_flow["average_wait_time"] = sum(
+                d["wait_time"] for d in departments.values()
+            ) / len(departments)
+        return {"patient_flow": patient_flow}
+
+
+class MetricsProvider:
+    """Process-wide holder of the current metrics snapshot.
+
+    Each refresh or ``publish`` builds a new frozen metrics tree, bumps the
+    version and swaps it in atomically. Requests take ``current`` once and
+    store its metrics in their state by reference, so they share a
+    consistent view and never rebuild the tree.
+    """
+
+    def __init__(
+        self,
+        source: Optional[FileMetricsSource] = None,
+        refresh_interval: Optional[float] = None,
+        initial_metrics: Optional[HospitalMetrics] = None
+    ):
+        self.source = source
+        self.refresh_interval = (refresh_interval if refresh_interval is not None
+                                 else Settings.METRICS_REFRESH_INTERVAL)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[MetricsVersion], None]] = []
+        # EventIngestor feeding this provider, for rates read at query time
+        self.ingestor: Optional[Any] = None
+        self._current = self._build(0, initial_metrics or default_metrics())
+        if source is not None:
+            self.refresh()
+
+    @property
+    def current(self) -> MetricsVersion:
+        return self._current
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    def _build(self, version: int, metrics: Dict) -> MetricsVersion:
+        metrics = dict(metrics)
+        metrics.setdefault("last_updated", datetime.now())
+        return MetricsVersion(version, freeze(metrics), MetricsSnapshot.from_metrics(metrics))
+
+    def publish(self, metrics: Mapping, merge: bool = True) -> MetricsVersion:
+        """Install new metrics (merged over the current ones by default)"""
+        with self._lock:
+            base = thaw(self._current.metrics) if merge else default_metrics()
+            updated = merge_metrics(base, metrics)
+            updated["last_updated"] = metrics.get("last_updated", datetime.now())
+            self._current = self._build(self._current.version + 1, updated)
+            current = self._current
+
+        for listener in list(self._listeners):
+            try:
+                listener(current)
+            except Exception as e:
+                logger.error(f"Metrics listener failed: {str(e)}")
+        return current
+
+    def subscribe(self, listener: Callable[[MetricsVersion], None]) -> None:
+        """Call ``listener`` with every newly published version"""
+        self._listeners.append(listener)
+
+    def refresh(self) -> bool:
+        """Reload from the source; returns True if a new version was published"""
+        if self.source is None:
+            return False
+        try:
+            metrics = self.source.load()
+        except Exception as e:
+            logger.error(f"Error loading metrics source: {str(e)}")
+            return False
+        if metrics is None:
+            return False
+        version = self.publish(metrics)
+        logger.info(f"Metrics refreshed to version {version.version}")
+        return True
+
+    def start(self) -> None:
+        """Start refreshing from the source in a background daemon thread"""
+        if self.source is None or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-provider", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.refresh_interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+
+_provider: Optional[MetricsProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_metrics_provider() -> MetricsProvider:
+    """Shared provider configured from ``Settings.METRICS_SOURCE``.
+
+    When ``Settings.ADT_EVENT_FILE`` is set, an ``EventIngestor`` tails it
+    into the provider as well; when ``Settings.METRICS_ARCHIVE_DIR`` is set,
+    every published version is archived. Published versions always feed
+    the shared ``AnomalyDetector``.
+    """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            source = (FileMetricsSource(Settings.METRICS_SOURCE)
+                      if Settings.METRICS_SOURCE else None)
+            _provider = MetricsProvider(source=source)
+
+            from .anomaly import get_anomaly_detector
+            detector = get_anomaly_detector()
+            _provider.subscribe(lambda version: detector.observe_snapshot(version.metrics))
+
+            if Settings.METRICS_ARCHIVE_DIR:
+                from .archive import get_metrics_archive
+                archive = get_metrics_archive()
+                _provider.subscribe(
+                    lambda version: archive.record_snapshot(
+                        version.metrics, version.metrics.get("last_updated")
+                    )
+                )
+            _provider.start()
+
+            if Settings.ADT_EVENT_FILE:
+                from .ingestion import EventIngestor
+                EventIngestor(
+                    Settings.ADT_EVENT_FILE,
+                    _provider,
+                    checkpoint_path=Settings.ADT_CHECKPOINT_FILE
+                ).start()
+        return _provider
@@ -0,0 +1,167 @@
+# src/metrics/windows.py
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import threading
+
+# Window name -> (bucket width in seconds, number of buckets)
+RATE_WINDOWS = {
+    "15m": (60, 15),
+    "1h": (60, 60),
+    "24h": (900, 96)
+}
+
+# Key used for hospital-wide counters
+ALL_DEPARTMENTS = "*"
+
+
+class WindowedCounter:
+    """Event count over a sliding time window, kept in a ring of buckets.
+
+    Memory is fixed at ``num_buckets`` integers. Adding an event and reading
+    the window total are O(1); buckets that slide out of the window are
+    cleared lazily as time advances (amortized O(1) per bucket width).
+    """
+
+    __slots__ = ("bucket_seconds", "num_buckets", "counts", "total", "head")
+
+    def __init__(self, bucket_seconds: float, num_buckets: int):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self.counts = [0] * num_buckets
+        self.total = 0
+        self.head: Optional[int] = None
+
+    @property
+    def window_seconds(self) -> float:
+        return self.bucket_seconds * self.num_buckets
+
+    def _advance(self, bucket: int) -> None:
+        if self.head is None:
+            self.head = bucket
+            return
+        if bucket <= self.head:
+            return
+        if bucket - self.head >= self.num_buckets:
+            self.counts = [0] * self.num_buckets
+            self.total = 0
+        else:
+            for expired in range(self.head + 1, bucket + 1):
+                slot = expired % self.num_buckets
+                self.total -= self.counts[slot]
+                self.counts[slot] = 0
+        self.head = bucket
+
+    def add(self, timestamp: float, count: int = 1) -> None:
+        bucket = int(timestamp // self.bucket_seconds)
+        self._advance(bucket)
+        if bucket <= self.head - self.num_buckets:
+            # Older than the window; nothing to count
+            return
+        self.counts[bucket % self.num_buckets] += count
+        self.total += count
+
+    def count(self, now: float) -> int:
+        """Events within the window ending at ``now``"""
+        self._advance(int(now // self.bucket_seconds))
+        return self.total
+
+    def rate_per_hour(self, now: float) -> float:
+        return self.count(now) * 3600 / self.window_seconds
+
+    def to_dict(self) -> Dict:
+        return {"counts": list(self.counts), "total": self.total, "head": self.head}
+
+    def load(self, data: Dict) -> None:
+        if len(data["counts"]) != self.num_buckets:
+            raise ValueError("Windowed counter layout changed")
+        self.counts = list(data["counts"])
+        self.total = data["total"]
+        self.head = data["head"]
+
+
+class RateWindows:
+    """Sliding-window event rates per (event type, department).
+
+    Each key owns one ``WindowedCounter`` per entry of ``RATE_WINDOWS``
+    (15 min, 1 h and 24 h by default), so memory depends only on the number
+    of departments and event types, never on event volume. Every event is
+    also recorded under the hospital-wide key ``"*"``.
+    """
+
+    def __init__(self, windows: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.windows = dict(windows or RATE_WINDOWS)
+        self._counters: Dict[Tuple[str, str], Dict[str, WindowedCounter]] = {}
+        self._lock = threading.Lock()
+
+    def _counters_for(self, event_type: str, department: str) -> Dict[str, WindowedCounter]:
+        key = (event_type, department)
+        counters = self._counters.get(key)
+        if counters is None:
+            counters = self._counters[key] = {
+                name: WindowedCounter(bucket_seconds, num_buckets)
+                for name, (bucket_seconds, num_buckets) in self.windows.items()
+            }
+        return counters
+
+    def record(
+        self,
+        event_type: str,
+        department: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        count: int = 1
+    ) -> None:
+        timestamp = timestamp if timestamp is not None else datetime.now().timestamp()
+        keys = [ALL_DEPARTMENTS] if department in (None, ALL_DEPARTMENTS) \
+            else [department, ALL_DEPARTMENTS]
+        with self._lock:
+            for key in keys:
+                for counter in self._counters_for(event_type, key).values():
+                    counter.add(timestamp, count)
+
+    def rates(
+        self,
+        event_type: str,
+        department: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Events per hour over every window, e.g. {"15m": 4.0, "1h": 3.5, "24h": 3.1}"""
+        now = now if now is not None else datetime.now().timestamp()
+        with self._lock:
+            counters = self._counters.get((event_type, department or ALL_DEPARTMENTS))
+            if counters is None:
+                return {name: 0.0 for name in self.windows}
+            return {
+                name: round(counter.rate_per_hour(now), 2)
+                for name, counter in counters.items()
+            }
+
+    def rate(
+        self,
+        event_type: str,
+        window: str = "1h",
+        department: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> float:
+        return self.rates(event_type, department, now)[window]
+
+    def departments(self) -> List[str]:
+        return sorted({department for _, department in self._counters} - {ALL_DEPARTMENTS})
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                f"{event_type}|{department}": {
+                    name: counter.to_dict() for name, counter in counters.items()
+                }
+                for (event_type, department), counters in self._counters.items()
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict, windows: Optional[Dict[str, Tuple[int, int]]] = None) -> "RateWindows":
+        rate_windows = cls(windows)
+        for key, counters in data.items():
+            event_type, department = key.split("|", 1)
+            for name, counter in rate_windows._counters_for(event_type, department).items():
+                if name in counters:
+                    counter.load(counters[name])
+        return rate_windows
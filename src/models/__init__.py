@@ -10,10 +10,12 @@ from .state import (
     StaffingMetrics,
     HospitalMetrics,
     AnalysisResult,
+    default_metrics,
     create_initial_state,
     validate_state,
     update_state_metrics
 )
+from .metrics_store import MetricsSnapshot, DepartmentView
 
 __all__ = [
     'TaskType',
@@ -26,7 +28,10 @@ __all__ = [
     'StaffingMetrics',
     'HospitalMetrics',
     'AnalysisResult',
+    'default_metrics',
     'create_initial_state',
     'validate_state',
-    'update_state_metrics'
+    'update_state_metrics',
+    'MetricsSnapshot',
+    'DepartmentView'
 ]
\ No newline at end of file
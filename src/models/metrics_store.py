@@ -0,0 +1,212 @@
+# src/models/metrics_store.py
+from typing import Dict, List, Optional, Any, Iterator
+from collections.abc import Mapping
+from datetime import datetime
+import copy
+import numpy as np
+from .state import Department, HospitalMetrics
+
+# Per-department numeric columns, in Department field order
+DEPARTMENT_COLUMNS = ("capacity", "current_occupancy", "wait_time")
+
+METRIC_CATEGORIES = ("patient_flow", "resources", "quality", "staffing")
+
+
+def _plain(value: Any) -> Any:
+    """Mutable copy of possibly read-only (published) metrics values"""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+class DepartmentView:
+    """Zero-copy view of one department's row in a ``MetricsSnapshot``"""
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot: "MetricsSnapshot", index: int):
+        self._snapshot = snapshot
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._snapshot.department_ids[self._index]
+
+    @property
+    def name(self) -> str:
+        return self._snapshot.department_names[self._index]
+
+    @property
+    def capacity(self) -> int:
+        return int(self._snapshot.columns["capacity"][self._index])
+
+    @property
+    def current_occupancy(self) -> int:
+        return int(self._snapshot.columns["current_occupancy"][self._index])
+
+    @property
+    def wait_time(self) -> int:
+        return int(self._snapshot.columns["wait_time"][self._index])
+
+    @property
+    def occupancy_rate(self) -> float:
+        capacity = self.capacity
+        return self.current_occupancy / capacity if capacity else 0.0
+
+    @property
+    def staff_row(self) -> np.ndarray:
+        """Staff counts aligned with ``MetricsSnapshot.staff_roles`` (a view)"""
+        return self._snapshot.staff_counts[self._index]
+
+    @property
+    def staff_count(self) -> Dict[str, int]:
+        return dict(zip(self._snapshot.staff_roles, self.staff_row.tolist()))
+
+    def as_dict(self) -> Department:
+        """Department in the TypedDict form used by ``department_metrics``"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "capacity": self.capacity,
+            "current_occupancy": self.current_occupancy,
+            "staff_count": self.staff_count,
+            "wait_time": self.wait_time
+        }
+
+    def __repr__(self) -> str:
+        return f"DepartmentView({self.name!r}, occupancy={self.current_occupancy}/{self.capacity})"
+
+
+class MetricsSnapshot:
+    """Compact, read-only representation of ``HospitalMetrics``.
+
+    Department metrics are stored as one NumPy column per metric plus a
+    department-name -> row index map, so a department is read in O(1)
+    through a ``DepartmentView`` without copying and fleet-wide figures
+    (e.g. occupancy rates) are single array operations. Hospital-level
+    scalars stay in their per-category dicts.
+    """
+
+    __slots__ = (
+        "categories",
+        "department_ids",
+        "department_names",
+        "department_index",
+        "columns",
+        "staff_roles",
+        "staff_counts",
+        "last_updated"
+    )
+
+    def __init__(
+        self,
+        categories: Dict[str, Dict[str, Any]],
+        department_ids: List[str],
+        department_names: List[str],
+        columns: Dict[str, np.ndarray],
+        staff_roles: List[str],
+        staff_counts: np.ndarray,
+        last_updated: Optional[datetime] = None
+    ):
+        self.categories = categories
+        self.department_ids = tuple(department_ids)
+        self.department_names = tuple(department_names)
+        self.department_index = {name: i for i, name in enumerate(department_names)}
+        self.columns = {name: _readonly(column) for name, column in columns.items()}
+        self.staff_roles = tuple(staff_roles)
+        self.staff_counts = _readonly(staff_counts)
+        self.last_updated = last_updated or datetime.now()
+
+    @classmethod
+    def from_departments(
+        cls,
+        departments: List[Department],
+        categories: Optional[Dict[str, Dict[str, Any]]] = None,
+        last_updated: Optional[datetime] = None
+    ) -> "MetricsSnapshot":
+        """Build columns from a list of department dicts"""
+        staff_roles: List[str] = []
+        for dept in departments:
+            for role in dept.get("staff_count", {}):
+                if role not in staff_roles:
+                    staff_roles.append(role)
+
+        columns = {
+            column: np.array([dept.get(column, 0) for dept in departments], dtype=np.int64)
+            for column in DEPARTMENT_COLUMNS
+        }
+        staff_counts = np.array(
+            [[dept.get("staff_count", {}).get(role, 0) for role in staff_roles]
+             for dept in departments],
+            dtype=np.int64
+        ).reshape(len(departments), len(staff_roles))
+
+        return cls(
+            categories=categories or {category: {} for category in METRIC_CATEGORIES},
+            department_ids=[dept.get("id", dept["name"]) for dept in departments],
+            department_names=[dept["name"] for dept in departments],
+            columns=columns,
+            staff_roles=staff_roles,
+            staff_counts=staff_counts,
+            last_updated=last_updated
+        )
+
+    @classmethod
+    def from_metrics(cls, metrics: HospitalMetrics) -> "MetricsSnapshot":
+        """Convert the nested dict form into a snapshot"""
+        categories = {}
+        for category in METRIC_CATEGORIES:
+            values = dict(metrics.get(category, {}))
+            values.pop("department_metrics", None)
+            categories[category] = _plain(values)
+
+        department_metrics = metrics.get("patient_flow", {}).get("department_metrics", {})
+        departments = [
+            {"name": name, **dept} for name, dept in department_metrics.items()
+        ]
+        return cls.from_departments(departments, categories, metrics.get("last_updated"))
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "MetricsSnapshot":
+        """The request's snapshot: the one published with its metrics
+        (``state["metrics_snapshot"]``), else converted from ``state["metrics"]``"""
+        snapshot = state.get("metrics_snapshot")
+        return snapshot if snapshot is not None else cls.from_metrics(state["metrics"])
+
+    def to_metrics(self) -> HospitalMetrics:
+        """Convert back into the nested ``HospitalMetrics`` dict form"""
+        metrics = copy.deepcopy(self.categories)
+        metrics.setdefault("patient_flow", {})["department_metrics"] = {
+            view.name: view.as_dict() for view in self
+        }
+        metrics["last_updated"] = self.last_updated
+        return metrics
+
+    def department(self, name: str) -> DepartmentView:
+        """O(1) lookup of a department by name"""
+        index = self.department_index.get(name)
+        if index is None:
+            raise KeyError(f"Unknown department: {name}")
+        return DepartmentView(self, index)
+
+    def occupancy_rates(self) -> np.ndarray:
+        """Occupancy / capacity for every department (0 where capacity is 0)"""
+        capacity = self.columns["capacity"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(capacity > 0, self.columns["current_occupancy"] / capacity, 0.0)
+
+    def __len__(self) -> int:
+        return len(self.department_names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.department_index
+
+    def __iter__(self) -> Iterator[DepartmentView]:
+        return (DepartmentView(self, i) for i in range(len(self.department_names)))
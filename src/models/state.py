@@ -1,5 +1,5 @@
 # src/models/state.py
-from typing import Annotated, List, Dict, Optional
+from typing import Annotated, List, Dict, Optional, Any
 from typing_extensions import TypedDict  # Changed this import
 from langchain_core.messages import AnyMessage
 from datetime import datetime
@@ -92,59 +92,74 @@ class HospitalState(TypedDict):
     priority_level: PriorityLevel
     department: Optional[str]
     metrics: HospitalMetrics
+    metrics_snapshot: Optional[Any]  # MetricsSnapshot of ``metrics``, when published
     analysis: Optional[AnalysisResult]
     context: Dict[str, any]  # Will include routing information
     timestamp: datetime
     thread_id: str
 
 
-def create_initial_state(thread_id: str) -> HospitalState:
-    """Create initial state with default values"""
+def default_metrics() -> HospitalMetrics:
+    """Placeholder hospital metrics used when no live metrics source is configured"""
+    return {
+        "patient_flow": {
+            "total_beds": 300,
+            "occupied_beds": 240,
+            "waiting_patients": 15,
+            "average_wait_time": 35.0,
+            "admission_rate": 4.2,
+            "discharge_rate": 3.8,
+            "department_metrics": {}
+        },
+        "resources": {
+            "equipment_availability": {},
+            "supply_levels": {},
+            "resource_utilization": 0.75,
+            "pending_requests": 5,
+            "critical_supplies": []
+        },
+        "quality": {
+            "patient_satisfaction": 8.5,
+            "care_outcomes": {},
+            "compliance_rate": 0.95,
+            "incident_count": 2,
+            "quality_scores": {},
+            "last_audit_date": datetime.now()
+        },
+        "staffing": {
+            "total_staff": 500,
+            "available_staff": {
+                "doctors": 50,
+                "nurses": 150,
+                "specialists": 30,
+                "support": 70
+            },
+            "shifts_coverage": {},
+            "overtime_hours": 120.5,
+            "skill_mix_index": 0.85,
+            "staff_satisfaction": 7.8
+        },
+        "last_updated": datetime.now()
+    }
+
+def create_initial_state(
+    thread_id: str,
+    metrics: Optional[HospitalMetrics] = None,
+    snapshot: Optional[Any] = None
+) -> HospitalState:
+    """Create initial state with default values.
+
+    ``metrics`` is stored by reference; pass a shared read-only snapshot
+    (see ``src.metrics.MetricsProvider``) to avoid rebuilding it per request,
+    and its ``MetricsSnapshot`` so nodes read departments without converting.
+    """
     return {       
         "messages": [],
         "current_task": TaskType.GENERAL,
         "priority_level": PriorityLevel.MEDIUM,
         "department": None,
-        "metrics": {
-            "patient_flow": {
-                "total_beds": 300,
-                "occupied_beds": 240,
-                "waiting_patients": 15,
-                "average_wait_time": 35.0,
-                "admission_rate": 4.2,
-                "discharge_rate": 3.8,
-                "department_metrics": {}
-            },
-            "resources": {
-                "equipment_availability": {},
-                "supply_levels": {},
-                "resource_utilization": 0.75,
-                "pending_requests": 5,
-                "critical_supplies": []
-            },
-            "quality": {
-                "patient_satisfaction": 8.5,
-                "care_outcomes": {},
-                "compliance_rate": 0.95,
-                "incident_count": 2,
-                "quality_scores": {},
-                "last_audit_date": datetime.now()
-            },
-            "staffing": {
-                "total_staff": 500,
-                "available_staff": {
-                    "doctors": 50,
-                    "nurses": 150,
-                    "specialists": 30,
-                    "support": 70
-                },
-                "shifts_coverage": {},
-                "overtime_hours": 120.5,
-                "skill_mix_index": 0.85,
-                "staff_satisfaction": 7.8
-            },
-            "last_updated": datetime.now()
-        },
+        "metrics": metrics if metrics is not None else default_metrics(),
+        "metrics_snapshot": snapshot,
         "analysis": None,
         "context": {
              "next_node": None  # Add routing context
@@ -192,11 +207,18 @@ def update_state_metrics(
     new_metrics: Dict,
     category: str
 ) -> HospitalState:
-    """Update specific category of metrics in state"""
+    """Update specific category of metrics in state.
+
+    Copy-on-write: metrics may be a shared read-only snapshot, so the
+    updated category is copied into a new metrics dict for this state only.
+    """
     if category not in state["metrics"]:
         raise ValueError(f"Invalid metrics category: {category}")
     
-    state["metrics"][category].update(new_metrics)
-    state["metrics"]["last_updated"] = datetime.now()
+    state["metrics"] = {
+        **state["metrics"],
+        category: {**state["metrics"][category], **new_metrics},
+        "last_updated": datetime.now()
+    }
     
     return state
\ No newline at end of file
@@ -5,6 +5,8 @@ from typing_extensions import TypedDict  # If using TypedDict
 #from langchain_core.messages import SystemMessage, HumanMessage
 from ..models.state import HospitalState, TaskType, PriorityLevel
 from ..config.prompts import PROMPTS
+from ..llm.structured import StructuredOutputParser
+from ..utils.error_handlers import DeadlineExceededError
 from ..utils.logger import setup_logger
 from langchain_core.messages import HumanMessage, SystemMessage, AnyMessage
 
@@ -13,7 +15,8 @@ logger = setup_logger(__name__)
 class InputAnalyzerNode:
     def __init__(self, llm):
         self.llm = llm
-        self.system_prompt = PROMPTS["input_analyzer"]
+        self.output_parser = StructuredOutputParser("input_analyzer")
+        self.system_prompt = f"{PROMPTS['input_analyzer']}\n\n{self.output_parser.instructions}"
 
     def __call__(self, state: HospitalState) -> Dict:
         try:
@@ -35,10 +38,16 @@ class InputAnalyzerNode:
             ]
             
             # Get LLM response
-            response = self.llm.invoke(messages)
-            
-            # Parse response to determine task type and priority
-            parsed_result = self._parse_llm_response(response.content)
+            try:
+                response = self.llm.invoke(messages, **self.output_parser.invoke_kwargs)
+                
+                # Parse response to determine task type and priority
+                parsed_result = self._parse_llm_response(response.content)
+            except DeadlineExceededError:
+                # Out of time: classify the request text by keywords instead
+                logger.warning("Input analysis fell back to keyword classification")
+                parsed_result = self._parse_llm_response(str(latest_message.content))
+                parsed_result["context"] = {"degraded": ["keyword classification"]}
             
             return {
                 "current_task": parsed_result["task_type"],
@@ -62,6 +71,10 @@ class InputAnalyzerNode:
                 "context": {}
             }
             
+            structured = self.output_parser.parse_json(response)
+            if structured is not None:
+                return self._from_structured(structured, result)
+            
             # Simple parsing logic (can be made more robust)
             if "patient flow" in response.lower():
                 result["task_type"] = TaskType.PATIENT_FLOW
@@ -83,3 +96,19 @@ class InputAnalyzerNode:
         except Exception as e:
             logger.error(f"Error parsing LLM response: {str(e)}")
             return result
+
+    def _from_structured(self, structured: Dict, result: Dict) -> Dict:
+        """Map a JSON answer onto task type, priority, department and context"""
+        task_type = structured["task_type"].strip().lower().replace(" ", "_")
+        if task_type in TaskType._value2member_map_:
+            result["task_type"] = TaskType(task_type)
+        
+        priority = structured["priority"].strip()
+        if priority.isdigit():
+            result["priority"] = PriorityLevel(min(max(int(priority), 1), 5))
+        elif priority.upper() in PriorityLevel.__members__:
+            result["priority"] = PriorityLevel[priority.upper()]
+        
+        result["department"] = structured["department"] or None
+        result["context"] = structured["context"]
+        return result
@@ -1,40 +1,64 @@
 # src/nodes/output_synthesizer.py
 #from typing import Dict, List
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from typing_extensions import TypedDict  # If using TypedDict
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import SystemMessage, AIMessage
 from ..models.state import HospitalState
 from ..config.prompts import PROMPTS
+from ..llm.prompting import PromptBuilder
+from ..llm.structured import StructuredOutputParser
+from ..utils.error_handlers import DeadlineExceededError
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Items per analysis field passed on from the specialist node
+SPECIALIST_ITEMS = 5
+
 class OutputSynthesizerNode:
     def __init__(self, llm):
         self.llm = llm
         self.system_prompt = PROMPTS["output_synthesis"]
+        self.output_parser = StructuredOutputParser("output_synthesizer")
+        self.prompt_builder = PromptBuilder(
+            "output_synthesizer", self.system_prompt, suffix=self.output_parser.instructions
+        )
 
     def __call__(self, state: HospitalState) -> Dict:
         try:
             # Get analysis results from previous nodes
-            analysis = state.get("analysis", {})
+            analysis = state.get("analysis") or {}
             
             # Format prompt with context
-            formatted_prompt = self.system_prompt.format(
+            formatted_prompt, _ = self.prompt_builder.build(
                 context=self._format_context(state)
             )
             
             # Get LLM synthesis
-            response = self.llm.invoke([
-                SystemMessage(content=formatted_prompt)
-            ])
+            try:
+                response = self.llm.invoke([
+                    SystemMessage(content=formatted_prompt)
+                ], **self.output_parser.invoke_kwargs)
+            except DeadlineExceededError:
+                logger.warning("Output synthesis out of time, answering from metrics")
+                final_output = self._metrics_only_output(state)
+                return {
+                    "messages": [AIMessage(content=self._render_text(final_output))],
+                    "analysis": final_output
+                }
             
             # Structure the final output
-            final_output = self._structure_final_output(
+            final_output, mode = self._structure_final_output(
                 response.content,
                 state["current_task"],
                 state["priority_level"]
             )
+            if mode == "json":
+                # Keep the conversation readable; the structure lives in analysis
+                response = AIMessage(content=self._render_text(final_output))
+            degraded = state.get("context", {}).get("degraded")
+            if degraded:
+                final_output["degraded"] = list(degraded)
             
             return {
                 "messages": [response],
@@ -56,19 +80,69 @@ Key Metrics Summary:
 - Resources: {self._summarize_resources(state)}
 - Quality: {self._summarize_quality(state)}
 - Staffing: {self._summarize_staffing(state)}
+Specialist Analysis:
+{self._summarize_specialist_analysis(state)}
         """
 
-    def _structure_final_output(self, response: str, task_type: str, priority: int) -> Dict:
+    def _structure_final_output(self, response: str, task_type: str, priority: int) -> Tuple[Dict, str]:
         """Structure the final output in a standardized format"""
+        structured, mode = self.output_parser.parse_with_mode(response)
         return {
-            "summary": self._extract_summary(response),
-            "key_findings": self._extract_key_findings(response),
-            "recommendations": self._extract_recommendations(response),
-            "action_items": self._extract_action_items(response),
+            "summary": structured["summary"] or response.split('\n')[0],
+            "key_findings": structured["key_findings"],
+            "recommendations": structured["recommendations"],
+            "action_items": structured["action_items"],
             "priority_level": priority,
             "task_type": task_type
+        }, mode
+
+    def _metrics_only_output(self, state: HospitalState) -> Dict:
+        """Final output built without a model call, from metrics and any specialist analysis"""
+        analysis = state.get("analysis") or {}
+        return {
+            "summary": "Time budget exhausted; this answer is based on current metrics only.",
+            "key_findings": [
+                f"Patient flow: {self._summarize_patient_flow(state)}",
+                f"Resources: {self._summarize_resources(state)}",
+                f"Quality: {self._summarize_quality(state)}",
+                f"Staffing: {self._summarize_staffing(state)}"
+            ] + list(analysis.get("findings", []))[:SPECIALIST_ITEMS],
+            "recommendations": list(analysis.get("recommendations", []))[:SPECIALIST_ITEMS],
+            "action_items": [],
+            "priority_level": state["priority_level"],
+            "task_type": state["current_task"],
+            "degraded": list(state.get("context", {}).get("degraded", [])) + ["metrics-only synthesis"]
         }
 
+    def _render_text(self, output: Dict) -> str:
+        """Plain-text answer rendered from the structured output"""
+        lines = [output["summary"]]
+        for title, items in (
+            ("Key findings", output["key_findings"]),
+            ("Recommendations", output["recommendations"])
+        ):
+            if items:
+                lines.append(f"\n{title}:")
+                lines.extend(f"- {item}" for item in items)
+        if output["action_items"]:
+            lines.append("\nAction items:")
+            for item in output["action_items"]:
+                details = ", ".join(
+                    str(item[key]) for key in ("owner", "timeline") if item.get(key)
+                )
+                action = item.get("action", "")
+                lines.append(f"- {action} ({details})" if details else f"- {action}")
+        return "\n".join(lines)
+
+    def _summarize_specialist_analysis(self, state: HospitalState) -> str:
+        """List the structured items produced by the specialist node"""
+        lines = []
+        for field, value in (state.get("analysis") or {}).items():
+            if isinstance(value, list) and value:
+                items = "; ".join(str(item) for item in value[:SPECIALIST_ITEMS])
+                lines.append(f"- {field.replace('_', ' ').capitalize()}: {items}")
+        return "\n".join(lines) or "- None"
+
     def _summarize_patient_flow(self, state: HospitalState) -> str:
         metrics = state["metrics"]["patient_flow"]
         return f"Occupancy {(metrics['occupied_beds']/metrics['total_beds'])*100:.1f}%"
@@ -84,26 +158,3 @@ Key Metrics Summary:
     def _summarize_staffing(self, state: HospitalState) -> str:
         metrics = state["metrics"]["staffing"]
         return f"Staff Available: {sum(metrics['available_staff'].values())}"
-
-    def _extract_summary(self, response: str) -> str:
-        """Extract high-level summary from response"""
-        # Implementation depends on response structure
-        return response.split('\n')[0]
-
-    def _extract_key_findings(self, response: str) -> List[str]:
-        """Extract key findings from response"""
-        findings = []
-        # Implementation for parsing findings
-        return findings
-
-    def _extract_recommendations(self, response: str) -> List[str]:
-        """Extract recommendations from response"""
-        recommendations = []
-        # Implementation for parsing recommendations
-        return recommendations
-
-    def _extract_action_items(self, response: str) -> List[Dict]:
-        """Extract actionable items from response"""
-        action_items = []
-        # Implementation for parsing action items
-        return action_items# output_synthesizer node implementation
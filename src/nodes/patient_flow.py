@@ -2,42 +2,54 @@
 #from typing import Dict
 from typing import Dict, List, Optional, Any
 from typing_extensions import TypedDict  # If using TypedDict
+import numpy as np
 from langchain_core.messages import SystemMessage
 from ..models.state import HospitalState
+from ..models.metrics_store import MetricsSnapshot, DepartmentView
 from ..config.prompts import PROMPTS
+from ..llm.prompting import PromptBuilder, PromptSection
+from ..llm.structured import StructuredOutputParser
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 class PatientFlowNode:
-    def __init__(self, llm):
+    def __init__(self, llm, metrics_provider: Optional[Any] = None):
         self.llm = llm
+        self.metrics_provider = metrics_provider
         self.system_prompt = PROMPTS["patient_flow"]
+        self.output_parser = StructuredOutputParser("patient_flow")
+        self.prompt_builder = PromptBuilder(
+            "patient_flow", self.system_prompt, suffix=self.output_parser.instructions
+        )
 
     def __call__(self, state: HospitalState) -> Dict:
         try:
             # Get current metrics
-            metrics = state["metrics"]["patient_flow"]
+            snapshot = MetricsSnapshot.from_state(state)
+            metrics = self._with_live_rates(snapshot.categories["patient_flow"])
             
             # Format prompt with current metrics
-            formatted_prompt = self.system_prompt.format(
+            formatted_prompt, prompt_stats = self.prompt_builder.build(
                 occupancy=self._calculate_occupancy(metrics),
                 wait_times=metrics["average_wait_time"],
-                department_capacity=self._get_department_capacity(metrics),
-                admission_rate=metrics["admission_rate"]
+                department_capacity=self._get_department_capacity(snapshot),
+                admission_rate=self._format_rate(metrics, "admission"),
+                discharge_rate=self._format_rate(metrics, "discharge")
             )
             
             # Get LLM analysis
             response = self.llm.invoke([
                 SystemMessage(content=formatted_prompt)
-            ])
+            ], **self.output_parser.invoke_kwargs)
             
             # Parse and structure the response
             analysis = self._structure_analysis(response.content)
             
             return {
                 "analysis": analysis,
-                "messages": [response]
+                "messages": [response],
+                "context": {**state.get("context", {}), "prompt_stats": prompt_stats}
             }
             
         except Exception as e:
@@ -48,15 +60,46 @@ class PatientFlowNode:
         """Calculate current occupancy percentage"""
         return (metrics["occupied_beds"] / metrics["total_beds"]) * 100
 
-    def _get_department_capacity(self, metrics: Dict) -> Dict:
-        """Get capacity details by department"""
-        return metrics.get("department_metrics", {})
+    def _with_live_rates(self, metrics: Dict) -> Dict:
+        """Overlay rates queried from the event windows now, since published ones lag"""
+        ingestor = getattr(self.metrics_provider, "ingestor", None)
+        if ingestor is None:
+            return metrics
+        live = ingestor.rate_metrics()["patient_flow"]
+        return {
+            **metrics,
+            "admission_rate": live["admission_rate"],
+            "discharge_rate": live["discharge_rate"],
+            "rate_windows": live["rate_windows"]
+        }
+
+    def _format_rate(self, metrics: Dict, event: str) -> str:
+        """Format the headline rate with its sliding-window breakdown if available"""
+        rate = metrics.get(f"{event}_rate", 0.0)
+        windows = metrics.get("rate_windows", {}).get(event)
+        if not windows:
+            return f"{rate}"
+        breakdown = ", ".join(f"{window}: {value}" for window, value in windows.items())
+        return f"{rate} (windows: {breakdown})"
+
+    def _get_department_capacity(self, snapshot: MetricsSnapshot) -> PromptSection:
+        """Get capacity details by department, fullest departments first"""
+        order = np.argsort(-snapshot.occupancy_rates(), kind="stable")
+        departments = [DepartmentView(snapshot, int(index)) for index in order]
+
+        def summarize(omitted: List[DepartmentView]) -> str:
+            occupied = sum(dept.current_occupancy for dept in omitted)
+            capacity = sum(dept.capacity for dept in omitted)
+            return f"+{len(omitted)} more departments: {occupied}/{capacity} beds"
+
+        return PromptSection(
+            departments,
+            render=lambda dept: f"{dept.name}|{dept.current_occupancy}/{dept.capacity}|{dept.wait_time}",
+            summarize=summarize,
+            header="\ndepartment|occupied/capacity|wait_min"
+        )
 
     def _structure_analysis(self, response: str) -> Dict:
         """Structure the LLM response into a standardized format"""
-        return {
-            "findings": [],  # Extract key findings
-            "recommendations": [],  # Extract recommendations
-            "action_items": [],  # Extract action items
-            "metrics_impact": {}  # Expected impact on metrics
-        }# patient_flow node implementation
+        # findings, recommendations, action_items, metrics_impact
+        return self.output_parser.parse(response)# patient_flow node implementation
@@ -1,36 +1,57 @@
 # src/nodes/quality_monitor.py
 
 from typing import Dict, List, Optional, Any
+from datetime import datetime
 from typing_extensions import TypedDict  # If using TypedDict
 from langchain_core.messages import SystemMessage
 from ..models.state import HospitalState
+from ..models.metrics_store import MetricsSnapshot
 from ..config.prompts import PROMPTS
+from ..llm.prompting import PromptBuilder
+from ..llm.structured import StructuredOutputParser
+from ..metrics.archive import MetricsArchive, SECONDS_PER_WEEK
+from ..metrics.anomaly import AnomalyDetector
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Quality fields tracked by the control charts, keyed by series name
+CHARTED_METRICS = {
+    "patient_satisfaction": "quality.patient_satisfaction",
+    "compliance_rate": "quality.compliance_rate",
+    "incident_count": "quality.incident_count"
+}
+
 class QualityMonitorNode:
-    def __init__(self, llm):
+    def __init__(
+        self,
+        llm,
+        archive: Optional[MetricsArchive] = None,
+        detector: Optional[AnomalyDetector] = None
+    ):
         self.llm = llm
+        self.archive = archive
+        self.detector = detector
         self.system_prompt = PROMPTS["quality_monitor"]
+        self.output_parser = StructuredOutputParser("quality_monitor")
+        self.prompt_builder = PromptBuilder(
+            "quality_monitor", self.system_prompt, suffix=self.output_parser.instructions
+        )
 
     def __call__(self, state: HospitalState) -> Dict:
         try:
             # Get current quality metrics
-            metrics = state["metrics"]["quality"]
+            metrics = MetricsSnapshot.from_state(state).categories["quality"]
             
             # Format prompt with current metrics
-            formatted_prompt = self.system_prompt.format(
-                satisfaction_score=metrics["patient_satisfaction"],
-                care_outcomes=self._format_care_outcomes(metrics),
-                compliance_rates=metrics["compliance_rate"] * 100,
-                incident_count=metrics["incident_count"]
+            formatted_prompt, prompt_stats = self.prompt_builder.build(
+                quality_metrics=self._format_quality_metrics(metrics)
             )
             
             # Get LLM analysis
             response = self.llm.invoke([
                 SystemMessage(content=formatted_prompt)
-            ])
+            ], **self.output_parser.invoke_kwargs)
             
             # Process quality assessment
             analysis = self._analyze_quality_metrics(response.content, metrics)
@@ -39,8 +60,10 @@ class QualityMonitorNode:
                 "analysis": analysis,
                 "messages": [response],
                 "context": {
+                    **state.get("context", {}),
                     "quality_scores": metrics["quality_scores"],
-                    "last_audit": metrics["last_audit_date"]
+                    "last_audit": metrics["last_audit_date"],
+                    "prompt_stats": prompt_stats
                 }
             }
             
@@ -48,6 +71,40 @@ class QualityMonitorNode:
             logger.error(f"Error in quality monitoring analysis: {str(e)}")
             raise
 
+    def _control_status(self, field: str) -> Optional[Dict]:
+        """Control chart status for a quality field, once the chart is warm"""
+        if self.detector is None or not self.detector.is_warm(CHARTED_METRICS[field]):
+            return None
+        return self.detector.status(CHARTED_METRICS[field])
+
+    def _format_quality_metrics(self, metrics: Dict) -> str:
+        """Prompt lines for the quality metrics.
+
+        Once the control charts are warm only metrics with a flagged shift
+        are listed; until then every metric is included.
+        """
+        lines = {
+            "patient_satisfaction": f"- Patient satisfaction: {metrics['patient_satisfaction']}/10",
+            "compliance_rate": f"- Compliance rates: {metrics['compliance_rate'] * 100}%",
+            "incident_count": f"- Incident reports: {metrics['incident_count']}"
+        }
+        statuses = {field: self._control_status(field) for field in CHARTED_METRICS}
+
+        if any(status is None for status in statuses.values()):
+            return "\n".join([
+                lines["patient_satisfaction"],
+                f"- Care outcomes: {self._format_care_outcomes(metrics)}",
+                lines["compliance_rate"],
+                lines["incident_count"]
+            ])
+
+        flagged = [
+            f"{lines[field]} ({status['trend'].lower()} shift from baseline {status['baseline']})"
+            for field, status in statuses.items()
+            if status["flagged"]
+        ]
+        return "\n".join(flagged) or "- All quality metrics within statistical control limits"
+
     def _format_care_outcomes(self, metrics: Dict) -> str:
         """Format care outcomes into readable text"""
         outcomes = []
@@ -57,41 +114,63 @@ class QualityMonitorNode:
 
     def _analyze_quality_metrics(self, response: str, metrics: Dict) -> Dict:
         """Analyze quality metrics and identify areas for improvement"""
+        structured = self.output_parser.parse(response)
         return {
             "satisfaction_analysis": self._analyze_satisfaction(metrics),
             "compliance_analysis": self._analyze_compliance(metrics),
             "incident_analysis": self._analyze_incidents(metrics),
-            "recommendations": self._extract_recommendations(response),
-            "priority_improvements": []
+            "recommendations": structured["recommendations"],
+            "priority_improvements": structured["priority_improvements"]
         }
 
     def _analyze_satisfaction(self, metrics: Dict) -> Dict:
         """Analyze patient satisfaction trends"""
         satisfaction = metrics["patient_satisfaction"]
-        return {
+        analysis = {
             "current_score": satisfaction,
             "status": "Good" if satisfaction >= 8.0 else "Needs Improvement",
-            "trend": "Unknown"  # Would need historical data
+            "trend": "Unknown"
         }
+        control = self._control_status("patient_satisfaction")
+        if control is not None:
+            analysis["trend"] = control["trend"]
+            analysis["shift_detected"] = control["flagged"]
+        if self.archive is not None:
+            now = datetime.now().timestamp()
+            trend = self.archive.trend(
+                "quality.patient_satisfaction", start=now - SECONDS_PER_WEEK, end=now + 1
+            )
+            if trend["direction"] != "Unknown":
+                analysis["trend"] = trend["direction"]
+            analysis["week_over_week"] = self.archive.week_over_week(
+                "quality.patient_satisfaction", now
+            )
+        return analysis
 
     def _analyze_compliance(self, metrics: Dict) -> Dict:
         """Analyze compliance rates"""
-        return {
+        analysis = {
             "rate": metrics["compliance_rate"],
             "status": "Compliant" if metrics["compliance_rate"] >= 0.95 else "Review Required"
         }
+        control = self._control_status("compliance_rate")
+        if control is not None:
+            analysis["trend"] = control["trend"]
+            analysis["shift_detected"] = control["flagged"]
+            if control["trend"] == "Declining":
+                analysis["status"] = "Review Required"
+        return analysis
 
     def _analyze_incidents(self, metrics: Dict) -> Dict:
         """Analyze incident reports"""
-        return {
+        analysis = {
             "count": metrics["incident_count"],
             "severity": "High" if metrics["incident_count"] > 5 else "Low"
         }
-
-    def _extract_recommendations(self, response: str) -> List[str]:
-        """Extract recommendations from LLM response"""
-        recommendations = []
-        for line in response.split('\n'):
-            if 'recommend' in line.lower() or 'suggest' in line.lower():
-                recommendations.append(line.strip())
-        return recommendations
\ No newline at end of file
+        control = self._control_status("incident_count")
+        if control is not None:
+            analysis["trend"] = control["trend"]
+            analysis["shift_detected"] = control["flagged"]
+            if control["trend"] == "Declining":
+                analysis["severity"] = "High"
+        return analysis
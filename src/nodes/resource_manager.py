@@ -5,6 +5,8 @@ from typing_extensions import TypedDict  # If using TypedDict
 from langchain_core.messages import SystemMessage
 from ..models.state import HospitalState
 from ..config.prompts import PROMPTS
+from ..llm.prompting import PromptBuilder, PromptSection
+from ..llm.structured import StructuredOutputParser
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -13,6 +15,10 @@ class ResourceManagerNode:
     def __init__(self, llm):
         self.llm = llm
         self.system_prompt = PROMPTS["resource_manager"]
+        self.output_parser = StructuredOutputParser("resource_manager")
+        self.prompt_builder = PromptBuilder(
+            "resource_manager", self.system_prompt, suffix=self.output_parser.instructions
+        )
         
     def __call__(self, state: HospitalState) -> Dict:
         try:
@@ -20,7 +26,7 @@ class ResourceManagerNode:
             metrics = state["metrics"]["resources"]
             
             # Format prompt with current metrics
-            formatted_prompt = self.system_prompt.format(
+            formatted_prompt, prompt_stats = self.prompt_builder.build(
                 equipment_status=self._format_equipment_status(metrics),
                 supply_levels=self._format_supply_levels(metrics),
                 resource_allocation=metrics["resource_utilization"],
@@ -30,7 +36,7 @@ class ResourceManagerNode:
             # Get LLM analysis
             response = self.llm.invoke([
                 SystemMessage(content=formatted_prompt)
-            ])
+            ], **self.output_parser.invoke_kwargs)
             
             # Update state with recommendations
             analysis = self._parse_recommendations(response.content)
@@ -39,8 +45,10 @@ class ResourceManagerNode:
                 "analysis": analysis,
                 "messages": [response],
                 "context": {
+                    **state.get("context", {}),
                     "critical_supplies": metrics["critical_supplies"],
-                    "pending_requests": metrics["pending_requests"]
+                    "pending_requests": metrics["pending_requests"],
+                    "prompt_stats": prompt_stats
                 }
             }
             
@@ -48,20 +56,45 @@ class ResourceManagerNode:
             logger.error(f"Error in resource management analysis: {str(e)}")
             raise
 
-    def _format_equipment_status(self, metrics: Dict) -> str:
-        """Format equipment availability into readable text"""
-        status = []
-        for equip, available in metrics["equipment_availability"].items():
-            status.append(f"{equip}: {'Available' if available else 'In Use'}")
-        return ", ".join(status)
+    def _format_equipment_status(self, metrics: Dict) -> PromptSection:
+        """Format equipment availability, equipment in use first"""
+        equipment = sorted(
+            metrics["equipment_availability"].items(),
+            key=lambda item: bool(item[1])
+        )
 
-    def _format_supply_levels(self, metrics: Dict) -> str:
-        """Format supply levels into readable text"""
-        levels = []
-        for item, level in metrics["supply_levels"].items():
-            status = "Critical" if level < 0.2 else "Low" if level < 0.4 else "Adequate"
-            levels.append(f"{item}: {status} ({level*100:.0f}%)")
-        return ", ".join(levels)
+        def summarize(omitted) -> str:
+            available = sum(1 for _, is_available in omitted if is_available)
+            return f"+{len(omitted)} more ({available} available, {len(omitted) - available} in use)"
+
+        return PromptSection(
+            equipment,
+            render=lambda item: f"{item[0]}: {'Available' if item[1] else 'In Use'}",
+            summarize=summarize,
+            separator=", "
+        )
+
+    def _supply_status(self, level: float) -> str:
+        return "Critical" if level < 0.2 else "Low" if level < 0.4 else "Adequate"
+
+    def _format_supply_levels(self, metrics: Dict) -> PromptSection:
+        """Format supply levels, lowest stock first"""
+        supplies = sorted(metrics["supply_levels"].items(), key=lambda item: item[1])
+
+        def summarize(omitted) -> str:
+            counts: Dict[str, int] = {}
+            for _, level in omitted:
+                status = self._supply_status(level)
+                counts[status] = counts.get(status, 0) + 1
+            breakdown = ", ".join(f"{count} {status.lower()}" for status, count in counts.items())
+            return f"+{len(omitted)} more ({breakdown})"
+
+        return PromptSection(
+            supplies,
+            render=lambda item: f"{item[0]}: {self._supply_status(item[1])} ({item[1]*100:.0f}%)",
+            summarize=summarize,
+            separator=", "
+        )
 
     def _get_budget_info(self, state: HospitalState) -> str:
         """Get budget information from context"""
@@ -69,10 +102,6 @@ class ResourceManagerNode:
 
     def _parse_recommendations(self, response: str) -> Dict:
         """Parse LLM recommendations into structured format"""
-        return {
-            "resource_optimization": [],
-            "supply_management": [],
-            "equipment_maintenance": [],
-            "budget_allocation": [],
-            "priority_actions": []
-        }# resource_manager node implementation
+        # resource_optimization, supply_management, equipment_maintenance,
+        # budget_allocation, priority_actions
+        return self.output_parser.parse(response)# resource_manager node implementation
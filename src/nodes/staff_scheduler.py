@@ -4,6 +4,8 @@ from typing_extensions import TypedDict  # If using TypedDict
 from langchain_core.messages import SystemMessage
 from ..models.state import HospitalState
 from ..config.prompts import PROMPTS
+from ..llm.prompting import PromptBuilder, PromptSection
+from ..llm.structured import StructuredOutputParser
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -12,6 +14,10 @@ class StaffSchedulerNode:
     def __init__(self, llm):
         self.llm = llm
         self.system_prompt = PROMPTS["staff_scheduler"]
+        self.output_parser = StructuredOutputParser("staff_scheduler")
+        self.prompt_builder = PromptBuilder(
+            "staff_scheduler", self.system_prompt, suffix=self.output_parser.instructions
+        )
 
     def __call__(self, state: HospitalState) -> Dict:
         try:
@@ -19,7 +25,7 @@ class StaffSchedulerNode:
             metrics = state["metrics"]["staffing"]
             
             # Format prompt with current metrics
-            formatted_prompt = self.system_prompt.format(
+            formatted_prompt, prompt_stats = self.prompt_builder.build(
                 staff_available=self._format_staff_availability(metrics),
                 department_needs=self._get_department_needs(state),
                 skill_requirements=self._format_skill_requirements(metrics),
@@ -29,7 +35,7 @@ class StaffSchedulerNode:
             # Get LLM analysis
             response = self.llm.invoke([
                 SystemMessage(content=formatted_prompt)
-            ])
+            ], **self.output_parser.invoke_kwargs)
             
             # Generate scheduling recommendations
             analysis = self._generate_schedule_recommendations(response.content, metrics)
@@ -38,8 +44,10 @@ class StaffSchedulerNode:
                 "analysis": analysis,
                 "messages": [response],
                 "context": {
+                    **state.get("context", {}),
                     "staff_satisfaction": metrics["staff_satisfaction"],
-                    "skill_mix_index": metrics["skill_mix_index"]
+                    "skill_mix_index": metrics["skill_mix_index"],
+                    "prompt_stats": prompt_stats
                 }
             }
             
@@ -54,12 +62,35 @@ class StaffSchedulerNode:
             for role, count in metrics["available_staff"].items()
         ])
 
-    def _get_department_needs(self, state: HospitalState) -> Dict:
-        """Get staffing needs by department"""
-        return {
-            dept: metrics
-            for dept, metrics in state["metrics"]["patient_flow"]["department_metrics"].items()
-        }
+    def _get_department_needs(self, state: HospitalState) -> PromptSection:
+        """Get staffing needs by department, busiest departments first"""
+        departments = state["metrics"]["patient_flow"]["department_metrics"]
+        rows = sorted(
+            departments.items(),
+            key=lambda item: (
+                -item[1].get("current_occupancy", 0) / max(item[1].get("capacity", 0), 1),
+                -item[1].get("wait_time", 0)
+            )
+        )
+
+        def render(item) -> str:
+            name, dept = item
+            staff = sum(dept.get("staff_count", {}).values())
+            return (f"{name}|{dept.get('current_occupancy', 0)}/{dept.get('capacity', 0)}"
+                    f"|{dept.get('wait_time', 0)}|{staff}")
+
+        def summarize(omitted) -> str:
+            occupied = sum(dept.get("current_occupancy", 0) for _, dept in omitted)
+            capacity = sum(dept.get("capacity", 0) for _, dept in omitted)
+            staff = sum(sum(dept.get("staff_count", {}).values()) for _, dept in omitted)
+            return f"+{len(omitted)} more departments: {occupied}/{capacity} beds, {staff} staff"
+
+        return PromptSection(
+            rows,
+            render=render,
+            summarize=summarize,
+            header="\ndepartment|occupied/capacity|wait_min|staff"
+        )
 
     def _format_skill_requirements(self, metrics: Dict) -> str:
         """Format skill requirements into readable text"""
@@ -67,10 +98,6 @@ class StaffSchedulerNode:
 
     def _generate_schedule_recommendations(self, response: str, metrics: Dict) -> Dict:
         """Generate scheduling recommendations based on LLM response"""
-        return {
-            "shift_adjustments": [],
-            "staff_assignments": {},
-            "overtime_recommendations": [],
-            "training_needs": [],
-            "efficiency_improvements": []
-        }# staff_scheduler node implementation
+        # shift_adjustments, staff_assignments, overtime_recommendations,
+        # training_needs, efficiency_improvements
+        return self.output_parser.parse(response)# staff_scheduler node implementation
@@ -2,7 +2,9 @@
 from typing import Literal
 from typing import Dict, List, Optional, Any
 from typing_extensions import TypedDict  # If using TypedDict
+from ..config.settings import Settings
 from ..models.state import HospitalState, TaskType
+from ..llm.context import has_budget
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -33,6 +35,14 @@ class TaskRouterNode:
             else:
                 state_update["context"]["next_node"] = "output_synthesis"
             
+            # Not enough time left for a specialist: answer from metrics alone
+            next_node = state_update["context"]["next_node"]
+            if next_node != "output_synthesis" and \
+                    not has_budget(Settings.NODE_MIN_BUDGET + Settings.SYNTHESIS_RESERVE):
+                logger.warning(f"Skipping {next_node}: request deadline too close")
+                state_update["context"]["next_node"] = "output_synthesis"
+                state_update["context"].setdefault("degraded", []).append(f"skipped {next_node}")
+            
             return state_update
                 
         except Exception as e:
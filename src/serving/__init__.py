@@ -0,0 +1,14 @@
+# src/serving/__init__.py
+from .scheduler import RequestScheduler, preclassify_priority, PRIORITY_WEIGHTS
+from .coalescing import SingleFlight
+from .semantic_cache import SemanticCache, HashedNgramVectorizer, LSHIndex
+
+__all__ = [
+    'RequestScheduler',
+    'preclassify_priority',
+    'PRIORITY_WEIGHTS',
+    'SingleFlight',
+    'SemanticCache',
+    'HashedNgramVectorizer',
+    'LSHIndex'
+]
@@ -0,0 +1,63 @@
+# src/serving/coalescing.py
+from typing import Dict, Optional, Any, Callable, Hashable, Tuple
+from concurrent.futures import Future
+import threading
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SingleFlight:
+    """Shares one execution between concurrent calls with the same key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for and receive the same result (or exception). The
+    key is forgotten as soon as the call finishes, so nothing is cached.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "executions": 0, "coalesced": 0}
+
+    def do(
+        self,
+        key: Hashable,
+        function: Callable[[], Any],
+        timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """Return (result, shared); waiting callers give up after ``timeout``"""
+        with self._lock:
+            self._stats["requests"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return call.result(timeout), True
+
+        try:
+            result = function()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Request and execution counts and the share of coalesced requests"""
+        with self._lock:
+            requests = self._stats["requests"]
+            return {
+                **self._stats,
+                "in_flight": len(self._calls),
+                "coalescing_ratio": round(self._stats["coalesced"] / requests, 4) if requests else 0.0
+            }
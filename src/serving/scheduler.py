@@ -0,0 +1,198 @@
+# src/serving/scheduler.py
+from typing import Dict, Optional, Any, Callable, Tuple
+from collections import deque
+from concurrent.futures import Future
+import re
+import threading
+import time
+import numpy as np
+from ..config.settings import Settings
+from ..llm.context import request_scope
+from ..models.state import PriorityLevel
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Keyword patterns for pre-classification, checked from most to least urgent
+PRIORITY_PATTERNS = (
+    (PriorityLevel.CRITICAL, re.compile(
+        r"\b(critical|code (blue|red)|mass casualty|icu (capacity|full|beds?)|cardiac arrest|life[- ]threatening)\b", re.I)),
+    (PriorityLevel.URGENT, re.compile(r"\b(urgent|emergency|immediately|stat|asap)\b", re.I)),
+    (PriorityLevel.HIGH, re.compile(r"\b(high priority|shortage|overflow|surge|divert|diversion|at capacity)\b", re.I)),
+    (PriorityLevel.LOW, re.compile(r"\b(report|summary|weekly|monthly|quarterly|trend|historical|export)\b", re.I)),
+)
+
+# Relative service share per priority level for weighted fair queuing
+PRIORITY_WEIGHTS = {
+    PriorityLevel.CRITICAL: 16,
+    PriorityLevel.URGENT: 8,
+    PriorityLevel.HIGH: 4,
+    PriorityLevel.MEDIUM: 2,
+    PriorityLevel.LOW: 1
+}
+
+# Latency samples kept per priority for percentiles
+LATENCY_SAMPLES = 1024
+
+
+def preclassify_priority(text: str) -> PriorityLevel:
+    """Keyword-based priority, cheap enough to run before queuing"""
+    for level, pattern in PRIORITY_PATTERNS:
+        if pattern.search(text):
+            return level
+    return PriorityLevel.MEDIUM
+
+
+class _Request:
+    __slots__ = ("args", "kwargs", "priority", "finish_tag", "enqueued", "future")
+
+    def __init__(self, args: Tuple, kwargs: Dict, priority: PriorityLevel, finish_tag: float):
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.finish_tag = finish_tag
+        self.enqueued = time.monotonic()
+        self.future: Future = Future()
+
+
+class RequestScheduler:
+    """Priority-aware admission in front of ``HealthcareAgent.process``.
+
+    Requests are pre-classified by keyword and queued per priority level.
+    Dispatch follows weighted fair queuing: each request gets a virtual
+    finish tag advanced by ``1 / weight`` of its level, and the queue head
+    with the smallest tag runs next. A request's tag is reduced by the time
+    it has waited divided by ``aging_seconds``, so LOW requests cannot
+    starve. At most ``max_concurrency`` graph executions run at once.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Any],
+        max_concurrency: Optional[int] = None,
+        aging_seconds: Optional[float] = None,
+        weights: Optional[Dict[PriorityLevel, float]] = None,
+        classifier: Callable[[str], PriorityLevel] = preclassify_priority
+    ):
+        self.handler = handler
+        self.max_concurrency = max_concurrency or Settings.MAX_CONCURRENT_REQUESTS
+        self.aging_seconds = aging_seconds or Settings.SCHEDULER_AGING_SECONDS
+        self.weights = weights or PRIORITY_WEIGHTS
+        self.classifier = classifier
+        self._queues: Dict[PriorityLevel, deque] = {level: deque() for level in PriorityLevel}
+        self._last_finish: Dict[PriorityLevel, float] = {level: 0.0 for level in PriorityLevel}
+        self._virtual_time = 0.0
+        self._condition = threading.Condition()
+        self._running = 0
+        self._closed = False
+        self._latencies: Dict[PriorityLevel, Dict[str, deque]] = {
+            level: {"queue": deque(maxlen=LATENCY_SAMPLES), "total": deque(maxlen=LATENCY_SAMPLES)}
+            for level in PriorityLevel
+        }
+        self._completed: Dict[PriorityLevel, int] = {level: 0 for level in PriorityLevel}
+        self._workers = [
+            threading.Thread(target=self._work, name=f"scheduler-{i}", daemon=True)
+            for i in range(self.max_concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        input_text: str,
+        *args: Any,
+        priority: Optional[PriorityLevel] = None,
+        **kwargs: Any
+    ) -> Future:
+        """Queue a request; the future resolves to the handler's result"""
+        priority = PriorityLevel(priority) if priority is not None else self.classifier(input_text)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Scheduler is shut down")
+            start = max(self._virtual_time, self._last_finish[priority])
+            finish_tag = start + 1.0 / self.weights[priority]
+            self._last_finish[priority] = finish_tag
+            request = _Request((input_text,) + args, kwargs, priority, finish_tag)
+            self._queues[priority].append(request)
+            self._condition.notify()
+        return request.future
+
+    def process(self, input_text: str, *args: Any, **kwargs: Any) -> Any:
+        """Submit and wait for the result"""
+        return self.submit(input_text, *args, **kwargs).result()
+
+    def _next(self) -> Optional[_Request]:
+        """Pop the queue head with the smallest aged finish tag"""
+        now = time.monotonic()
+        best, best_tag = None, None
+        for level, queue in self._queues.items():
+            if not queue:
+                continue
+            head = queue[0]
+            tag = head.finish_tag - (now - head.enqueued) / self.aging_seconds
+            if best_tag is None or tag < best_tag or (tag == best_tag and level > best.priority):
+                best, best_tag = head, tag
+        if best is not None:
+            self._queues[best.priority].popleft()
+            self._virtual_time = max(self._virtual_time, best.finish_tag - 1.0 / self.weights[best.priority])
+        return best
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                request = self._next()
+                while request is None:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+                    request = self._next()
+                self._running += 1
+
+            started = time.monotonic()
+            if request.future.set_running_or_notify_cancel():
+                try:
+                    with request_scope(request.priority):
+                        result = self.handler(*request.args, **request.kwargs)
+                    request.future.set_result(result)
+                except BaseException as e:
+                    logger.error(f"Error processing scheduled request: {str(e)}")
+                    request.future.set_exception(e)
+            finished = time.monotonic()
+
+            with self._condition:
+                self._running -= 1
+                latencies = self._latencies[request.priority]
+                latencies["queue"].append(started - request.enqueued)
+                latencies["total"].append(finished - request.enqueued)
+                self._completed[request.priority] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running count and latency percentiles per priority"""
+        with self._condition:
+            by_priority = {}
+            for level in PriorityLevel:
+                queue_waits = np.array(self._latencies[level]["queue"]) * 1000
+                totals = np.array(self._latencies[level]["total"]) * 1000
+                by_priority[level.name] = {
+                    "queued": len(self._queues[level]),
+                    "completed": self._completed[level],
+                    "p50_queue_ms": round(float(np.percentile(queue_waits, 50)), 1) if len(queue_waits) else 0.0,
+                    "p95_queue_ms": round(float(np.percentile(queue_waits, 95)), 1) if len(queue_waits) else 0.0,
+                    "p50_latency_ms": round(float(np.percentile(totals, 50)), 1) if len(totals) else 0.0,
+                    "p95_latency_ms": round(float(np.percentile(totals, 95)), 1) if len(totals) else 0.0
+                }
+            return {
+                "running": self._running,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "max_concurrency": self.max_concurrency,
+                "by_priority": by_priority
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting requests; queued requests still run"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
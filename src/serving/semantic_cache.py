@@ -0,0 +1,250 @@
+# src/serving/semantic_cache.py
+from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
+import re
+import threading
+import zlib
+import numpy as np
+from ..config.settings import Settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Words that do not change what an operations question is about
+STOP_WORDS = frozenset(
+    "a an the is are was were be been what whats which how in on at of for to do does "
+    "our we us right now current currently please me tell show give there any".split()
+)
+
+# Domain abbreviations and paraphrases mapped onto one term
+TERM_ALIASES = {
+    "er": "emergency",
+    "ed": "emergency",
+    "icu": "intensive care",
+    "surgical": "surgery",
+    "peds": "pediatrics",
+    "pediatric": "pediatrics",
+    "waiting": "wait",
+    "waits": "wait",
+    "long": "time",
+    "beds": "bed",
+    "full": "occupancy",
+    "occupied": "occupancy",
+    "nurses": "nurse",
+    "staffing": "staff",
+    "supplies": "supply"
+}
+
+# Words that reverse or negate a question, mapped onto their direction;
+# cached answers are only reused when these agree exactly
+DIRECTION_TERMS = {
+    **dict.fromkeys(["increase", "increasing", "raise", "more", "add", "higher", "above", "up", "expand"], "up"),
+    **dict.fromkeys(["decrease", "decreasing", "reduce", "cut", "lower", "less", "fewer", "below", "down"], "down"),
+    **dict.fromkeys(["not", "no", "never", "without", "none"], "not"),
+    **dict.fromkeys(["open", "opening"], "open"),
+    **dict.fromkeys(["close", "closing"], "close")
+}
+
+# Words followed by a unit identifier ("ward A", "bed 4b")
+LOCATION_WORDS = frozenset(["ward", "unit", "room", "bed", "floor", "wing", "bay", "pod"])
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+CONTRACTED_NOT = re.compile(r"n't\b")
+
+
+class HashedNgramVectorizer:
+    """Local query embedding from hashed word, word-pair and character trigram features.
+
+    Features are hashed with CRC32 (stable across processes) into ``dim``
+    signed buckets and the vector is L2-normalized, so the dot product of
+    two vectors is their cosine similarity.
+    """
+
+    def __init__(self, dim: int = 1024, word_weight: float = 2.0):
+        self.dim = dim
+        self.word_weight = word_weight
+
+    def terms(self, text: str) -> List[str]:
+        terms = []
+        for word in WORD_PATTERN.findall(CONTRACTED_NOT.sub(" not", text.lower())):
+            terms.extend(term for term in TERM_ALIASES.get(word, word).split() if term not in STOP_WORDS)
+        return terms
+
+    def guard_terms(self, text: str) -> frozenset:
+        """Numbers, identifiers and direction words; similar queries must share them exactly.
+
+        Character trigrams make "increase"/"decrease", "12345"/"12346" and
+        "ward A"/"ward B" look alike, so similarity alone would serve the
+        wrong answer. Letter identifiers are single letters, including
+        stop words after a location word as in "ward A".
+        """
+        guards = set()
+        previous = None
+        for word in WORD_PATTERN.findall(CONTRACTED_NOT.sub(" not", text.lower())):
+            if any(char.isdigit() for char in word):
+                guards.add(word)
+            elif len(word) == 1 and (previous in LOCATION_WORDS or word not in STOP_WORDS):
+                guards.add(word)
+            elif word in DIRECTION_TERMS:
+                guards.add(DIRECTION_TERMS[word])
+            previous = TERM_ALIASES.get(word, word)
+        return frozenset(guards)
+
+    def _features(self, terms: List[str]):
+        for term in terms:
+            yield f"w:{term}", self.word_weight
+            padded = f"<{term}>"
+            for i in range(len(padded) - 2):
+                yield f"c:{padded[i:i + 3]}", 1.0
+        for first, second in zip(terms, terms[1:]):
+            yield f"b:{first} {second}", 1.0
+
+    def transform(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self._features(self.terms(text)):
+            digest = zlib.crc32(feature.encode())
+            vector[digest % self.dim] += weight if digest & 0x80000000 else -weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class LSHIndex:
+    """Approximate nearest-neighbor index using random-hyperplane hashing.
+
+    Each of ``tables`` hash tables buckets vectors by the signs of ``bits``
+    random projections; candidates are the union of the query's buckets.
+    With 16 tables of 8 bits, neighbors at cosine 0.85 are found about 98%
+    of the time.
+    """
+
+    def __init__(self, dim: int, tables: int = 16, bits: int = 8, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables, bits, dim)).astype(np.float32)
+        self.weights = 1 << np.arange(bits)
+        self.buckets: List[Dict[int, set]] = [{} for _ in range(tables)]
+        self._keys: Dict[int, np.ndarray] = {}
+
+    def _hash(self, vector: np.ndarray) -> np.ndarray:
+        return ((self.planes @ vector) > 0) @ self.weights
+
+    def add(self, slot: int, vector: np.ndarray) -> None:
+        keys = self._keys[slot] = self._hash(vector)
+        for table, key in zip(self.buckets, keys):
+            table.setdefault(int(key), set()).add(slot)
+
+    def remove(self, slot: int) -> None:
+        keys = self._keys.pop(slot, None)
+        if keys is None:
+            return
+        for table, key in zip(self.buckets, keys):
+            bucket = table.get(int(key))
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del table[int(key)]
+
+    def candidates(self, vector: np.ndarray) -> set:
+        found = set()
+        for table, key in zip(self.buckets, self._hash(vector)):
+            found |= table.get(int(key), set())
+        return found
+
+
+class SemanticCache:
+    """Responses reused for paraphrased queries against the same metrics version.
+
+    Query vectors live in a preallocated ``capacity x dim`` matrix, so memory
+    is fixed; the least recently used entry is evicted when it is full. A
+    lookup hits when the most similar cached query for the same metrics
+    version has cosine similarity of at least ``threshold`` and the same
+    guard terms (numbers, identifiers, direction and negation words).
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        threshold: Optional[float] = None,
+        vectorizer: Optional[HashedNgramVectorizer] = None
+    ):
+        self.capacity = capacity or Settings.SEMANTIC_CACHE_SIZE
+        self.threshold = threshold or Settings.SEMANTIC_CACHE_THRESHOLD
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        self.index = LSHIndex(self.vectorizer.dim)
+        self._vectors = np.zeros((self.capacity, self.vectorizer.dim), dtype=np.float32)
+        self._entries: Dict[int, Tuple[str, Any, Dict, frozenset]] = {}
+        self._lru: OrderedDict = OrderedDict()
+        self._free = list(range(self.capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "evictions": 0}
+
+    def _nearest(self, vector: np.ndarray, version: Any, guards: frozenset) -> Tuple[Optional[int], float]:
+        slots = [
+            slot for slot in self.index.candidates(vector)
+            if self._entries[slot][1] == version and self._entries[slot][3] == guards
+        ]
+        if not slots:
+            return None, 0.0
+        similarities = self._vectors[slots] @ vector
+        best = int(np.argmax(similarities))
+        return slots[best], float(similarities[best])
+
+    def lookup(self, query: str, version: Any) -> Optional[Dict]:
+        """Cached response for a similar query, or None"""
+        vector = self.vectorizer.transform(query)
+        guards = self.vectorizer.guard_terms(query)
+        with self._lock:
+            self._stats["lookups"] += 1
+            slot, similarity = self._nearest(vector, version, guards)
+            if slot is None or similarity < self.threshold:
+                return None
+            self._stats["hits"] += 1
+            self._lru.move_to_end(slot)
+            cached_query, _, response, _ = self._entries[slot]
+        logger.info(f"Semantic cache hit ({similarity:.2f}): '{query}' ~ '{cached_query}'")
+        return response
+
+    def store(self, query: str, version: Any, response: Dict) -> None:
+        vector = self.vectorizer.transform(query)
+        if not vector.any():
+            return
+        guards = self.vectorizer.guard_terms(query)
+        with self._lock:
+            slot, similarity = self._nearest(vector, version, guards)
+            if slot is None or similarity < 1.0 - 1e-6:
+                if not self._free:
+                    self._evict()
+                slot = self._free.pop()
+            self.index.remove(slot)
+            self._vectors[slot] = vector
+            self.index.add(slot, vector)
+            self._entries[slot] = (query, version, response, guards)
+            self._lru[slot] = None
+            self._lru.move_to_end(slot)
+
+    def _evict(self) -> None:
+        slot, _ = self._lru.popitem(last=False)
+        self.index.remove(slot)
+        del self._entries[slot]
+        self._free.append(slot)
+        self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for slot in list(self._entries):
+                self.index.remove(slot)
+            self._entries.clear()
+            self._lru.clear()
+            self._free = list(range(self.capacity - 1, -1, -1))
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookups, hit rate, occupancy and evictions"""
+        with self._lock:
+            lookups = self._stats["lookups"]
+            return {
+                **self._stats,
+                "misses": lookups - self._stats["hits"],
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "vector_bytes": self._vectors.nbytes
+            }
@@ -0,0 +1,580 @@
+# src/serving/server.py
+from typing import Dict, List, Optional, Any, Tuple
+from collections import Counter, deque
+from dataclasses import is_dataclass, asdict
+from datetime import date, datetime
+from enum import Enum
+from collections.abc import Mapping
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import signal
+import sys
+import time
+import numpy as np
+from ..config.settings import Settings
+from ..models.state import PriorityLevel
+from ..utils.error_handlers import ValidationError
+from ..utils.logger import setup_logger
+from .scheduler import RequestScheduler
+
+logger = setup_logger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+SSE_HEARTBEAT_SECONDS = 10.0
+# Request latencies kept for the /metrics quantiles
+LATENCY_SAMPLES = 2048
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout"
+}
+
+# Agent error codes mapped to HTTP statuses (anything else is a 500)
+ERROR_STATUS = {
+    "INPUT_VALIDATION_ERROR": 400,
+    "RATE_LIMITED": 503,
+    "CIRCUIT_OPEN": 503,
+    "DEADLINE_EXCEEDED": 504
+}
+
+
+def to_jsonable(value: Any) -> Any:
+    """Agent responses (enums, datetimes, read-only mappings) as plain JSON values"""
+    if isinstance(value, Enum):
+        return value.name if isinstance(value, PriorityLevel) else value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_jsonable(item) for item in value]
+    if is_dataclass(value) and not isinstance(value, type):
+        return to_jsonable(asdict(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class HTTPRequest:
+    __slots__ = ("method", "path", "query", "version", "headers", "body")
+
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str], body: bytes):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path
+        self.query = url.query
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            payload = json.loads(self.body or b"{}")
+        except ValueError:
+            raise ValidationError("Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise ValidationError("Request body must be a JSON object")
+        return payload
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        self.status = status
+        self.message = message
+        super().__init__(message)
+
+
+class HealthcareServer:
+    """HTTP/JSON API for ``HealthcareAgent`` on asyncio streams.
+
+    Requests are admitted into the priority ``RequestScheduler``; once
+    ``max_queue`` requests are already waiting for a worker, new ones get a
+    503 with ``Retry-After`` instead of queueing without bound. Connections
+    are HTTP/1.1 keep-alive.
+
+    Routes:
+        POST /v1/query         {"query", "thread_id"?, "context"?, "priority"?, "timeout"?}
+        POST /v1/query/stream  same body, answered as server-sent events
+        GET  /health
+        GET  /metrics          Prometheus text format
+    """
+
+    def __init__(
+        self,
+        agent: Any = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        keep_alive: Optional[float] = None,
+        reuse_port: bool = False
+    ):
+        if agent is None:
+            # Imported here: the agent itself depends on this package
+            from ..agent import HealthcareAgent
+            agent = HealthcareAgent()
+        self.agent = agent
+        self.host = host or Settings.SERVER_HOST
+        self.port = Settings.SERVER_PORT if port is None else port
+        self.max_queue = Settings.SERVER_MAX_QUEUE if max_queue is None else max_queue
+        self.keep_alive = keep_alive or Settings.SERVER_KEEP_ALIVE
+        self.reuse_port = reuse_port
+        self.scheduler = RequestScheduler(agent.process, max_concurrency=max_concurrency)
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.pending = 0
+        self.writers = set()
+        self.responses: Counter = Counter()
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.started = time.time()
+
+    @property
+    def capacity(self) -> int:
+        """Requests admitted at once: running plus queued"""
+        return self.scheduler.max_concurrency + self.max_queue
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(
+            self._handle_connection,
+            self.host,
+            self.port,
+            limit=MAX_HEADER_BYTES,
+            reuse_port=self.reuse_port or None
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Serving on http://{self.host}:{self.port} (capacity {self.capacity})")
+
+    @property
+    def connections(self) -> int:
+        return len(self.writers)
+
+    async def stop(self) -> None:
+        """Stop accepting, finish admitted requests, then close idle connections"""
+        if self.server is not None:
+            self.server.close()
+        await asyncio.to_thread(self.scheduler.shutdown)
+        for writer in list(self.writers):
+            writer.close()
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    # HTTP/1.1 framing
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HTTPError(400, "Incomplete request")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(400, "Request headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        body = b""
+        if "transfer-encoding" in headers:
+            raise HTTPError(411, "Chunked request bodies are not supported")
+        length = headers.get("content-length")
+        if length:
+            if not length.isdigit():
+                raise HTTPError(400, "Invalid Content-Length")
+            if int(length) > MAX_BODY_BYTES:
+                raise HTTPError(413, "Request body too large")
+            body = await reader.readexactly(int(length))
+        return HTTPRequest(method.upper(), target, version, headers, body)
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str = "application/json",
+        keep_alive: bool = True,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive" if keep_alive else "Connection: close"
+        ]
+        if keep_alive:
+            lines.append(f"Keep-Alive: timeout={int(self.keep_alive)}")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _send_json(self, writer, status: int, payload: Any, keep_alive: bool = True, **kwargs) -> None:
+        await self._send(writer, status, json.dumps(to_jsonable(payload)).encode(), keep_alive=keep_alive, **kwargs)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.writers.add(writer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive)
+                except HTTPError as e:
+                    self.responses[("invalid", e.status)] += 1
+                    await self._send_json(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                except (asyncio.TimeoutError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                keep_alive = await self._dispatch(request, writer)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        except Exception as e:
+            logger.error(f"Error handling connection: {str(e)}")
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    # Routing
+
+    async def _dispatch(self, request: HTTPRequest, writer: asyncio.StreamWriter) -> bool:
+        """Handle one request; returns whether the connection stays open"""
+        routes = {
+            "/v1/query": ("POST", self._query),
+            "/v1/query/stream": ("POST", self._query_stream),
+            "/health": ("GET", self._health),
+            "/metrics": ("GET", self._metrics)
+        }
+        route = routes.get(request.path)
+        started = time.monotonic()
+        keep_alive = request.keep_alive
+        if route is None:
+            status = 404
+            await self._send_json(writer, status, {"error": "Not found"}, keep_alive)
+        elif request.method != route[0]:
+            status = 405
+            await self._send_json(writer, status, {"error": "Method not allowed"}, keep_alive,
+                                  headers={"Allow": route[0]})
+        else:
+            status, keep_alive = await route[1](request, writer, keep_alive)
+        self.responses[(request.path if route else "other", status)] += 1
+        if request.path.startswith("/v1/"):
+            self.latencies.append(time.monotonic() - started)
+        return keep_alive
+
+    def _parse_query(self, request: HTTPRequest) -> Tuple[str, Dict[str, Any]]:
+        payload = request.json()
+        query = payload.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise ValidationError("Field 'query' must be a non-empty string")
+        thread_id = payload.get("thread_id")
+        if thread_id is not None and not isinstance(thread_id, str):
+            raise ValidationError("Field 'thread_id' must be a string")
+        context = payload.get("context")
+        if context is not None and not isinstance(context, dict):
+            raise ValidationError("Field 'context' must be an object")
+
+        timeout = payload.get("timeout")
+        if timeout is None:
+            timeout = Settings.REQUEST_TIMEOUT
+        else:
+            try:
+                if isinstance(timeout, bool) or not isinstance(timeout, (int, float, str)):
+                    raise TypeError(timeout)
+                timeout = float(timeout)
+            except (TypeError, ValueError):
+                timeout = math.nan
+            if not math.isfinite(timeout) or timeout <= 0:
+                raise ValidationError("Field 'timeout' must be a positive number of seconds")
+
+        kwargs = {
+            "thread_id": thread_id,
+            "context": context,
+            "deadline": time.monotonic() + timeout
+        }
+        priority = payload.get("priority")
+        if priority is not None:
+            try:
+                if isinstance(priority, str):
+                    kwargs["priority"] = PriorityLevel[priority.upper()]
+                elif isinstance(priority, int) and not isinstance(priority, bool):
+                    kwargs["priority"] = PriorityLevel(priority)
+                else:
+                    raise TypeError(priority)
+            except (KeyError, ValueError, TypeError):
+                raise ValidationError(f"Unknown priority: {priority}")
+        return query, kwargs
+
+    def _admit(self, query: str, kwargs: Dict[str, Any]):
+        """Scheduler future for the request, or None when the queue is full"""
+        if self.pending >= self.capacity:
+            return None
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        future = self.scheduler.submit(query, **kwargs)
+        # Completed on a scheduler thread; the count belongs to the loop
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return future
+
+    def _release(self) -> None:
+        self.pending -= 1
+
+    def _result_status(self, result: Any) -> int:
+        if isinstance(result, dict) and result.get("error"):
+            return ERROR_STATUS.get(result.get("error_code"), 500)
+        return 200
+
+    async def _overloaded(self, writer, keep_alive: bool) -> Tuple[int, bool]:
+        await self._send_json(
+            writer, 503, {"error": "Server busy, retry later", "queued": self.pending},
+            keep_alive, headers={"Retry-After": "1"}
+        )
+        return 503, keep_alive
+
+    async def _query(self, request: HTTPRequest, writer, keep_alive: bool) -> Tuple[int, bool]:
+        try:
+            query, kwargs = self._parse_query(request)
+        except ValidationError as e:
+            await self._send_json(writer, 400, {"error": e.message}, keep_alive)
+            return 400, keep_alive
+
+        future = self._admit(query, kwargs)
+        if future is None:
+            return await self._overloaded(writer, keep_alive)
+        try:
+            result = await asyncio.wrap_future(future)
+        except ValidationError as e:
+            await self._send_json(writer, 400, {"error": e.message}, keep_alive)
+            return 400, keep_alive
+        except Exception as e:
+            logger.error(f"Error processing query: {str(e)}")
+            await self._send_json(writer, 500, {"error": "Internal error"}, keep_alive)
+            return 500, keep_alive
+        status = self._result_status(result)
+        await self._send_json(writer, status, result, keep_alive)
+        return status, keep_alive
+
+    async def _query_stream(self, request: HTTPRequest, writer, keep_alive: bool) -> Tuple[int, bool]:
+        """Server-sent events: queued, message (answer lines), result, done"""
+        try:
+            query, kwargs = self._parse_query(request)
+        except ValidationError as e:
+            await self._send_json(writer, 400, {"error": e.message}, keep_alive)
+            return 400, keep_alive
+
+        future = self._admit(query, kwargs)
+        if future is None:
+            return await self._overloaded(writer, keep_alive)
+
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: text/event-stream\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1"))
+
+        async def emit(text: str) -> None:
+            data = text.encode()
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            await writer.drain()
+
+        async def event(name: str, payload: Any) -> None:
+            await emit(f"event: {name}\ndata: {json.dumps(to_jsonable(payload))}\n\n")
+
+        await event("queued", {"queued": self.pending})
+        waiter = asyncio.wrap_future(future)
+        while not waiter.done():
+            done, _ = await asyncio.wait({waiter}, timeout=SSE_HEARTBEAT_SECONDS)
+            if not done:
+                await emit(": heartbeat\n\n")
+
+        try:
+            result = waiter.result()
+            status = self._result_status(result)
+        except ValidationError as e:
+            result, status = {"error": True, "message": e.message}, 400
+        except Exception as e:
+            logger.error(f"Error processing streamed query: {str(e)}")
+            result, status = {"error": True, "message": "Internal error"}, 500
+
+        if status == 200:
+            for line in str(result.get("response", "")).splitlines():
+                if line.strip():
+                    await event("message", {"text": line})
+        await event("result" if status == 200 else "error", result)
+        await event("done", {"status": status})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return status, keep_alive
+
+    async def _health(self, request: HTTPRequest, writer, keep_alive: bool) -> Tuple[int, bool]:
+        await self._send_json(writer, 200, {
+            "status": "ok",
+            "pending": self.pending,
+            "capacity": self.capacity,
+            "uptime_seconds": round(time.time() - self.started, 1)
+        }, keep_alive)
+        return 200, keep_alive
+
+    async def _metrics(self, request: HTTPRequest, writer, keep_alive: bool) -> Tuple[int, bool]:
+        body = self.metrics_text().encode()
+        await self._send(writer, 200, body, "text/plain; version=0.0.4", keep_alive)
+        return 200, keep_alive
+
+    def metrics_text(self) -> str:
+        """Server, scheduler and agent statistics in Prometheus text format"""
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, samples: List[Tuple[Dict[str, Any], Any]], help_text: str) -> None:
+            lines.append(f"# HELP healthcare_{name} {help_text}")
+            lines.append(f"# TYPE healthcare_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+                lines.append(f"healthcare_{name}{{{label_text}}} {value}" if label_text
+                             else f"healthcare_{name} {value}")
+
+        metric("http_responses_total", "counter", [
+            ({"route": route, "status": status}, count)
+            for (route, status), count in sorted(self.responses.items(), key=str)
+        ], "HTTP responses by route and status")
+        metric("http_pending_requests", "gauge", [({}, self.pending)], "Admitted requests not yet answered")
+        metric("http_capacity", "gauge", [({}, self.capacity)], "Requests admitted before returning 503")
+        metric("http_open_connections", "gauge", [({}, self.connections)], "Open client connections")
+        latencies = np.array(self.latencies)
+        metric("http_request_seconds", "summary", [
+            ({"quantile": q}, round(float(np.quantile(latencies, q)), 4) if len(latencies) else 0)
+            for q in (0.5, 0.95, 0.99)
+        ], "Query latency over recent requests")
+
+        scheduler = self.scheduler.stats()
+        metric("scheduler_running", "gauge", [({}, scheduler["running"])], "Graph executions in progress")
+        metric("scheduler_queued", "gauge", [
+            ({"priority": priority}, stats["queued"]) for priority, stats in scheduler["by_priority"].items()
+        ], "Requests waiting for a worker")
+        metric("scheduler_completed_total", "counter", [
+            ({"priority": priority}, stats["completed"]) for priority, stats in scheduler["by_priority"].items()
+        ], "Requests completed")
+        metric("scheduler_latency_ms", "gauge", [
+            ({"priority": priority, "quantile": quantile}, stats[f"p{int(quantile * 100)}_latency_ms"])
+            for priority, stats in scheduler["by_priority"].items() for quantile in (0.5, 0.95)
+        ], "Queue plus processing latency by priority")
+
+        report_usage = getattr(self.agent, "get_usage_report", None)
+        if report_usage is not None:
+            report = report_usage()
+            totals = report["totals"]
+            metric("llm_calls_total", "counter", [({}, totals["calls"])], "Model calls")
+            metric("llm_errors_total", "counter", [({}, totals["errors"])], "Failed model calls")
+            metric("llm_tokens_total", "counter", [
+                ({"direction": "input"}, totals["input_tokens"]),
+                ({"direction": "output"}, totals["output_tokens"])
+            ], "Model tokens")
+            metric("llm_cost_usd_total", "counter", [({}, round(totals["cost_usd"], 6))], "Model cost")
+            metric("coalescing_ratio", "gauge", [
+                ({}, report["coalescing"]["coalescing_ratio"])
+            ], "Share of requests served by an identical in-flight request")
+            if report.get("semantic_cache") is not None:
+                metric("semantic_cache_hit_rate", "gauge", [
+                    ({}, report["semantic_cache"]["hit_rate"])
+                ], "Share of lookups answered from the semantic cache")
+        return "\n".join(lines) + "\n"
+
+
+def _run_worker(host: str, port: int, max_queue: Optional[int], reuse_port: bool) -> None:
+    async def main() -> None:
+        server = HealthcareServer(host=host, port=port, max_queue=max_queue, reuse_port=reuse_port)
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stopped.set)
+        await server.start()
+        await stopped.wait()
+        await server.stop()
+
+    asyncio.run(main())
+
+
+def serve(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    max_queue: Optional[int] = None
+) -> None:
+    """Run the API; with several workers, each process accepts on the shared port"""
+    host = host or Settings.SERVER_HOST
+    port = Settings.SERVER_PORT if port is None else port
+    workers = workers or Settings.SERVER_WORKERS
+    if workers <= 1:
+        _run_worker(host, port, max_queue, reuse_port=False)
+        return
+
+    processes = [
+        multiprocessing.Process(target=_run_worker, args=(host, port, max_queue, True), name=f"worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {workers} worker processes on port {port}")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Healthcare Operations Agent HTTP API")
+    parser.add_argument("--host", default=Settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=Settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=Settings.SERVER_WORKERS,
+                        help="server processes sharing the port")
+    parser.add_argument("--max-queue", type=int, default=Settings.SERVER_MAX_QUEUE,
+                        help="queued requests per process before answering 503")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.max_queue)
+
+
+if __name__ == "__main__":
+    main()
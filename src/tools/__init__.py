@@ -3,10 +3,27 @@ from .patient_tools import PatientTools
 from .resource_tools import ResourceTools
 from .quality_tools import QualityTools
 from .scheduling_tools import SchedulingTools
+from .admission_queue import AdmissionQueue
+from .discharge_forecast import LengthOfStayTable, DischargePredictor
+from .quality_aggregators import ComplianceAggregator, OutcomesAggregator
+from .feedback_scanner import FeedbackScanner
+from .resource_allocation import ResourceAllocator
+from .supply_forecast import SupplyForecaster
+from .executor import ToolExecutor, get_tool_executor
 
 __all__ = [
     'PatientTools',
     'ResourceTools',
     'QualityTools',
-    'SchedulingTools'
+    'SchedulingTools',
+    'AdmissionQueue',
+    'LengthOfStayTable',
+    'DischargePredictor',
+    'ComplianceAggregator',
+    'OutcomesAggregator',
+    'FeedbackScanner',
+    'ResourceAllocator',
+    'SupplyForecaster',
+    'ToolExecutor',
+    'get_tool_executor'
 ]
\ No newline at end of file
@@ -0,0 +1,255 @@
+# src/tools/admission_queue.py
+from typing import Dict, List, Optional, Any
+import numpy as np
+from ..utils.logger import setup_logger
+from .patient_tools import (
+    CONDITION_SCORES,
+    DEFAULT_CONDITION_SCORE,
+    WAIT_FACTOR_MINUTES,
+    MAX_WAIT_FACTOR,
+    LOAD_PENALTY_THRESHOLD,
+    priority_level_for_score
+)
+
+logger = setup_logger(__name__)
+
+
+class AdmissionQueue:
+    """Per-department admission queue backed by an indexed binary max-heap.
+
+    Patients are ordered by the same score as
+    ``PatientTools.assess_admission_priority`` (condition score + wait factor
+    - load penalty). Ties are broken by arrival order. Each department keeps
+    its own heap plus a patient_id -> heap position index so that updates and
+    removals of arbitrary patients run in O(log n).
+    """
+
+    def __init__(self, department_load: Optional[Dict[str, float]] = None):
+        self._heaps: Dict[str, List[str]] = {}
+        self._positions: Dict[str, int] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._department_load: Dict[str, float] = dict(department_load or {})
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, patient_id: str) -> bool:
+        return patient_id in self._entries
+
+    def department_size(self, department: str) -> int:
+        """Number of patients waiting for a department"""
+        return len(self._heaps.get(department, []))
+
+    def insert(
+        self,
+        patient_id: str,
+        patient_condition: str,
+        wait_time: float,
+        department: str
+    ) -> Dict:
+        """Add a waiting patient to the queue of their department"""
+        if patient_id in self._entries:
+            raise ValueError(f"Patient already queued: {patient_id}")
+
+        entry = {
+            "patient_id": patient_id,
+            "department": department,
+            "condition": patient_condition,
+            "condition_score": CONDITION_SCORES.get(
+                patient_condition.lower(), DEFAULT_CONDITION_SCORE
+            ),
+            "wait_time": float(wait_time),
+            "sequence": self._sequence,
+            "priority_score": 0.0
+        }
+        self._sequence += 1
+        entry["priority_score"] = self._score(entry)
+        self._entries[patient_id] = entry
+
+        heap = self._heaps.setdefault(department, [])
+        heap.append(patient_id)
+        self._positions[patient_id] = len(heap) - 1
+        self._sift_up(heap, len(heap) - 1)
+
+        return self._export(entry)
+
+    def update_wait_time(self, patient_id: str, wait_time: float) -> Dict:
+        """Update a single patient's wait time and restore heap order"""
+        entry = self._get_entry(patient_id)
+        entry["wait_time"] = float(wait_time)
+        self._reposition(entry, self._score(entry))
+        return self._export(entry)
+
+    def update_condition(self, patient_id: str, patient_condition: str) -> Dict:
+        """Re-triage a patient to a new condition"""
+        entry = self._get_entry(patient_id)
+        entry["condition"] = patient_condition
+        entry["condition_score"] = CONDITION_SCORES.get(
+            patient_condition.lower(), DEFAULT_CONDITION_SCORE
+        )
+        self._reposition(entry, self._score(entry))
+        return self._export(entry)
+
+    def peek(self, department: str) -> Optional[Dict]:
+        """Return the highest priority patient of a department without removing it"""
+        heap = self._heaps.get(department)
+        if not heap:
+            return None
+        return self._export(self._entries[heap[0]])
+
+    def pop(self, department: str) -> Optional[Dict]:
+        """Remove and return the highest priority patient of a department"""
+        heap = self._heaps.get(department)
+        if not heap:
+            return None
+        return self.remove(heap[0])
+
+    def remove(self, patient_id: str) -> Dict:
+        """Remove a patient from the queue (admitted, transferred or left)"""
+        entry = self._get_entry(patient_id)
+        heap = self._heaps[entry["department"]]
+        index = self._positions.pop(patient_id)
+        last = heap.pop()
+
+        if index < len(heap):
+            heap[index] = last
+            self._positions[last] = index
+            self._sift_down(heap, self._sift_up(heap, index))
+
+        del self._entries[patient_id]
+        return self._export(entry)
+
+    def tick(self, elapsed_minutes: float) -> None:
+        """Advance the wait time of every queued patient and rescore"""
+        for entry in self._entries.values():
+            entry["wait_time"] += elapsed_minutes
+        self.rescore()
+
+    def rescore(self, department_load: Optional[Dict[str, float]] = None) -> None:
+        """Recompute all priority scores in one vectorized pass and rebuild heaps.
+
+        Scores are computed with NumPy over the whole queue; each department's
+        heap is then rebuilt from a descending sort, which is a valid heap.
+        """
+        try:
+            if department_load is not None:
+                self._department_load.update(department_load)
+
+            if not self._entries:
+                return
+
+            entries = list(self._entries.values())
+            count = len(entries)
+
+            condition_scores = np.fromiter(
+                (e["condition_score"] for e in entries), dtype=np.float64, count=count
+            )
+            wait_times = np.fromiter(
+                (e["wait_time"] for e in entries), dtype=np.float64, count=count
+            )
+            loads = np.fromiter(
+                (self._department_load.get(e["department"], 0.0) for e in entries),
+                dtype=np.float64,
+                count=count
+            )
+            sequences = np.fromiter(
+                (e["sequence"] for e in entries), dtype=np.int64, count=count
+            )
+
+            wait_factors = np.minimum(wait_times / WAIT_FACTOR_MINUTES, MAX_WAIT_FACTOR)
+            load_penalties = np.where(loads > LOAD_PENALTY_THRESHOLD, loads, 0.0)
+            scores = condition_scores + wait_factors - load_penalties
+
+            for entry, score in zip(entries, scores.tolist()):
+                entry["priority_score"] = score
+
+            # Highest score first, earliest arrival first among equal scores
+            order = np.lexsort((sequences, -scores))
+
+            self._heaps = {department: [] for department in self._heaps}
+            self._positions = {}
+            for index in order.tolist():
+                entry = entries[index]
+                heap = self._heaps.setdefault(entry["department"], [])
+                self._positions[entry["patient_id"]] = len(heap)
+                heap.append(entry["patient_id"])
+
+        except Exception as e:
+            logger.error(f"Error rescoring admission queue: {str(e)}")
+            raise
+
+    def snapshot(self, department: Optional[str] = None) -> List[Dict]:
+        """Export queued patients in priority order for display"""
+        if department is not None:
+            patient_ids = list(self._heaps.get(department, []))
+        else:
+            patient_ids = list(self._entries)
+
+        entries = sorted(
+            (self._entries[patient_id] for patient_id in patient_ids),
+            key=lambda e: (-e["priority_score"], e["sequence"])
+        )
+        return [self._export(entry) for entry in entries]
+
+    def _score(self, entry: Dict) -> float:
+        load = self._department_load.get(entry["department"], 0.0)
+        wait_factor = min(entry["wait_time"] / WAIT_FACTOR_MINUTES, MAX_WAIT_FACTOR)
+        load_penalty = load if load > LOAD_PENALTY_THRESHOLD else 0
+        return entry["condition_score"] + wait_factor - load_penalty
+
+    def _export(self, entry: Dict) -> Dict:
+        score = entry["priority_score"]
+        return {
+            "patient_id": entry["patient_id"],
+            "department": entry["department"],
+            "condition": entry["condition"],
+            "wait_time": entry["wait_time"],
+            "priority_score": round(score, 2),
+            "priority_level": priority_level_for_score(score)
+        }
+
+    def _get_entry(self, patient_id: str) -> Dict:
+        entry = self._entries.get(patient_id)
+        if entry is None:
+            raise KeyError(f"Patient not in admission queue: {patient_id}")
+        return entry
+
+    def _reposition(self, entry: Dict, score: float) -> None:
+        entry["priority_score"] = score
+        heap = self._heaps[entry["department"]]
+        index = self._sift_up(heap, self._positions[entry["patient_id"]])
+        self._sift_down(heap, index)
+
+    def _before(self, a: str, b: str) -> bool:
+        entry_a = self._entries[a]
+        entry_b = self._entries[b]
+        if entry_a["priority_score"] != entry_b["priority_score"]:
+            return entry_a["priority_score"] > entry_b["priority_score"]
+        return entry_a["sequence"] < entry_b["sequence"]
+
+    def _swap(self, heap: List[str], i: int, j: int) -> None:
+        heap[i], heap[j] = heap[j], heap[i]
+        self._positions[heap[i]] = i
+        self._positions[heap[j]] = j
+
+    def _sift_up(self, heap: List[str], index: int) -> int:
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self._before(heap[index], heap[parent]):
+                break
+            self._swap(heap, index, parent)
+            index = parent
+        return index
+
+    def _sift_down(self, heap: List[str], index: int) -> int:
+        size = len(heap)
+        while True:
+            best = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._before(heap[child], heap[best]):
+                    best = child
+            if best == index:
+                return index
+            self._swap(heap, index, best)
+            index = best
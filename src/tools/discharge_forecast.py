@@ -0,0 +1,265 @@
+# src/tools/discharge_forecast.py
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+import json
+import numpy as np
+from ..config.settings import Settings
+from ..utils.logger import setup_logger
+from .patient_tools import LOS_BY_CONDITION, DEFAULT_LOS_DAYS, ICU_LOS_MULTIPLIER
+
+logger = setup_logger(__name__)
+
+# Quantile levels kept per table row; 0.0 and 1.0 are the observed min/max
+QUANTILE_LEVELS = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+REPORTED_QUANTILES = {"p10": 1, "p25": 2, "p50": 3, "p75": 4, "p90": 5}
+
+ANY = "*"
+SECONDS_PER_DAY = 86400
+
+
+class LengthOfStayTable:
+    """Length-of-stay distribution per (condition, department).
+
+    The table starts from the hard-coded ``LOS_BY_CONDITION`` defaults
+    (point estimates) and is refined by ``fit`` with historical stays.
+    Lookups fall back from (condition, department) to (condition, any),
+    (any, department) and finally (any, any).
+    """
+
+    def __init__(self, min_samples: int = 30):
+        self.min_samples = min_samples
+        self._rows: Dict[Tuple[str, str], Dict] = {}
+        self._load_defaults()
+
+    def _load_defaults(self) -> None:
+        for condition, days in LOS_BY_CONDITION.items():
+            self._set_point(condition, ANY, days)
+            self._set_point(condition, "icu", days * ICU_LOS_MULTIPLIER)
+        self._set_point(ANY, ANY, DEFAULT_LOS_DAYS)
+        self._set_point(ANY, "icu", DEFAULT_LOS_DAYS * ICU_LOS_MULTIPLIER)
+
+    def _set_point(self, condition: str, department: str, days: float) -> None:
+        self._rows[(condition, department)] = {
+            "mean": float(days),
+            "quantiles": [float(days)] * len(QUANTILE_LEVELS),
+            "count": 0
+        }
+
+    def fit(
+        self,
+        conditions: Sequence[str],
+        departments: Sequence[str],
+        lengths_of_stay: Sequence[float]
+    ) -> "LengthOfStayTable":
+        """Fit quantiles from historical stays (length of stay in days)"""
+        try:
+            conditions = np.char.lower(np.asarray(conditions, dtype=str))
+            departments = np.char.lower(np.asarray(departments, dtype=str))
+            los = np.asarray(lengths_of_stay, dtype=np.float64)
+
+            if not (len(conditions) == len(departments) == len(los)):
+                raise ValueError("Historical stay arrays must have equal length")
+
+            wildcard = np.full(len(los), ANY)
+            groupings = [
+                (wildcard, wildcard),
+                (wildcard, departments),
+                (conditions, wildcard),
+                (conditions, departments)
+            ]
+            for condition_keys, department_keys in groupings:
+                keys = np.char.add(np.char.add(condition_keys, "|"), department_keys)
+                unique_keys, inverse, counts = np.unique(
+                    keys, return_inverse=True, return_counts=True
+                )
+                for index, key in enumerate(unique_keys.tolist()):
+                    if counts[index] < self.min_samples:
+                        continue
+                    values = los[inverse == index]
+                    condition, department = key.split("|", 1)
+                    self._rows[(condition, department)] = {
+                        "mean": float(values.mean()),
+                        "quantiles": np.quantile(values, QUANTILE_LEVELS).tolist(),
+                        "count": int(counts[index])
+                    }
+
+            return self
+
+        except Exception as e:
+            logger.error(f"Error fitting length-of-stay table: {str(e)}")
+            raise
+
+    def lookup(self, condition: str, department: str) -> Dict:
+        """Return the most specific row for a condition and department"""
+        condition = condition.lower()
+        department = department.lower()
+        for key in (
+            (condition, department),
+            (condition, ANY),
+            (ANY, department),
+            (ANY, ANY)
+        ):
+            if key in self._rows:
+                return self._rows[key]
+        raise KeyError("Length-of-stay table has no fallback row")
+
+    def to_dict(self) -> Dict:
+        return {
+            "min_samples": self.min_samples,
+            "quantile_levels": list(QUANTILE_LEVELS),
+            "rows": [
+                {"condition": condition, "department": department, **row}
+                for (condition, department), row in self._rows.items()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LengthOfStayTable":
+        if list(data.get("quantile_levels", QUANTILE_LEVELS)) != list(QUANTILE_LEVELS):
+            raise ValueError("Length-of-stay table uses different quantile levels")
+        table = cls(min_samples=data.get("min_samples", 30))
+        for row in data["rows"]:
+            table._rows[(row["condition"], row["department"])] = {
+                "mean": row["mean"],
+                "quantiles": row["quantiles"],
+                "count": row["count"]
+            }
+        return table
+
+    def save(self, path: str) -> None:
+        """Persist the fitted table as JSON"""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "LengthOfStayTable":
+        """Load a table previously written by ``save``"""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class DischargePredictor:
+    """Vectorized discharge time prediction for a whole census"""
+
+    def __init__(self, los_table: Optional[LengthOfStayTable] = None):
+        self.los_table = los_table or LengthOfStayTable()
+
+    def _resolve(
+        self,
+        conditions: Sequence[str],
+        departments: Sequence[str]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Map every patient to a table row; returns (row index, means, quantiles)"""
+        if len(conditions) != len(departments):
+            raise ValueError("Conditions and departments must have equal length")
+
+        row_index: Dict[Tuple[str, str], int] = {}
+        means: List[float] = []
+        quantiles: List[List[float]] = []
+        indices = np.empty(len(conditions), dtype=np.int64)
+
+        for i, key in enumerate(zip(conditions, departments)):
+            index = row_index.get(key)
+            if index is None:
+                row = self.los_table.lookup(*key)
+                index = row_index[key] = len(means)
+                means.append(row["mean"])
+                quantiles.append(row["quantiles"])
+            indices[i] = index
+
+        return (
+            indices,
+            np.asarray(means, dtype=np.float64),
+            np.asarray(quantiles, dtype=np.float64).reshape(-1, len(QUANTILE_LEVELS))
+        )
+
+    def predict(
+        self,
+        admission_times: Sequence[datetime],
+        conditions: Sequence[str],
+        departments: Sequence[str]
+    ) -> Dict:
+        """Predict discharge time distribution for every patient"""
+        try:
+            admitted = np.asarray(admission_times, dtype="datetime64[s]")
+            indices, means, quantiles = self._resolve(conditions, departments)
+
+            def to_times(days: np.ndarray) -> np.ndarray:
+                offsets = np.rint(days * SECONDS_PER_DAY).astype("timedelta64[s]")
+                return admitted + offsets
+
+            row_quantiles = quantiles[indices]
+            return {
+                "expected_discharge": to_times(means[indices]),
+                "discharge_quantiles": {
+                    name: to_times(row_quantiles[:, column])
+                    for name, column in REPORTED_QUANTILES.items()
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Error predicting discharge times: {str(e)}")
+            raise
+
+    def expected_free_beds(
+        self,
+        admission_times: Sequence[datetime],
+        conditions: Sequence[str],
+        departments: Sequence[str],
+        now: Optional[datetime] = None,
+        horizon_hours: int = 24,
+        total_beds: Optional[int] = None
+    ) -> Dict:
+        """Hourly curve of expected free beds over the forecast horizon.
+
+        Each patient's discharge probability by hour h is the conditional
+        probability P(LOS <= elapsed + h | LOS > elapsed), taken from the
+        piecewise-linear CDF through the table quantiles. Patients already
+        past their longest observed stay count as discharged in the first hour.
+        """
+        try:
+            now = np.datetime64(now or datetime.now(), "s")
+            admitted = np.asarray(admission_times, dtype="datetime64[s]")
+            if total_beds is None:
+                total_beds = Settings.HOSPITAL_SETTINGS["total_beds"]
+
+            indices, _, quantiles = self._resolve(conditions, departments)
+
+            elapsed = (now - admitted).astype(np.float64) / SECONDS_PER_DAY
+            hours = np.arange(horizon_hours + 1, dtype=np.float64)
+            # (patients, horizon + 1) elapsed stay in days at each hour mark
+            stay = elapsed[:, None] + hours[None, :] / 24.0
+
+            cdf = np.empty_like(stay)
+            # Tiny ramp keeps interpolation points strictly increasing for
+            # point-estimate rows
+            ramp = np.arange(len(QUANTILE_LEVELS)) * 1e-9
+            for index in np.unique(indices).tolist():
+                mask = indices == index
+                cdf[mask] = np.interp(stay[mask], quantiles[index] + ramp, QUANTILE_LEVELS)
+
+            survival = 1.0 - cdf[:, :1]
+            overdue = survival[:, 0] <= 1e-9
+            probability = np.where(
+                overdue[:, None],
+                1.0,
+                (cdf - cdf[:, :1]) / np.where(overdue[:, None], 1.0, survival)
+            )
+            probability[:, 0] = 0.0
+            probability[overdue, 1:] = 1.0
+
+            expected_discharges = probability.sum(axis=0)
+            currently_free = total_beds - len(admitted)
+
+            return {
+                "hours": now + (hours * 3600).astype("timedelta64[s]"),
+                "expected_discharges": expected_discharges,
+                "hourly_discharges": np.diff(expected_discharges, prepend=0.0),
+                "expected_free_beds": currently_free + expected_discharges,
+                "total_beds": total_beds,
+                "occupied_beds": len(admitted)
+            }
+
+        except Exception as e:
+            logger.error(f"Error forecasting free beds: {str(e)}")
+            raise
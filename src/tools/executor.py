@@ -0,0 +1,366 @@
+# src/tools/executor.py
+from typing import Dict, List, Optional, Any, Callable, Iterable, Tuple
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+import asyncio
+import os
+import threading
+import time
+import numpy as np
+from ..config.settings import Settings
+from ..llm.context import remaining_time
+from ..utils.error_handlers import DeadlineExceededError
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Timing samples kept per tool for percentiles
+TIMING_SAMPLES = 1024
+
+# Rough per-item size of non-array payloads when deciding inline vs pool
+ITEM_BYTES = 64
+
+
+def payload_size(value: Any) -> int:
+    """Approximate bytes of a tool input: array buffers plus nested items"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, Mapping):
+        return sum(ITEM_BYTES + payload_size(item) for item in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return sum(ITEM_BYTES + payload_size(item) for item in value)
+    return ITEM_BYTES
+
+
+class _SharedArray:
+    """Picklable reference to an array inside a shared memory block"""
+    __slots__ = ("name", "offset", "shape", "dtype")
+
+    def __init__(self, name: str, offset: int, shape: Tuple[int, ...], dtype: np.dtype):
+        self.name = name
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.name, self.offset, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.name, self.offset, self.shape, self.dtype = state
+
+
+def _map_arrays(value: Any, convert: Callable[[np.ndarray], Any]) -> Any:
+    """Apply ``convert`` to arrays nested in lists, tuples and dicts"""
+    if isinstance(value, np.ndarray):
+        return convert(value)
+    if isinstance(value, dict):
+        return {key: _map_arrays(item, convert) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_map_arrays(item, convert) for item in value)
+    return value
+
+
+def _iter_arrays(value: Any):
+    if isinstance(value, np.ndarray):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_arrays(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_arrays(item)
+
+
+def _run_in_worker(function: Callable, args: Tuple, kwargs: Dict, submitted: float):
+    """Pool side: attach shared arrays in place, run, report timing"""
+    started = time.time()
+    blocks: Dict[str, SharedMemory] = {}
+    attached: List[np.ndarray] = []
+
+    def attach(value: Any) -> Any:
+        if isinstance(value, _SharedArray):
+            block = blocks.get(value.name)
+            if block is None:
+                block = blocks[value.name] = SharedMemory(name=value.name)
+            array = np.ndarray(value.shape, value.dtype, buffer=block.buf, offset=value.offset)
+            attached.append(array)
+            return array
+        if isinstance(value, dict):
+            return {key: attach(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(attach(item) for item in value)
+        return value
+
+    def detach(array: np.ndarray) -> np.ndarray:
+        # Results viewing an input would dangle once its block is unmapped
+        if any(np.may_share_memory(array, source) for source in attached):
+            return array.copy()
+        return array
+
+    try:
+        args, kwargs = attach(args), attach(kwargs)
+        exec_started = time.perf_counter()
+        result = _map_arrays(function(*args, **kwargs), detach)
+        exec_seconds = time.perf_counter() - exec_started
+    finally:
+        args = kwargs = None
+        attached.clear()
+        for block in blocks.values():
+            block.close()
+    return result, started - submitted, exec_seconds
+
+
+class ToolExecutor:
+    """Runs CPU-heavy tool computations off the calling thread.
+
+    Tool invocations whose inputs exceed ``inline_bytes`` (see
+    ``payload_size``), or whose tool name is in ``pooled_tools``, go to a
+    process pool, so a long solve holds a worker process instead of the
+    GIL. Smaller calls run inline, where dispatch would cost more than it
+    saves.
+
+    NumPy arrays in the arguments are passed through shared memory: arrays
+    from ``shared_array`` are referenced in place, other arrays are copied
+    once into a temporary block released when the call completes. Inside a
+    ``request_scope`` with a deadline, waiting for a pooled call stops when
+    the request runs out of time. Queue wait and execution time are
+    recorded per tool.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        inline_bytes: Optional[int] = None,
+        pooled_tools: Optional[Iterable[str]] = None
+    ):
+        self.workers = workers or Settings.TOOL_POOL_WORKERS or os.cpu_count() or 1
+        self.inline_bytes = Settings.TOOL_INLINE_BYTES if inline_bytes is None else inline_bytes
+        self.pooled_tools = set(Settings.TOOL_POOL_TOOLS if pooled_tools is None else pooled_tools)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shared: Dict[str, Tuple[SharedMemory, int]] = {}
+        self._lock = threading.Lock()
+        self._timings: Dict[str, Dict[str, deque]] = defaultdict(
+            lambda: {"queue": deque(maxlen=TIMING_SAMPLES), "exec": deque(maxlen=TIMING_SAMPLES)}
+        )
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"inline": 0, "pooled": 0, "errors": 0, "shared_bytes": 0}
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                logger.info(f"Starting tool process pool with {self.workers} workers")
+                # Spawned, not forked: the serving process runs many threads
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+            return self._pool
+
+    def shared_array(self, shape: Tuple[int, ...], dtype: Any = np.float64) -> np.ndarray:
+        """Array in shared memory, passed to pooled tools without copying"""
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        block = SharedMemory(create=True, size=size)
+        array = np.ndarray(shape, dtype, buffer=block.buf)
+        with self._lock:
+            self._shared[block.name] = (block, array.ctypes.data)
+        return array
+
+    def release(self, array: np.ndarray) -> None:
+        """Free an array from ``shared_array``.
+
+        The memory is unmapped: neither the array nor views of it may be
+        used afterwards.
+        """
+        address = array.ctypes.data
+        with self._lock:
+            for name, (block, base) in list(self._shared.items()):
+                if base <= address < base + block.size:
+                    del self._shared[name]
+                    break
+            else:
+                return
+        block.unlink()
+        try:
+            block.close()
+        except BufferError:
+            pass
+
+    def _share(self, array: np.ndarray, temporary: List[SharedMemory]) -> _SharedArray:
+        """Reference an owned shared block, or copy into a temporary one"""
+        if array.dtype.hasobject:
+            # Object arrays hold pointers, not data; they are pickled
+            return array
+        if array.flags.c_contiguous:
+            address = array.ctypes.data
+            with self._lock:
+                for name, (block, base) in self._shared.items():
+                    if base <= address and address + array.nbytes <= base + block.size:
+                        return _SharedArray(name, address - base, array.shape, array.dtype)
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        temporary.append(block)
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        return _SharedArray(block.name, 0, array.shape, array.dtype)
+
+    def should_pool(self, tool: str, args: Tuple, kwargs: Dict) -> bool:
+        if tool in self.pooled_tools:
+            return True
+        return payload_size(args) + payload_size(kwargs) > self.inline_bytes
+
+    def submit(self, tool: str, function: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Run ``function`` inline or in the pool; the future resolves to its result"""
+        if not self.should_pool(tool, args, kwargs):
+            future: Future = Future()
+            started = time.perf_counter()
+            try:
+                future.set_result(function(*args, **kwargs))
+            except Exception as e:
+                self._record(tool, "inline", 0.0, time.perf_counter() - started, error=True)
+                future.set_exception(e)
+                return future
+            self._record(tool, "inline", 0.0, time.perf_counter() - started)
+            return future
+
+        temporary: List[SharedMemory] = []
+        shared_bytes = sum(
+            array.nbytes for array in _iter_arrays((args, kwargs)) if not array.dtype.hasobject
+        )
+        args = _map_arrays(args, lambda array: self._share(array, temporary))
+        kwargs = _map_arrays(kwargs, lambda array: self._share(array, temporary))
+        try:
+            pooled = self._get_pool().submit(_run_in_worker, function, args, kwargs, time.time())
+        except Exception:
+            self._free(temporary)
+            raise
+
+        future = Future()
+
+        def done(pooled: Future) -> None:
+            # Temporary blocks live until the worker is finished with them
+            self._free(temporary)
+            if pooled.cancelled():
+                future.cancel()
+                return
+            error = pooled.exception()
+            try:
+                if error is not None:
+                    self._record(tool, "pooled", 0.0, 0.0, error=True)
+                    future.set_exception(error)
+                    return
+                result, queued, executed = pooled.result()
+                self._record(tool, "pooled", queued, executed, shared_bytes=shared_bytes)
+                future.set_result(result)
+            except InvalidStateError:
+                # Caller gave up waiting (deadline) and cancelled
+                pass
+
+        # A call still queued in the pool is dropped when the caller cancels
+        future.add_done_callback(lambda f: f.cancelled() and pooled.cancel())
+        pooled.add_done_callback(done)
+        return future
+
+    def run(self, tool: str, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a tool call and wait for it, within the request deadline"""
+        future = self.submit(tool, function, *args, **kwargs)
+        remaining = remaining_time()
+        try:
+            return future.result(timeout=None if remaining is None else max(remaining, 0))
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceededError(
+                message=f"Tool {tool} did not finish before the request deadline",
+                details={"tool": tool}
+            )
+
+    async def arun(self, tool: str, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Awaitable ``run``; pooled calls do not block the event loop"""
+        future = self.submit(tool, function, *args, **kwargs)
+        remaining = remaining_time()
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), None if remaining is None else max(remaining, 0)
+            )
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise DeadlineExceededError(
+                message=f"Tool {tool} did not finish before the request deadline",
+                details={"tool": tool}
+            )
+
+    @staticmethod
+    def _free(blocks: List[SharedMemory]) -> None:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    def _record(
+        self,
+        tool: str,
+        mode: str,
+        queued: float,
+        executed: float,
+        error: bool = False,
+        shared_bytes: int = 0
+    ) -> None:
+        with self._lock:
+            counts = self._counts[tool]
+            counts[mode] += 1
+            if error:
+                counts["errors"] += 1
+                return
+            counts["shared_bytes"] += shared_bytes
+            timings = self._timings[tool]
+            timings["queue"].append(max(queued, 0.0))
+            timings["exec"].append(executed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Call counts and queue/exec time percentiles per tool"""
+        with self._lock:
+            tools = {}
+            for tool, counts in self._counts.items():
+                queue = np.array(self._timings[tool]["queue"]) * 1000
+                executed = np.array(self._timings[tool]["exec"]) * 1000
+                tools[tool] = {
+                    **counts,
+                    "p50_queue_ms": round(float(np.percentile(queue, 50)), 1) if len(queue) else 0.0,
+                    "p95_queue_ms": round(float(np.percentile(queue, 95)), 1) if len(queue) else 0.0,
+                    "p50_exec_ms": round(float(np.percentile(executed, 50)), 1) if len(executed) else 0.0,
+                    "p95_exec_ms": round(float(np.percentile(executed, 95)), 1) if len(executed) else 0.0
+                }
+            return {
+                "workers": self.workers,
+                "inline_bytes": self.inline_bytes,
+                "pool_started": self._pool is not None,
+                "shared_arrays": len(self._shared),
+                "tools": tools
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            shared, self._shared = self._shared, {}
+        if pool is not None:
+            pool.shutdown(wait=wait)
+        for block, _ in shared.values():
+            block.unlink()
+            try:
+                block.close()
+            except BufferError:
+                pass
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """Process-wide executor configured from ``Settings``"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ToolExecutor()
+        return _executor
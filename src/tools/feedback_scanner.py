@@ -0,0 +1,160 @@
+# src/tools/feedback_scanner.py
+from typing import Dict, List, Optional, Iterable, Sequence
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import re
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_LEXICON = {
+    "positive": ["great", "excellent", "good", "satisfied", "helpful"],
+    "negative": ["poor", "bad", "slow", "unhappy", "dissatisfied"]
+}
+
+NEGATION_WORDS = ["not", "no", "never", "hardly", "without", "nothing"]
+
+# A negated term counts towards the opposite polarity
+NEGATION_FLIP = {"positive": "negative", "negative": "positive"}
+
+# Below this many comments, parallel scanning is not worth the process startup
+PARALLEL_THRESHOLD = 20000
+
+
+class FeedbackScanner:
+    """Compiled multi-pattern matcher for free-text patient feedback.
+
+    All lexicon terms, negation cues and clause breaks are folded into one
+    case-insensitive alternation regex with word boundaries, so each comment
+    is scanned once regardless of lexicon size. A term preceded by a negation
+    cue within ``negation_window`` words of the same clause is negated
+    ("not helpful" counts as a negative theme).
+    """
+
+    def __init__(
+        self,
+        lexicon: Optional[Dict[str, Sequence[str]]] = None,
+        negation_words: Optional[Sequence[str]] = None,
+        negation_window: int = 3
+    ):
+        self.lexicon = {
+            category: [term.lower() for term in terms]
+            for category, terms in (lexicon or DEFAULT_LEXICON).items()
+        }
+        self.negation_window = negation_window
+        self._categories = {
+            term: category
+            for category, terms in self.lexicon.items()
+            for term in terms
+        }
+
+        def alternation(words: Iterable[str]) -> str:
+            # Longest first so multi-word phrases win over their prefixes
+            ordered = sorted(set(words), key=len, reverse=True)
+            return "|".join(re.escape(word).replace(r"\ ", r"\s+") for word in ordered)
+
+        negations = negation_words if negation_words is not None else NEGATION_WORDS
+        negation_pattern = r"\b\w+n't\b"
+        if negations:
+            negation_pattern = rf"\b(?:{alternation(negations)})\b|" + negation_pattern
+
+        self._pattern = re.compile(
+            rf"(?P<negation>{negation_pattern})"
+            rf"|(?P<term>\b(?:{alternation(self._categories)})\b)"
+            r"|(?P<stop>[.,!?;]|\bbut\b)",
+            re.IGNORECASE
+        )
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "FeedbackScanner":
+        """Build a scanner from a JSON lexicon file ({category: [terms]})"""
+        with open(path) as f:
+            return cls(lexicon=json.load(f), **kwargs)
+
+    def scan(self, comment: str) -> Dict[str, Counter]:
+        """Theme counts for a single comment"""
+        themes: Dict[str, Counter] = {category: Counter() for category in self.lexicon}
+        themes["negated"] = Counter()
+        negation_end = None
+
+        for match in self._pattern.finditer(comment):
+            kind = match.lastgroup
+            if kind == "negation":
+                negation_end = match.end()
+            elif kind == "stop":
+                negation_end = None
+            else:
+                term = re.sub(r"\s+", " ", match.group().lower())
+                category = self._categories[term]
+                if negation_end is not None and \
+                        len(comment[negation_end:match.start()].split()) < self.negation_window:
+                    themes["negated"][term] += 1
+                    flipped = NEGATION_FLIP.get(category)
+                    if flipped in themes:
+                        themes[flipped][f"not {term}"] += 1
+                else:
+                    themes[category][term] += 1
+
+        return themes
+
+    def analyze(self, comments: Iterable[str]) -> Dict:
+        """Aggregate theme counts over a corpus of comments"""
+        totals: Dict[str, Counter] = {category: Counter() for category in self.lexicon}
+        totals["negated"] = Counter()
+        scanned = 0
+        with_negative = 0
+
+        for comment in comments:
+            scanned += 1
+            themes = self.scan(comment)
+            if themes.get("negative"):
+                with_negative += 1
+            for category, counts in themes.items():
+                totals[category].update(counts)
+
+        return {
+            "themes": {category: dict(counts) for category, counts in totals.items()},
+            "comments_scanned": scanned,
+            "comments_with_negative": with_negative
+        }
+
+    def analyze_parallel(
+        self,
+        comments: Sequence[str],
+        workers: Optional[int] = None,
+        chunk_size: int = 5000
+    ) -> Dict:
+        """Analyze a large corpus in parallel chunks and merge the counts"""
+        try:
+            workers = workers or os.cpu_count() or 1
+            if workers == 1 or len(comments) < PARALLEL_THRESHOLD:
+                return self.analyze(comments)
+
+            chunks = [comments[i:i + chunk_size] for i in range(0, len(comments), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return merge_feedback_results(executor.map(self.analyze, chunks))
+
+        except Exception as e:
+            logger.error(f"Error analyzing feedback corpus: {str(e)}")
+            raise
+
+
+def merge_feedback_results(results: Iterable[Dict]) -> Dict:
+    """Merge theme counts produced by ``FeedbackScanner.analyze`` on chunks"""
+    themes: Dict[str, Counter] = {}
+    scanned = 0
+    with_negative = 0
+
+    for result in results:
+        scanned += result["comments_scanned"]
+        with_negative += result["comments_with_negative"]
+        for category, counts in result["themes"].items():
+            themes.setdefault(category, Counter()).update(counts)
+
+    return {
+        "themes": {category: dict(counts) for category, counts in themes.items()},
+        "comments_scanned": scanned,
+        "comments_with_negative": with_negative
+    }
@@ -3,12 +3,44 @@
 from typing_extensions import TypedDict  # If using TypedDict
 from typing import Dict, List, Optional
 from langchain_core.tools import tool
-from datetime import datetime
+from datetime import datetime, timedelta
 from ..utils.logger import setup_logger
 from ..models.state import Department
 
 logger = setup_logger(__name__)
 
+# Base priority scores by patient condition
+CONDITION_SCORES = {
+    "critical": 10,
+    "urgent": 8,
+    "moderate": 5,
+    "routine": 3
+}
+DEFAULT_CONDITION_SCORE = 3
+
+# Wait time contributes one point per 30 minutes, capped at 2
+WAIT_FACTOR_MINUTES = 30
+MAX_WAIT_FACTOR = 2
+
+# Department load above this threshold is subtracted from the score
+LOAD_PENALTY_THRESHOLD = 0.8
+
+# Average length of stay (in days) by condition
+LOS_BY_CONDITION = {
+    "routine": 3,
+    "acute": 5,
+    "critical": 7,
+    "emergency": 2
+}
+DEFAULT_LOS_DAYS = 4
+ICU_LOS_MULTIPLIER = 1.5
+
+
+def priority_level_for_score(score: float) -> str:
+    """Map a numeric admission priority score to its priority label"""
+    return "High" if score > 7 else "Medium" if score > 4 else "Low"
+
+
 class PatientTools:
     @tool
     def calculate_wait_time(
@@ -70,20 +102,12 @@ class PatientTools:
     ) -> datetime:
         """Predict expected discharge time based on condition and department"""
         try:
-            # Average length of stay (in days) by condition
-            LOS_BY_CONDITION = {
-                "routine": 3,
-                "acute": 5,
-                "critical": 7,
-                "emergency": 2
-            }
-            
             # Get base length of stay
-            base_los = LOS_BY_CONDITION.get(condition_type.lower(), 4)
+            base_los = LOS_BY_CONDITION.get(condition_type.lower(), DEFAULT_LOS_DAYS)
             
             # Adjust based on department
             if department.lower() == "icu":
-                base_los *= 1.5
+                base_los *= ICU_LOS_MULTIPLIER
             
             # Calculate expected discharge date
             discharge_date = admission_date + timedelta(days=base_los)
@@ -141,24 +165,18 @@ class PatientTools:
     ) -> Dict:
         """Assess admission priority based on multiple factors"""
         try:
-            # Base priority scores
-            CONDITION_SCORES = {
-                "critical": 10,
-                "urgent": 8,
-                "moderate": 5,
-                "routine": 3
-            }
-            
             # Calculate priority score
-            base_score = CONDITION_SCORES.get(patient_condition.lower(), 3)
-            wait_factor = min(wait_time / 30, 2)  # Cap wait time factor at 2
-            load_penalty = department_load if department_load > 0.8 else 0
+            base_score = CONDITION_SCORES.get(
+                patient_condition.lower(), DEFAULT_CONDITION_SCORE
+            )
+            wait_factor = min(wait_time / WAIT_FACTOR_MINUTES, MAX_WAIT_FACTOR)
+            load_penalty = department_load if department_load > LOAD_PENALTY_THRESHOLD else 0
             
             final_score = base_score + wait_factor - load_penalty
             
             return {
                 "priority_score": round(final_score, 2),
-                "priority_level": "High" if final_score > 7 else "Medium" if final_score > 4 else "Low",
+                "priority_level": priority_level_for_score(final_score),
                 "factors": {
                     "condition_score": base_score,
                     "wait_factor": round(wait_factor, 2),
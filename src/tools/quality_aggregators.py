@@ -0,0 +1,338 @@
+# src/tools/quality_aggregators.py
+from typing import Dict, List, Optional, Any, Callable, Iterable, Iterator, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import csv
+import json
+import os
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TRUE_VALUES = {"true", "1", "yes", "y", "t"}
+
+RISK_RECOMMENDATIONS = ["Immediate action required", "Staff training needed"]
+
+# Success rate deviation from benchmark that marks a critical deviation or
+# a success area
+CRITICAL_DEVIATION = -0.1
+SUCCESS_MARGIN = 0.05
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_VALUES
+    return bool(value)
+
+
+def _indicator(value: Any) -> float:
+    """Numeric value of an outcome flag (bool, 0/1, fraction or CSV text)"""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return float(_parse_bool(value))
+    return float(value or 0)
+
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported record file format: {extension}")
+
+
+def _read_csv_header(path: str) -> Tuple[List[str], int]:
+    """Return CSV column names and the byte offset of the first record"""
+    with open(path, "rb") as f:
+        header = f.readline()
+        return next(csv.reader([header.decode("utf-8")])), f.tell()
+
+
+def iter_records(path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Dict]:
+    """Stream records from a JSONL or CSV file.
+
+    ``start``/``end`` restrict reading to the lines beginning inside that
+    byte range, so a file can be split across workers. Records must be one
+    per line (no embedded newlines in CSV fields).
+    """
+    file_format = _file_format(path)
+    header: List[str] = []
+    if file_format == "csv":
+        header, data_start = _read_csv_header(path)
+        start = max(start, data_start)
+
+    with open(path, "rb") as f:
+        if start > 0:
+            # Skip the line that straddles the range start; the previous
+            # range owns it
+            f.seek(start - 1)
+            f.readline()
+
+        while end is None or f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            text = line.decode("utf-8").strip()
+            if not text:
+                continue
+            if file_format == "jsonl":
+                yield json.loads(text)
+            else:
+                yield dict(zip(header, next(csv.reader([text]))))
+
+
+def _file_ranges(path: str, chunks: int) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    step = max(size // max(chunks, 1), 1)
+    return [(offset, min(offset + step, size)) for offset in range(0, size, step)]
+
+
+def _aggregate_range(factory: Callable, path: str, start: int, end: int):
+    aggregator = factory()
+    aggregator.update(iter_records(path, start, end))
+    return aggregator
+
+
+def aggregate_file(path: str, factory: Callable, workers: Optional[int] = None):
+    """Aggregate a record file in parallel byte-range chunks and merge the parts.
+
+    ``factory`` builds an empty aggregator and must be picklable (a class or
+    ``functools.partial``). ``workers=1`` streams the file in-process.
+    """
+    try:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            return _aggregate_range(factory, path, 0, None)
+
+        result = factory()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_aggregate_range, factory, path, start, end)
+                for start, end in _file_ranges(path, workers)
+            ]
+            for future in futures:
+                result.merge(future.result())
+        return result
+
+    except Exception as e:
+        logger.error(f"Error aggregating record file {path}: {str(e)}")
+        raise
+
+
+class ComplianceAggregator:
+    """Incremental, mergeable version of ``QualityTools.track_compliance_metrics``.
+
+    State is O(number of standards): violations and risk areas are counted
+    per standard instead of being appended per failed check.
+    """
+
+    def __init__(self, audit_period: str = ""):
+        self.audit_period = audit_period
+        self.total_checks = 0
+        self.passed_checks = 0
+        self.violations: Dict[str, Dict] = {}
+        self.risk_areas: Dict[str, int] = {}
+
+    def add(self, check: Dict) -> None:
+        """Consume a single compliance check"""
+        standard = check["standard"]
+        severity = check["severity"]
+        self.total_checks += 1
+
+        if _parse_bool(check["compliant"]):
+            self.passed_checks += 1
+        else:
+            date = check.get("date")
+            violation = self.violations.get(standard)
+            if violation is None:
+                violation = self.violations[standard] = {
+                    "count": 0,
+                    "severity_counts": {},
+                    "first_date": date,
+                    "last_date": date
+                }
+            violation["count"] += 1
+            violation["severity_counts"][severity] = \
+                violation["severity_counts"].get(severity, 0) + 1
+            self._extend_dates(violation, date, date)
+
+        # Identify risk areas
+        if severity == "high" or _parse_bool(check.get("repeat_violation", False)):
+            self.risk_areas[standard] = self.risk_areas.get(standard, 0) + 1
+
+    def update(self, checks: Iterable[Dict]) -> "ComplianceAggregator":
+        """Consume checks from any iterable (list, generator, file stream)"""
+        for check in checks:
+            self.add(check)
+        return self
+
+    def merge(self, other: "ComplianceAggregator") -> "ComplianceAggregator":
+        """Fold another partial aggregate into this one"""
+        self.total_checks += other.total_checks
+        self.passed_checks += other.passed_checks
+
+        for standard, theirs in other.violations.items():
+            ours = self.violations.get(standard)
+            if ours is None:
+                self.violations[standard] = {
+                    **theirs,
+                    "severity_counts": dict(theirs["severity_counts"])
+                }
+                continue
+            ours["count"] += theirs["count"]
+            for severity, count in theirs["severity_counts"].items():
+                ours["severity_counts"][severity] = \
+                    ours["severity_counts"].get(severity, 0) + count
+            self._extend_dates(ours, theirs["first_date"], theirs["last_date"])
+
+        for standard, count in other.risk_areas.items():
+            self.risk_areas[standard] = self.risk_areas.get(standard, 0) + count
+
+        return self
+
+    def summary(self) -> Dict:
+        """Build the compliance summary"""
+        failed_checks = self.total_checks - self.passed_checks
+        return {
+            "compliance_rate": (self.passed_checks / self.total_checks * 100
+                                if self.total_checks > 0 else 0),
+            "violations": [
+                {"standard": standard, **violation}
+                for standard, violation in sorted(
+                    self.violations.items(), key=lambda item: (-item[1]["count"], item[0])
+                )
+            ],
+            "risk_areas": [
+                {
+                    "area": standard,
+                    "risk_level": "high",
+                    "occurrences": count,
+                    "recommendations": list(RISK_RECOMMENDATIONS)
+                }
+                for standard, count in sorted(
+                    self.risk_areas.items(), key=lambda item: (-item[1], item[0])
+                )
+            ],
+            "audit_summary": {
+                "period": self.audit_period,
+                "total_checks": self.total_checks,
+                "passed_checks": self.passed_checks,
+                "failed_checks": failed_checks
+            }
+        }
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        audit_period: str = "",
+        workers: Optional[int] = None
+    ) -> "ComplianceAggregator":
+        """Aggregate a JSONL/CSV audit file using all available cores"""
+        return aggregate_file(path, partial(cls, audit_period=audit_period), workers)
+
+    @staticmethod
+    def _extend_dates(violation: Dict, first: Any, last: Any) -> None:
+        # ISO-8601 strings and datetimes both order correctly as strings
+        if first is not None and (violation["first_date"] is None
+                                  or str(first) < str(violation["first_date"])):
+            violation["first_date"] = first
+        if last is not None and (violation["last_date"] is None
+                                 or str(last) > str(violation["last_date"])):
+            violation["last_date"] = last
+
+
+class OutcomesAggregator:
+    """Single-pass, mergeable clinical outcomes aggregation.
+
+    Keeps integer success/complication/readmission counters per category;
+    rates and the benchmark comparison are computed once in ``summary``.
+    """
+
+    def __init__(self):
+        self.categories: Dict[str, Dict[str, int]] = {}
+
+    def add(self, outcome: Dict) -> None:
+        """Consume a single outcome record"""
+        counters = self.categories.get(outcome["category"])
+        if counters is None:
+            counters = self.categories[outcome["category"]] = {
+                "total_cases": 0,
+                "successes": 0,
+                "complications": 0,
+                "readmissions": 0
+            }
+        counters["total_cases"] += 1
+        counters["successes"] += _indicator(outcome.get("success", 0))
+        counters["complications"] += _indicator(outcome.get("complication", 0))
+        counters["readmissions"] += _indicator(outcome.get("readmission", 0))
+
+    def update(self, outcomes: Iterable[Dict]) -> "OutcomesAggregator":
+        """Consume outcome records from any iterable"""
+        for outcome in outcomes:
+            self.add(outcome)
+        return self
+
+    def merge(self, other: "OutcomesAggregator") -> "OutcomesAggregator":
+        """Fold another partial aggregate into this one"""
+        for category, theirs in other.categories.items():
+            ours = self.categories.setdefault(category, dict.fromkeys(theirs, 0))
+            for counter, value in theirs.items():
+                ours[counter] += value
+        return self
+
+    def summary(self, benchmark_metrics: Optional[Dict[str, float]] = None) -> Dict:
+        """Build outcome rates and compare success rates against benchmarks"""
+        benchmark_metrics = benchmark_metrics or {}
+        analysis = {
+            "outcome_metrics": {},
+            "benchmark_comparison": {},
+            "critical_deviations": [],
+            "success_areas": []
+        }
+
+        for category in sorted(self.categories):
+            counters = self.categories[category]
+            total = counters["total_cases"]
+            metrics = {
+                "success_rate": counters["successes"] / total,
+                "complication_rate": counters["complications"] / total,
+                "readmission_rate": counters["readmissions"] / total,
+                "total_cases": total
+            }
+            analysis["outcome_metrics"][category] = metrics
+
+            if category not in benchmark_metrics:
+                continue
+
+            benchmark = benchmark_metrics[category]
+            deviation = metrics["success_rate"] - benchmark
+            analysis["benchmark_comparison"][category] = {
+                "benchmark": benchmark,
+                "current_rate": metrics["success_rate"],
+                "deviation": deviation
+            }
+
+            if deviation < CRITICAL_DEVIATION:
+                analysis["critical_deviations"].append({
+                    "category": category,
+                    "deviation": deviation,
+                    "current_rate": metrics["success_rate"],
+                    "benchmark": benchmark
+                })
+            elif deviation > SUCCESS_MARGIN:
+                analysis["success_areas"].append({
+                    "category": category,
+                    "improvement": deviation,
+                    "current_rate": metrics["success_rate"]
+                })
+
+        return analysis
+
+    @classmethod
+    def from_file(cls, path: str, workers: Optional[int] = None) -> "OutcomesAggregator":
+        """Aggregate a JSONL/CSV outcomes file using all available cores"""
+        return aggregate_file(path, cls, workers)
@@ -0,0 +1,203 @@
+# src/tools/resource_allocation.py
+from typing import Dict, List, Optional, Any
+import numpy as np
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ALLOCATION_MODES = ("proportional", "lp")
+
+
+def largest_remainder(shares: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """Round each column of ``shares`` to integers that sum to ``totals``.
+
+    Every cell is floored, then the units lost to truncation go to the cells
+    with the largest fractional parts (ties go to the earlier row).
+    """
+    floors = np.floor(shares)
+    deficit = (totals - floors.sum(axis=0)).astype(np.int64)
+
+    order = np.argsort(-(shares - floors), axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    rows = np.broadcast_to(np.arange(shares.shape[0])[:, None], shares.shape)
+    np.put_along_axis(ranks, order, rows, axis=0)
+
+    return (floors + (ranks < deficit[None, :])).astype(np.int64)
+
+
+class ResourceAllocator:
+    """Allocate every resource across every department in one matrix pass.
+
+    Minimum guarantees are served first (scaled down when a resource cannot
+    cover all of them), then the remainder is shared in proportion to unmet
+    demand and never beyond it. Demand cells marked as uncapped are relative
+    weights rather than unit counts: once capped demand is met, those
+    departments share everything left in proportion to their weight.
+    Fractional shares are rounded with the largest-remainder method, so no
+    units are lost to truncation.
+
+    ``mode="lp"`` maximizes total priority-weighted allocation. With only
+    per-resource capacity and per-cell bounds the LP decomposes into one
+    fractional knapsack per resource, which is solved exactly by filling
+    departments in descending priority (proportionally within a priority
+    level) without an external solver.
+    """
+
+    def __init__(self, mode: str = "proportional"):
+        if mode not in ALLOCATION_MODES:
+            raise ValueError(f"Unknown allocation mode: {mode}")
+        self.mode = mode
+
+    def allocate_matrix(
+        self,
+        demand: np.ndarray,
+        available: np.ndarray,
+        minimum: Optional[np.ndarray] = None,
+        priority: Optional[np.ndarray] = None,
+        mode: Optional[str] = None,
+        capped: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Integer allocation matrix (departments x resources).
+
+        ``capped`` (boolean, broadcast to ``demand``) marks demand that is a
+        unit count; other cells are weights with no ceiling. All demand is
+        capped by default.
+        """
+        mode = mode or self.mode
+        if mode not in ALLOCATION_MODES:
+            raise ValueError(f"Unknown allocation mode: {mode}")
+
+        demand = np.maximum(np.asarray(demand, dtype=np.float64), 0.0)
+        available = np.asarray(available, dtype=np.int64)
+        minimum = (np.zeros_like(demand) if minimum is None
+                   else np.maximum(np.asarray(minimum, dtype=np.float64), 0.0))
+        n_departments, n_resources = demand.shape
+
+        # Minimum guarantees, scaled down where they exceed availability
+        minimum_total = minimum.sum(axis=0)
+        short = minimum_total > available
+        base = np.floor(minimum).astype(np.int64)
+        if short.any():
+            scaled = minimum[:, short] * (available[short] / minimum_total[short])
+            base[:, short] = largest_remainder(scaled, available[short])
+
+        remaining = available - base.sum(axis=0)
+        residual = np.maximum(demand - base, 0.0)
+        allocation = base
+
+        if mode == "lp" and priority is not None:
+            priority = np.asarray(priority, dtype=np.float64)
+            levels = [priority == level for level in np.unique(priority)[::-1]]
+        else:
+            levels = [np.ones(n_departments, dtype=bool)]
+
+        for rows in levels:
+            if not remaining.any():
+                break
+            extra = self._fill(residual[rows], remaining)
+            allocation[rows] += extra
+            remaining = remaining - extra.sum(axis=0)
+
+        if capped is not None:
+            # Weight-only demand has no ceiling: it absorbs what is left
+            weights = np.where(np.broadcast_to(capped, demand.shape), 0.0, demand)
+            for rows in levels:
+                if not remaining.any():
+                    break
+                extra = self._share(weights[rows], remaining)
+                allocation[rows] += extra
+                remaining = remaining - extra.sum(axis=0)
+
+        return allocation
+
+    @staticmethod
+    def _share(weights: np.ndarray, remaining: np.ndarray) -> np.ndarray:
+        """Share all ``remaining`` units per column proportionally to ``weights``"""
+        weight_total = weights.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = np.where(weight_total > 0, weights * (remaining / weight_total), 0.0)
+        return largest_remainder(shares, np.where(weight_total > 0, remaining, 0))
+
+    @staticmethod
+    def _fill(residual: np.ndarray, remaining: np.ndarray) -> np.ndarray:
+        """Share ``remaining`` units per column proportionally to ``residual``"""
+        residual_total = residual.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quota = np.where(
+                residual_total > 0,
+                residual * (remaining / residual_total),
+                0.0
+            )
+        shares = np.where(remaining >= residual_total, residual, quota)
+        totals = np.floor(np.minimum(remaining, residual_total) + 1e-9)
+        return largest_remainder(shares, totals)
+
+    def allocate(
+        self,
+        department_demands: Dict[str, Dict],
+        available_resources: Dict[str, int],
+        mode: Optional[str] = None
+    ) -> Dict:
+        """Allocate resources from the ``optimize_resource_allocation`` input format.
+
+        A single-number ``demand`` is the department's relative weight for
+        every resource, so each resource is shared out in full in proportion
+        to it. A {resource: units} mapping is the number of units needed;
+        allocation stops there and any excess is reported as surplus in
+        ``resource_sharing``. ``minimum`` is a unit count, given either way;
+        ``priority`` weights the department in LP mode.
+        """
+        try:
+            departments = list(department_demands)
+            resources = list(available_resources)
+
+            def matrix(field: str) -> np.ndarray:
+                values = np.zeros((len(departments), len(resources)))
+                for i, dept in enumerate(departments):
+                    value = department_demands[dept].get(field, 0)
+                    if isinstance(value, dict):
+                        values[i] = [value.get(resource, 0) for resource in resources]
+                    else:
+                        values[i] = value
+                return values
+
+            demand = matrix("demand")
+            minimum = matrix("minimum")
+            capped = np.array([
+                isinstance(department_demands[dept].get("demand"), dict) for dept in departments
+            ])[:, None]
+            priority = np.array([
+                department_demands[dept].get("priority", 1.0) for dept in departments
+            ], dtype=np.float64)
+            available = np.array([available_resources[r] for r in resources], dtype=np.int64)
+
+            allocated = self.allocate_matrix(demand, available, minimum, priority, mode, capped)
+
+            allocation = {
+                "recommended_distribution": {
+                    dept: dict(zip(resources, allocated[i].tolist()))
+                    for i, dept in enumerate(departments)
+                },
+                "unmet_demands": [],
+                "resource_sharing": []
+            }
+
+            for i, j in zip(*np.nonzero(allocated < minimum)):
+                allocation["unmet_demands"].append({
+                    "department": departments[i],
+                    "resource": resources[j],
+                    "shortfall": float(minimum[i, j] - allocated[i, j])
+                })
+
+            surplus = available - allocated.sum(axis=0)
+            for j in np.nonzero(surplus > 0)[0]:
+                allocation["resource_sharing"].append({
+                    "resource": resources[j],
+                    "surplus": int(surplus[j])
+                })
+
+            return allocation
+
+        except Exception as e:
+            logger.error(f"Error allocating resources: {str(e)}")
+            raise
@@ -4,18 +4,62 @@ from typing import Dict, List, Optional, Any
 from typing_extensions import TypedDict  # If using TypedDict
 from langchain_core.tools import tool
 from ..utils.logger import setup_logger
+from .resource_allocation import ResourceAllocator
+from .supply_forecast import SupplyForecaster
 
 logger = setup_logger(__name__)
 
+_ALLOCATOR = ResourceAllocator()
+_FORECASTER = SupplyForecaster()
+
+# Lead time assumed when none is given; matches the two-day critical cutoff
+DEFAULT_LEAD_TIME_DAYS = 2.0
+
+
+def _forecast_supplies(
+    current_inventory: Dict[str, float],
+    consumption_history: Dict[str, List[float]],
+    lead_time_days: Dict[str, float]
+) -> Dict[str, Dict]:
+    """Forecaster recommendation per item, or None when no reorder is needed.
+
+    Items are batched by history length so each group is one vectorized
+    forecast call.
+    """
+    groups: Dict[int, List[str]] = {}
+    for item, history in consumption_history.items():
+        if item in current_inventory and len(history) > 0:
+            groups.setdefault(len(history), []).append(item)
+
+    results = {}
+    for items in groups.values():
+        forecast = _FORECASTER.forecast(
+            [consumption_history[item] for item in items],
+            [current_inventory[item] for item in items],
+            [lead_time_days.get(item, DEFAULT_LEAD_TIME_DAYS) for item in items]
+        )
+        results.update(dict.fromkeys(items))
+        for recommendation in _FORECASTER.recommendations(forecast, items):
+            results[recommendation["item"]] = recommendation
+    return results
+
+
 class ResourceTools:
     @tool
     def analyze_supply_levels(
         self,
         current_inventory: Dict[str, float],
         consumption_rate: Dict[str, float],
-        reorder_thresholds: Dict[str, float]
+        reorder_thresholds: Dict[str, float],
+        consumption_history: Optional[Dict[str, List[float]]] = None,
+        lead_time_days: Optional[Dict[str, float]] = None
     ) -> Dict:
-        """Analyze supply levels and generate reorder recommendations"""
+        """Analyze supply levels and generate reorder recommendations.
+
+        Items with daily consumption history are forecast with trend and
+        variability and a lead-time aware reorder point; the others fall back
+        to level / consumption rate against the reorder threshold.
+        """
         try:
             analysis = {
                 "critical_items": [],
@@ -24,7 +68,25 @@ class ResourceTools:
                 "recommendations": []
             }
             
+            forecasts = _forecast_supplies(
+                current_inventory, consumption_history or {}, lead_time_days or {}
+            )
+            for item, recommendation in forecasts.items():
+                if recommendation is None:
+                    analysis["adequate_supplies"].append(item)
+                    continue
+                bucket = ("critical_items" if recommendation["priority"] == "critical"
+                          else "reorder_needed")
+                analysis[bucket].append({
+                    "item": item,
+                    "current_level": current_inventory[item],
+                    "days_remaining": recommendation["days_remaining"]
+                })
+                analysis["recommendations"].append(recommendation)
+            
             for item, level in current_inventory.items():
+                if item in forecasts:
+                    continue
                 threshold = reorder_thresholds.get(item, 0.2)
                 consumption = consumption_rate.get(item, 0)
                 
@@ -99,31 +161,9 @@ class ResourceTools:
     ) -> Dict:
         """Optimize resource allocation across departments"""
         try:
-            allocation = {
-                "recommended_distribution": {},
-                "unmet_demands": [],
-                "resource_sharing": []
-            }
-            
-            total_demand = sum(dept["demand"] for dept in department_demands.values())
-            
-            for dept, demand in department_demands.items():
-                # Calculate fair share based on demand
-                for resource, available in available_resources.items():
-                    dept_share = int((demand["demand"] / total_demand) * available)
-                    
-                    allocation["recommended_distribution"][dept] = {
-                        resource: dept_share
-                    }
-                    
-                    if dept_share < demand.get("minimum", 0):
-                        allocation["unmet_demands"].append({
-                            "department": dept,
-                            "resource": resource,
-                            "shortfall": demand["minimum"] - dept_share
-                        })
-            
-            return allocation
+            # Matrix allocation over all departments and resources with
+            # largest-remainder rounding and minimum guarantees
+            return _ALLOCATOR.allocate(department_demands, available_resources)
             
         except Exception as e:
             logger.error(f"Error optimizing resource allocation: {str(e)}")
@@ -1,6 +1,10 @@
 # src/utils/error_handlers.py
 from typing import Dict, Any, Optional, Callable
 from functools import wraps
+import asyncio
+import random
+import threading
+import time
 import traceback
 from .logger import setup_logger
 
@@ -31,6 +35,267 @@ class ResourceError(HealthcareError):
     """Raised when resource-related operations fail"""
     pass
 
+class RateLimitError(HealthcareError):
+    """Raised when a model call is shed or times out waiting for rate limits"""
+    def __init__(self, message: str, details: Optional[Dict] = None):
+        super().__init__(
+            message=message,
+            error_code="RATE_LIMITED",
+            details=details
+        )
+
+class CircuitOpenError(HealthcareError):
+    """Raised without calling the backend while its circuit breaker is open"""
+    def __init__(self, message: str, details: Optional[Dict] = None):
+        super().__init__(
+            message=message,
+            error_code="CIRCUIT_OPEN",
+            details=details
+        )
+
+class DeadlineExceededError(HealthcareError):
+    """Raised when a request runs out of its time budget"""
+    def __init__(self, message: str, details: Optional[Dict] = None):
+        super().__init__(
+            message=message,
+            error_code="DEADLINE_EXCEEDED",
+            details=details
+        )
+
+# HTTP statuses worth retrying: timeouts, conflicts, throttling, server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "ReadTimeout", "ConnectTimeout"}
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a failed call may succeed if repeated.
+
+    Our own ``HealthcareError``s (validation, shedding, open circuits) are
+    final; timeouts, connection errors, 429s and 5xx responses are not.
+    """
+    if isinstance(error, HealthcareError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by deadline and budget.
+
+    Attempt ``n`` sleeps a uniform random time in ``[0, min(max_delay,
+    base_delay * 2**n)]`` so clients that failed together do not retry in
+    lockstep. A retry is skipped when its sleep would end past the caller's
+    ``deadline`` (a ``time.monotonic`` timestamp). The retry budget earns
+    ``budget_ratio`` retries per call, up to ``budget_burst``, so during an
+    outage retries add at most that fraction of extra load.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        budget_ratio: float = 0.2,
+        budget_burst: float = 10.0,
+        retryable: Callable[[BaseException], bool] = is_transient_error,
+        rng: Optional[random.Random] = None
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.retryable = retryable
+        self.random = rng or random.Random()
+        self._budget = budget_burst
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "failures": 0,
+            "budget_exhausted": 0,
+            "deadline_exceeded": 0
+        }
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (0-based)"""
+        return self.random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _start(self) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._budget = min(self.budget_burst, self._budget + self.budget_ratio)
+
+    def _next_delay(self, attempt: int, error: BaseException, deadline: Optional[float]) -> Optional[float]:
+        """Delay before the next attempt, or None to give up"""
+        if attempt + 1 >= self.max_attempts or not self.retryable(error):
+            return None
+        delay = self.backoff(attempt)
+        with self._lock:
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                self._stats["deadline_exceeded"] += 1
+                return None
+            if self._budget < 1:
+                self._stats["budget_exhausted"] += 1
+                return None
+            self._budget -= 1
+            self._stats["retries"] += 1
+        logger.warning(
+            f"Operation failed (attempt {attempt + 1}/{self.max_attempts}), "
+            f"retrying in {delay:.2f}s: {str(error)}"
+        )
+        return delay
+
+    def _fail(self) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+
+    def call(self, operation: Callable[[], Any], deadline: Optional[float] = None) -> Any:
+        self._start()
+        attempt = 0
+        while True:
+            try:
+                return operation()
+            except Exception as e:
+                delay = self._next_delay(attempt, e, deadline)
+                if delay is None:
+                    self._fail()
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, operation: Callable[[], Any], deadline: Optional[float] = None) -> Any:
+        """Like ``call`` for a coroutine function; backoff does not block the loop"""
+        self._start()
+        attempt = 0
+        while True:
+            try:
+                return await operation()
+            except Exception as e:
+                delay = self._next_delay(attempt, e, deadline)
+                if delay is None:
+                    self._fail()
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "budget_available": round(self._budget, 2)}
+
+
+class CircuitBreaker:
+    """Stops calling a failing backend and probes it before recovering.
+
+    ``closed`` -> ``open`` after ``failure_threshold`` consecutive transient
+    failures; calls are then rejected with ``CircuitOpenError``. After
+    ``recovery_timeout`` seconds the breaker is ``half_open`` and lets up to
+    ``half_open_max`` probe calls through: a success closes it, a failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max: int = 1,
+        counts_as_failure: Callable[[BaseException], bool] = is_transient_error,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max = half_open_max
+        self.counts_as_failure = counts_as_failure
+        self.clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "rejected": 0, "successes": 0, "failures": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _open(self) -> None:
+        if self._state != self.OPEN:
+            self._stats["opened"] += 1
+            logger.warning(f"Circuit {self.name} opened after {self._failures} failures")
+        self._state = self.OPEN
+        self._opened_at = self.clock()
+
+    def allow(self) -> None:
+        """Reserve a call slot or raise ``CircuitOpenError``"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return
+            self._stats["rejected"] += 1
+            retry_in = max(0.0, self.recovery_timeout - (self.clock() - self._opened_at))
+            raise CircuitOpenError(
+                message=f"Circuit {self.name} is open",
+                details={"circuit": self.name, "retry_in": round(retry_in, 2)}
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats["successes"] += 1
+            if self._state == self.HALF_OPEN:
+                logger.info(f"Circuit {self.name} closed after successful probe")
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+            if not self.counts_as_failure(error):
+                return
+            self._stats["failures"] += 1
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def call(self, operation: Callable[[], Any]) -> Any:
+        self.allow()
+        try:
+            result = operation()
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                **self._stats
+            }
+
+
 class ErrorHandler:
     @staticmethod
     def validate_input(input_text: str) -> None:
@@ -87,21 +352,30 @@ class ErrorHandler:
         retry_delay: float = 1.0
     ) -> Any:
         """
-        Retry an operation with exponential backoff
+        Retry an operation with jittered exponential backoff
         """
-        from time import sleep
-        
-        for attempt in range(max_retries):
-            try:
-                return operation()
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                
-                logger.warning(
-                    f"Operation failed (attempt {attempt + 1}/{max_retries}): {str(e)}"
-                )
-                sleep(retry_delay * (2 ** attempt))
+        policy = RetryPolicy(
+            max_attempts=max_retries,
+            base_delay=retry_delay,
+            retryable=lambda error: not isinstance(error, ValidationError)
+        )
+        return policy.call(operation)
+
+    @staticmethod
+    async def retry_operation_async(
+        operation: Callable,
+        max_retries: int = 3,
+        retry_delay: float = 1.0
+    ) -> Any:
+        """
+        Retry a coroutine function without blocking the event loop
+        """
+        policy = RetryPolicy(
+            max_attempts=max_retries,
+            base_delay=retry_delay,
+            retryable=lambda error: not isinstance(error, ValidationError)
+        )
+        return await policy.acall(operation)
 
     @staticmethod
     def safe_execute(
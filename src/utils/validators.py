@@ -1,5 +1,6 @@
 # src/utils/validators.py
 from typing import Dict, Any, List, Optional
+from collections.abc import Mapping
 from datetime import datetime
 from .logger import setup_logger
 from .error_handlers import ValidationError
@@ -128,5 +129,5 @@ class Validator:
                         message=f"Negative value not allowed: {current_path}",
                         error_code="INVALID_NUMERIC_VALUE"
                     )
-            elif isinstance(value, dict):
+            elif isinstance(value, Mapping):
                 Validator._validate_numeric_values(value, current_path)# Input validation utilities implementation
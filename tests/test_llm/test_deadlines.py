@@ -0,0 +1,79 @@
+import time
+import pytest
+from src.agent import HealthcareAgent
+from src.config.settings import Settings
+from src.llm.context import remaining_time, request_scope
+from src.llm.fake import FakeChatBackend
+from src.llm.pool import NodeModel
+from src.utils.error_handlers import CircuitBreaker, DeadlineExceededError
+
+ANALYSIS = '{"task_type": "patient_flow", "priority": 3, "department": "ER", "context": {}}'
+FLOW = '{"findings": ["ER full"], "recommendations": ["Open overflow"], "action_items": [], "metrics_impact": {}}'
+SYNTHESIS = '{"summary": "ER is full.", "key_findings": ["ER full"], "recommendations": ["Open overflow"], "action_items": []}'
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(Settings, "OPENAI_API_KEY", "test-api-key")
+    monkeypatch.setattr(Settings, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(Settings, "SYNTHESIS_RESERVE", 0.3)
+    monkeypatch.setattr(Settings, "NODE_MIN_BUDGET", 0.1)
+    monkeypatch.setattr(Settings, "SEMANTIC_CACHE_SIZE", 0)
+    agent = HealthcareAgent()
+    backends = {
+        "input_analyzer": FakeChatBackend([ANALYSIS]),
+        "patient_flow": FakeChatBackend([FLOW]),
+        "output_synthesizer": FakeChatBackend([SYNTHESIS])
+    }
+    for name, backend in backends.items():
+        agent.nodes[name].llm.client = backend
+    agent.backends = backends
+    return agent
+
+def test_nested_scope_only_tightens_deadline():
+    """Test an inner request scope cannot extend the outer deadline"""
+    outer = time.monotonic() + 1
+    with request_scope(deadline=outer):
+        with request_scope(deadline=outer + 10):
+            assert remaining_time() <= 1
+    assert remaining_time() is None
+
+def test_model_call_gets_remaining_time_as_timeout():
+    """Test calls time out at the deadline without tripping the circuit breaker"""
+    backend = FakeChatBackend(latency=5.0)
+    breaker = CircuitBreaker("fake", failure_threshold=1)
+    model = NodeModel("patient_flow", backend, "fake", breaker=breaker)
+
+    started = time.monotonic()
+    with request_scope(deadline=started + 0.1):
+        with pytest.raises(DeadlineExceededError):
+            model.invoke("slow question")
+        with pytest.raises(DeadlineExceededError):
+            model.invoke("no time left")
+
+    assert time.monotonic() - started < 0.5
+    assert backend.calls == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_slow_specialist_is_skipped_within_deadline(agent):
+    """Test a slow specialist node times out and synthesis still answers"""
+    agent.backends["patient_flow"].latency = 5.0
+
+    started = time.monotonic()
+    response = agent.process("How full is the ER?", deadline=started + 0.8)
+
+    assert time.monotonic() - started < 1.2
+    assert response["degraded"] == ["patient_flow timed out"]
+    assert response["analysis"]["summary"] == "ER is full."
+
+def test_expired_deadline_answers_from_metrics_then_cache(agent):
+    """Test no model calls are made without time, and cached answers are reused"""
+    response = agent.process("How full is the ER?", deadline=time.monotonic() - 1)
+    assert "metrics-only synthesis" in response["degraded"]
+    assert "keyword classification" in response["degraded"]
+    assert sum(backend.calls for backend in agent.backends.values()) == 0
+
+    fresh = agent.process("How full is the ER?")
+    assert fresh["degraded"] == []
+    cached = agent.process("how full is  the ER?", deadline=time.monotonic())
+    assert cached["degraded"] == ["cached response"]
+    assert cached["response"] == fresh["response"]
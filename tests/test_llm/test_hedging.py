@@ -0,0 +1,90 @@
+import asyncio
+import random
+import time
+import numpy as np
+from src.llm.fake import FakeChatBackend
+from src.llm.hedging import HedgePolicy
+from src.llm.pool import NodeModel
+from src.llm.usage import get_usage_ledger
+
+def _warm(node, latency=0.01, samples=20):
+    ledger = get_usage_ledger()
+    for _ in range(samples):
+        ledger.record_call(node, "fake", latency)
+
+def test_hedge_delay_follows_node_latency():
+    """Test the hedge delay is the node's latency percentile once warm"""
+    policy = HedgePolicy(percentile=90, min_samples=10)
+    assert policy.delay("hedge_delay_node") is None
+    _warm("hedge_delay_node", latency=0.2, samples=9)
+    get_usage_ledger().record_call("hedge_delay_node", "fake", 1.0)
+    assert 0.2 <= policy.delay("hedge_delay_node") < 1.0
+
+def test_slow_call_is_hedged():
+    """Test a slow primary call loses to its duplicate"""
+    _warm("hedge_sync_node")
+    backend = FakeChatBackend(latency=[1.0, 0.01])
+    policy = HedgePolicy(min_samples=20)
+    model = NodeModel("hedge_sync_node", backend, "fake", hedge=policy)
+
+    started = time.monotonic()
+    model.invoke("question")
+
+    assert time.monotonic() - started < 0.5
+    assert backend.calls == 2
+    assert policy.stats()["nodes"]["hedge_sync_node"]["hedge_wins"] == 1
+
+def test_async_hedge_cancels_loser():
+    """Test the async path cancels the slower call"""
+    _warm("hedge_async_node")
+    backend = FakeChatBackend(latency=[1.0, 0.01])
+    model = NodeModel("hedge_async_node", backend, "fake", hedge=HedgePolicy())
+
+    async def run():
+        response = await model.ainvoke("question")
+        await asyncio.sleep(0.01)
+        return response
+
+    started = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - started < 0.5
+    assert backend.cancelled == 1
+
+def test_hedge_budget_caps_extra_calls():
+    """Test hedges stop once the budget is spent"""
+    _warm("hedge_budget_node", samples=500)
+    backend = FakeChatBackend(latency=0.05)
+    policy = HedgePolicy(budget_ratio=0.0, budget_burst=2)
+    model = NodeModel("hedge_budget_node", backend, "fake", hedge=policy)
+
+    for _ in range(5):
+        model.invoke("question")
+
+    stats = policy.stats()["nodes"]["hedge_budget_node"]
+    assert stats["hedged"] == 2
+    assert stats["budget_exhausted"] == 3
+    assert backend.calls == 7
+
+def test_hedging_cuts_tail_latency():
+    """Test hedging lowers p99 latency under a heavy-tailed distribution"""
+    def latency(rng: random.Random) -> float:
+        return 0.2 if rng.random() < 0.05 else 0.005
+
+    def p99(model, calls=100):
+        latencies = []
+        for _ in range(calls):
+            started = time.monotonic()
+            model.invoke("question")
+            latencies.append(time.monotonic() - started)
+        return float(np.percentile(latencies, 99))
+
+    _warm("hedge_tail_node", latency=0.005, samples=50)
+    plain = NodeModel("hedge_tail_plain", FakeChatBackend(latency=latency, seed=3), "fake")
+    hedged = NodeModel(
+        "hedge_tail_node",
+        FakeChatBackend(latency=latency, seed=3),
+        "fake",
+        hedge=HedgePolicy(percentile=90, budget_ratio=0.2)
+    )
+
+    assert p99(hedged) < p99(plain) / 2
@@ -0,0 +1,61 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import SystemMessage
+from src.config.settings import Settings
+from src.llm.pool import ModelPool
+from src.llm.usage import UsageLedger, get_usage_ledger, model_cost
+
+def _fake_factory(created):
+    def factory(config):
+        created.append(config)
+        return FakeListChatModel(responses=[f"reply from {config['model']}"])
+    return factory
+
+def test_clients_shared_per_configuration(monkeypatch):
+    """Test nodes with the same configuration share one client"""
+    monkeypatch.setattr(Settings, "NODE_MODELS", {
+        "input_analyzer": {"model": "gpt-4.1-nano", "max_tokens": 150},
+        "output_synthesizer": {"model": "gpt-4o"}
+    })
+    created = []
+    pool = ModelPool(factory=_fake_factory(created), overrides={"api_key": "test"})
+
+    analyzer = pool.for_node("input_analyzer")
+    flow = pool.for_node("patient_flow")
+    resources = pool.for_node("resource_manager")
+    synthesizer = pool.for_node("output_synthesizer")
+
+    assert flow.client is resources.client
+    assert analyzer.model == "gpt-4.1-nano"
+    assert synthesizer.model == "gpt-4o"
+    assert len(pool) == 3
+    assert all(config["api_key"] == "test" for config in created)
+
+def test_calls_recorded_per_node():
+    """Test latency, tokens and cost are attributed to the calling node"""
+    ledger = get_usage_ledger()
+    ledger.reset()
+    pool = ModelPool(factory=_fake_factory([]))
+    node = pool.for_node("patient_flow")
+
+    response = node.invoke([SystemMessage(content="Review patient flow metrics")])
+    assert response.content.startswith("reply from")
+
+    summary = ledger.summary()["patient_flow"]
+    assert summary["calls"] == 1
+    assert summary["model"] == node.model
+    assert summary["input_tokens"] > 0 and summary["output_tokens"] > 0
+    assert summary["cost_usd"] > 0
+    assert summary["p95_latency_ms"] >= 0
+    ledger.reset()
+
+def test_model_cost_and_totals():
+    """Test cost uses per-million pricing and unpriced models cost nothing"""
+    assert model_cost("gpt-4o", 1_000_000, 0) == 2.5
+    assert model_cost("unknown-model", 1000, 1000) == 0.0
+
+    ledger = UsageLedger()
+    ledger.record_call("a", "gpt-4o-mini", 0.2, 1000, 100)
+    ledger.record_call("b", "gpt-4o", 1.0, 1000, 100)
+    totals = ledger.totals()
+    assert totals["calls"] == 2
+    assert round(totals["cost_usd"], 6) == round(model_cost("gpt-4o-mini", 1000, 100) + model_cost("gpt-4o", 1000, 100), 6)
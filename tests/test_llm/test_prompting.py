@@ -0,0 +1,75 @@
+from src.llm.prompting import PromptBuilder, PromptSection, count_tokens, format_table
+from src.llm.usage import UsageLedger
+from src.models.state import default_metrics
+from src.nodes.resource_manager import ResourceManagerNode
+
+def test_count_tokens_estimate():
+    """Test the local token estimate splits words and punctuation"""
+    assert count_tokens("") == 0
+    assert count_tokens("ICU: 12/20") == 5
+    assert count_tokens("hospitalization") == 4
+
+def test_format_table():
+    """Test compact table formatting"""
+    assert format_table(["dept", "beds"], [("ER", 10), ("ICU", 4)]) == "dept|beds\nER|10\nICU|4"
+
+def test_section_summarizes_omitted_items():
+    """Test a trimmed section ends with an aggregated line"""
+    section = PromptSection(
+        [5, 4, 3, 2, 1],
+        summarize=lambda omitted: f"+{len(omitted)} more totaling {sum(omitted)}",
+        separator=", "
+    )
+    assert section.render() == "5, 4, 3, 2, 1"
+    assert section.render(2) == "5, 4, +3 more totaling 6"
+    assert PromptSection([]).render() == "None reported"
+
+def test_builder_enforces_budget():
+    """Test sections are trimmed until the prompt fits its budget"""
+    builder = PromptBuilder("test", "Items:\n{items}\nNote: {note}", budget=60)
+    items = PromptSection([f"item{i}: level {i}%" for i in range(200)])
+    prompt, stats = builder.build(items=items, note="keep")
+
+    assert stats["tokens"] <= 60
+    assert count_tokens(prompt) == stats["tokens"]
+    assert stats["trimmed_tokens"] == stats["raw_tokens"] - stats["tokens"]
+    assert stats["omitted_items"]["items"] > 150
+    assert prompt.startswith("Items:\nitem0: level 0%")
+    assert prompt.endswith("Note: keep")
+
+def test_builder_reports_over_budget_at_minimum():
+    """Test the builder stops at the section minimum and flags the overrun"""
+    builder = PromptBuilder("test", "{text} {items}", budget=5)
+    _, stats = builder.build(text="a long fixed field " * 5, items=PromptSection(["x", "y"]))
+
+    assert stats["over_budget"]
+    assert stats["omitted_items"] == {"items": 1}
+
+def test_ledger_accumulates_per_node():
+    """Test prompt statistics are totaled per node"""
+    ledger = UsageLedger()
+    stats = {"node": "n", "tokens": 100, "raw_tokens": 250, "trimmed_tokens": 150, "over_budget": False}
+    ledger.record_prompt(stats)
+    ledger.record_prompt({**stats, "tokens": 50, "trimmed_tokens": 200})
+
+    summary = ledger.summary()["n"]
+    assert summary["prompts"] == 2
+    assert summary["trimmed_tokens"] == 350
+    assert summary["avg_prompt_tokens"] == 75.0
+
+def test_resource_prompt_bounded_for_large_catalog():
+    """Test the resource prompt stays in budget and lists critical supplies first"""
+    resources = default_metrics()["resources"]
+    resources["supply_levels"] = {f"item{i}": (i % 100) / 100 for i in range(2000)}
+    resources["equipment_availability"] = {f"eq{i}": i % 2 == 0 for i in range(1000)}
+    node = ResourceManagerNode(None)
+
+    prompt, stats = node.prompt_builder.build(
+        equipment_status=node._format_equipment_status(resources),
+        supply_levels=node._format_supply_levels(resources),
+        resource_allocation=0.75,
+        budget_info="n/a"
+    )
+    assert stats["tokens"] <= node.prompt_builder.budget
+    assert "item0: Critical (0%)" in prompt
+    assert "adequate)" in prompt
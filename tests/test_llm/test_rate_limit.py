@@ -0,0 +1,157 @@
+import threading
+import time
+import pytest
+from src.llm.context import request_scope
+from src.llm.fake import FakeChatBackend
+from src.llm.pool import ModelPool
+from src.llm.rate_limit import RateLimiter, TokenBucket
+from src.models.state import PriorityLevel
+from src.utils.error_handlers import RateLimitError
+
+def test_token_bucket_refills_over_time():
+    """Test bucket wait times follow the refill rate"""
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])
+    bucket.consume(60)
+
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    now[0] = 30.0
+    assert bucket.wait_time(30) == 0.0
+    bucket.adjust(100)
+    assert bucket.level == 60
+
+def test_critical_overtakes_queued_low():
+    """Test a CRITICAL call is admitted before an earlier queued LOW call"""
+    limiter = RateLimiter(600, 1_000_000, shed_after=60)
+    limiter.requests.level = 0
+    order = []
+
+    def call(priority):
+        limiter.acquire(10, priority)
+        order.append(priority)
+
+    low = threading.Thread(target=call, args=(PriorityLevel.LOW,))
+    critical = threading.Thread(target=call, args=(PriorityLevel.CRITICAL,))
+    low.start()
+    time.sleep(0.02)
+    critical.start()
+    low.join(2)
+    critical.join(2)
+
+    assert order == [PriorityLevel.CRITICAL, PriorityLevel.LOW]
+    assert limiter.stats()["by_priority"]["LOW"]["admitted"] == 1
+
+def test_low_priority_shed_when_backlogged():
+    """Test LOW calls are shed while higher priorities still queue"""
+    limiter = RateLimiter(60, 1_000_000, shed_after=0.5)
+    limiter.requests.level = 0
+
+    with pytest.raises(RateLimitError):
+        limiter.acquire(10, PriorityLevel.LOW)
+    with pytest.raises(RateLimitError) as error:
+        limiter.acquire(10, PriorityLevel.HIGH, timeout=0.05)
+
+    assert error.value.error_code == "RATE_LIMITED"
+    assert limiter.stats()["by_priority"]["LOW"]["shed"] == 1
+    assert limiter.stats()["queue_depth"] == 0
+
+def test_node_calls_limited_and_settled():
+    """Test model calls draw from the limiter and refund unused tokens"""
+    limiter = RateLimiter(1000, 10_000)
+    backend = FakeChatBackend(responses=["ok"])
+    pool = ModelPool(factory=lambda config: backend, limiter=limiter)
+    node = pool.for_node("patient_flow")
+
+    with request_scope(PriorityLevel.HIGH):
+        node.invoke("short prompt")
+
+    stats = limiter.stats()
+    assert stats["by_priority"]["HIGH"]["admitted"] == 1
+    assert stats["tokens_available"] > 10_000 - 10
+    assert backend.calls == 1
+
+def test_agent_queries_use_classified_priority_lane(monkeypatch):
+    """Test a CRITICAL-classified query overtakes queued LOW queries without the scheduler"""
+    from src.agent import HealthcareAgent
+    from src.config.settings import Settings
+    from src.llm.context import current_priority
+    monkeypatch.setattr(Settings, "OPENAI_API_KEY", "test-api-key")
+    monkeypatch.setattr(Settings, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(Settings, "SEMANTIC_CACHE_SIZE", 0)
+
+    class RecordingBackend(FakeChatBackend):
+        def invoke(self, messages, **kwargs):
+            admitted.append(current_priority())
+            return super().invoke(messages, **kwargs)
+
+    analysis = '{{"task_type": "patient_flow", "priority": {}, "department": "ER", "context": {{}}}}'
+    agent = HealthcareAgent()
+    agent.nodes["input_analyzer"].llm.client = FakeChatBackend([analysis.format(1)] * 3 + [analysis.format(5)])
+    agent.nodes["input_analyzer"].llm.limiter = None
+    # Frozen clock: nothing is admitted until the bucket is refilled by hand
+    limiter = RateLimiter(60, 1_000_000, shed_after=60, clock=lambda: 0.0)
+    limiter.requests.level = 0
+    admitted = []
+    agent.nodes["patient_flow"].llm.client = RecordingBackend()
+    for name in ("patient_flow", "output_synthesizer"):
+        agent.nodes[name].llm.limiter = limiter
+
+    def queued(level, count):
+        deadline = time.monotonic() + 5
+        while limiter.stats()["queue_depth_by_priority"][level] < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return limiter.stats()["queue_depth_by_priority"][level]
+
+    threads = []
+    queries = [("Weekly ER report", "LOW", 1), ("Monthly ICU summary", "LOW", 2),
+               ("Bed trend export", "LOW", 3), ("Code blue ER overflow", "CRITICAL", 1)]
+    try:
+        for query, level, depth in queries:
+            thread = threading.Thread(target=agent.process, args=(query,), daemon=True)
+            thread.start()
+            threads.append(thread)
+            assert queued(level, depth) == depth
+    finally:
+        with limiter._condition:
+            limiter.requests.level = limiter.requests.capacity
+            limiter._condition.notify_all()
+        for thread in threads:
+            thread.join(10)
+
+    assert admitted == [PriorityLevel.CRITICAL] + [PriorityLevel.LOW] * 3
+
+def test_cancelled_async_call_leaves_limiter_and_breaker():
+    """Test cancelling an attempt queued in the limiter frees its probe slot and queue entry"""
+    import asyncio
+    from src.llm.pool import NodeModel
+    from src.utils.error_handlers import CircuitBreaker
+
+    limiter = RateLimiter(60, 1_000_000, shed_after=60, clock=lambda: 0.0)
+    limiter.requests.level = 0
+    breaker = CircuitBreaker(
+        "fake", failure_threshold=1, recovery_timeout=0,
+        counts_as_failure=lambda error: isinstance(error, RuntimeError)
+    )
+    breaker.record_failure(RuntimeError("backend down"))
+    backend = FakeChatBackend(responses=["ok"])
+    model = NodeModel("patient_flow", backend, "fake", limiter=limiter, breaker=breaker)
+
+    async def run():
+        task = asyncio.ensure_future(model.ainvoke("question"))
+        await asyncio.sleep(0.1)
+        assert limiter.stats()["queue_depth"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    tokens = limiter.tokens.level
+    assert limiter.stats()["queue_depth"] == 0
+    assert breaker.state == "half_open"
+    breaker.allow()
+
+    # Once capacity returns nothing was consumed for the cancelled call
+    limiter.requests.level = 1
+    assert limiter.acquire(10, PriorityLevel.HIGH) == 0
+    assert limiter.tokens.level == tokens - 10
+    assert backend.calls == 0
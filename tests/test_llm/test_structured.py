@@ -0,0 +1,71 @@
+from src.llm.structured import StructuredOutputParser
+from src.models.state import TaskType, PriorityLevel
+from src.nodes.input_analyzer import InputAnalyzerNode
+
+def test_json_answer_parsed_and_coerced():
+    """Test the JSON fast path fills every field with the schema's types"""
+    parser = StructuredOutputParser("patient_flow")
+    response = """```json
+{"findings": "ER at 95% occupancy", "recommendations": ["Open overflow beds"],
+ "metrics_impact": {"wait_time": "-15%"}}
+```"""
+    structured, mode = parser.parse_with_mode(response)
+
+    assert mode == "json"
+    assert structured == {
+        "findings": ["ER at 95% occupancy"],
+        "recommendations": ["Open overflow beds"],
+        "action_items": [],
+        "metrics_impact": {"wait_time": "-15%"}
+    }
+
+def test_section_fallback_for_free_text():
+    """Test headings and list items are mapped to fields in one pass"""
+    parser = StructuredOutputParser("output_synthesizer")
+    response = """ER is near capacity and wait times are rising.
+
+## Key Insights
+- ER occupancy at 95%
+- Discharges lag admissions
+
+**Recommendations:**
+1. Open the overflow unit
+2. Add a discharge nurse
+
+Action items:
+- Page bed management
+"""
+    structured, mode = parser.parse_with_mode(response)
+
+    assert mode == "sections"
+    assert structured["summary"] == "ER is near capacity and wait times are rising."
+    assert structured["key_findings"] == ["ER occupancy at 95%", "Discharges lag admissions"]
+    assert structured["recommendations"] == ["Open the overflow unit", "Add a discharge nurse"]
+    assert structured["action_items"] == [{"action": "Page bed management"}]
+    assert parser.stats == {"json": 0, "sections": 1}
+
+def test_fallback_keeps_loose_recommendations():
+    """Test recommendation lines outside sections are still captured"""
+    parser = StructuredOutputParser("quality_monitor")
+    structured = parser.parse("Scores are fine.\nWe recommend a hand hygiene audit.")
+
+    assert structured["recommendations"] == ["We recommend a hand hygiene audit."]
+    assert structured["priority_improvements"] == []
+
+def test_instructions_list_schema_fields():
+    """Test the prompt instructions name every field and ask for JSON"""
+    instructions = StructuredOutputParser("staff_scheduler").instructions
+    assert "JSON" in instructions
+    assert '"staff_assignments" (object' in instructions
+
+def test_input_analyzer_reads_json():
+    """Test the input analyzer maps a JSON answer to task, priority and department"""
+    node = InputAnalyzerNode(None)
+    result = node._parse_llm_response(
+        '{"task_type": "staff_scheduling", "priority": 4, "department": "ICU", "context": {"shift": "night"}}'
+    )
+
+    assert result["task_type"] == TaskType.STAFF_SCHEDULING
+    assert result["priority"] == PriorityLevel.URGENT
+    assert result["department"] == "ICU"
+    assert result["context"] == {"shift": "night"}
@@ -0,0 +1,96 @@
+import numpy as np
+from src.metrics.anomaly import AnomalyDetector, ControlChart
+from src.models.state import default_metrics
+from src.nodes.quality_monitor import QualityMonitorNode
+
+def _noise(count, mean, sigma, seed=7):
+    return np.random.default_rng(seed).normal(mean, sigma, count)
+
+def test_in_control_series_not_flagged():
+    """Test stable noise stays within control limits"""
+    chart = ControlChart()
+    signals = [chart.update(value) for value in _noise(500, 8.5, 0.1)]
+
+    assert sum(signal is not None for signal in signals) < 25
+    assert chart.trend in ("Stable", "Improving", "Declining")
+
+def test_sustained_shift_flagged_with_direction():
+    """Test a one-sigma drop is detected and labeled by metric direction"""
+    detector = AnomalyDetector()
+    for value in _noise(100, 8.5, 0.1):
+        detector.observe("quality.patient_satisfaction", value)
+        detector.observe("quality.incident_count", value)
+    for value in _noise(30, 8.4, 0.1, seed=11):
+        detector.observe("quality.patient_satisfaction", value)
+        detector.observe("quality.incident_count", value)
+
+    satisfaction = detector.status("quality.patient_satisfaction")
+    assert satisfaction["signal"] == "down"
+    assert satisfaction["trend"] == "Declining"
+    assert detector.status("quality.incident_count")["trend"] == "Improving"
+    assert [flag["metric"] for flag in detector.flagged("quality.")] == [
+        "quality.incident_count", "quality.patient_satisfaction"
+    ]
+
+def test_warmup_suppresses_flags():
+    """Test no signal before the baseline is established"""
+    detector = AnomalyDetector()
+    statuses = [detector.observe("wait_time", value, "ER") for value in (10, 50, 10, 90)]
+
+    assert not any(status["flagged"] for status in statuses)
+    assert statuses[-1]["trend"] == "Unknown"
+    assert not detector.is_warm("wait_time", "ER")
+
+def test_snapshot_feeds_department_series():
+    """Test snapshots update hospital and department charts"""
+    detector = AnomalyDetector()
+    metrics = default_metrics()
+    metrics["patient_flow"]["department_metrics"] = {"ER": {"wait_time": 30}}
+    detector.observe_snapshot(metrics)
+
+    assert detector.status("wait_time", "ER")["samples"] == 1
+    assert detector.status("quality.compliance_rate")["value"] == 0.95
+
+def test_quality_prompt_lists_only_flagged_metrics():
+    """Test the quality prompt shrinks to flagged metrics once charts are warm"""
+    detector = AnomalyDetector()
+    quality = default_metrics()["quality"]
+    node = QualityMonitorNode(None, detector=detector)
+    assert "Incident reports" in node._format_quality_metrics(quality)
+
+    for value in _noise(50, 0.95, 0.005):
+        detector.observe("quality.compliance_rate", value)
+        detector.observe("quality.patient_satisfaction", 8.5)
+        detector.observe("quality.incident_count", 2)
+    assert node._format_quality_metrics(quality) == \
+        "- All quality metrics within statistical control limits"
+
+    for _ in range(5):
+        detector.observe("quality.incident_count", 9)
+    prompt = node._format_quality_metrics({**quality, "incident_count": 9})
+    assert prompt.startswith("- Incident reports: 9 (declining shift")
+    assert "Patient satisfaction" not in prompt
+    assert node._analyze_incidents({"incident_count": 9})["shift_detected"]
+
+def test_unchanged_series_not_fed_on_every_publish():
+    """Test repeated publishes only feed the series that changed"""
+    from datetime import datetime, timedelta
+    detector = AnomalyDetector()
+    metrics = default_metrics()
+    started = datetime(2024, 1, 1)
+    for i in range(30):
+        metrics["patient_flow"]["occupied_beds"] = 70 + i % 5
+        metrics["last_updated"] = started + timedelta(seconds=i)
+        detector.observe_snapshot(metrics)
+
+    assert detector.status("quality.patient_satisfaction")["samples"] == 1
+    assert detector.status("patient_flow.occupied_beds")["samples"] == 30
+
+    metrics["quality"]["patient_satisfaction"] = 8.45
+    assert detector.observe_snapshot(metrics) == []
+    assert detector.status("quality.patient_satisfaction")["trend"] == "Unknown"
+
+    # A steady series is still sampled once per interval
+    metrics["last_updated"] = started + timedelta(minutes=5)
+    detector.observe_snapshot(metrics)
+    assert detector.status("quality.patient_satisfaction")["samples"] == 3
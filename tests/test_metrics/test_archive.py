@@ -0,0 +1,70 @@
+import time
+import numpy as np
+import pytest
+from src.metrics.archive import MetricsArchive, SECONDS_PER_DAY
+from src.models.state import default_metrics
+
+def test_range_lookup_returns_mapped_views(tmp_path):
+    """Test range queries slice the memory-mapped series without copying"""
+    archive = MetricsArchive(str(tmp_path))
+    timestamps = np.arange(0, 600, 60)
+    archive.append_many("wait_time", timestamps, np.arange(10.0), department="ER")
+
+    ts, values = archive.range("wait_time", 120, 300, department="ER")
+    assert ts.tolist() == [120, 180, 240]
+    assert values.tolist() == [2.0, 3.0, 4.0]
+    assert not values.flags.owndata
+
+    reopened = MetricsArchive(str(tmp_path))
+    assert reopened.range("wait_time", department="ER")[1].sum() == 45.0
+    assert reopened.range("wait_time")[1].size == 0
+
+def test_out_of_order_append_rejected(tmp_path):
+    """Test the time index stays sorted"""
+    archive = MetricsArchive(str(tmp_path))
+    archive.append("quality.patient_satisfaction", 8.0, timestamp=1000)
+    with pytest.raises(ValueError):
+        archive.append("quality.patient_satisfaction", 8.1, timestamp=999)
+
+def test_trend_rolling_and_week_over_week(tmp_path):
+    """Test trend direction, rolling means and week-over-week change"""
+    archive = MetricsArchive(str(tmp_path))
+    timestamps = np.arange(0, 14 * SECONDS_PER_DAY, 3600)
+    values = 7.0 + timestamps / (14 * SECONDS_PER_DAY)
+    archive.append_many("quality.patient_satisfaction", timestamps, values)
+
+    trend = archive.trend("quality.patient_satisfaction")
+    assert trend["direction"] == "Improving"
+    assert trend["slope_per_day"] == pytest.approx(1 / 14)
+
+    _, rolling = archive.rolling_mean("quality.patient_satisfaction", 3 * 3600)
+    assert rolling[0] == values[0]
+    assert rolling[10] == pytest.approx(values[8:11].mean())
+
+    change = archive.week_over_week("quality.patient_satisfaction", now=timestamps[-1])
+    assert change["change"] == pytest.approx(0.5, abs=0.01)
+
+def test_year_of_minute_data_queries_fast(tmp_path):
+    """Test a year of minute-level records aggregates in milliseconds"""
+    archive = MetricsArchive(str(tmp_path))
+    timestamps = np.arange(0, 365 * SECONDS_PER_DAY, 60)
+    archive.append_many("current_occupancy", timestamps, np.sin(timestamps / 1e5) + 20, "ICU")
+
+    started = time.perf_counter()
+    archive.trend("current_occupancy", 300 * SECONDS_PER_DAY, 307 * SECONDS_PER_DAY, "ICU")
+    archive.week_over_week("current_occupancy", 200 * SECONDS_PER_DAY, "ICU")
+    assert time.perf_counter() - started < 0.5
+
+def test_record_snapshot_throttles(tmp_path):
+    """Test snapshots archive hospital and department metrics at most once per interval"""
+    archive = MetricsArchive(str(tmp_path))
+    metrics = default_metrics()
+    metrics["patient_flow"]["department_metrics"] = {
+        "ER": {"name": "ER", "current_occupancy": 12, "wait_time": 30}
+    }
+
+    written = archive.record_snapshot(metrics, timestamp=1000)
+    assert written > 2
+    assert archive.record_snapshot(metrics, timestamp=1030) == 0
+    assert archive.record_snapshot(metrics, timestamp=1060) == written
+    assert archive.range("current_occupancy", department="ER")[1].tolist() == [12.0, 12.0]
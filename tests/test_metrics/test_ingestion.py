@@ -0,0 +1,105 @@
+import json
+import pytest
+from src.metrics.provider import MetricsProvider
+from src.metrics.ingestion import EventIngestor, CensusState, parse_event
+
+def _seed_provider():
+    provider = MetricsProvider()
+    provider.publish({"patient_flow": {
+        "occupied_beds": 10,
+        "waiting_patients": 0,
+        "department_metrics": {"ER": {"name": "ER", "capacity": 20, "current_occupancy": 10}}
+    }})
+    return provider
+
+def test_parse_jsonl_and_pipe_events():
+    """Test both supported event formats"""
+    json_event = parse_event(json.dumps({"type": "ADMIT", "department": "ER", "timestamp": 0}))
+    hl7_event = parse_event("ADT|A02|60|p1|ER|ICU")
+
+    assert json_event["type"] == "admit"
+    assert hl7_event["type"] == "transfer"
+    assert hl7_event["to_department"] == "ICU"
+    assert parse_event("   ") is None
+    with pytest.raises(ValueError):
+        parse_event("ORU|R01|0")
+
+def test_pipe_event_with_hl7_timestamp():
+    """Test HL7 TS timestamps are parsed as dates, not epoch seconds"""
+    from datetime import datetime, timedelta, timezone
+    event = parse_event("ADT|A01|20261019083000|P1|ER|")
+    assert event["timestamp"] == datetime(2026, 10, 19, 8, 30).timestamp()
+    assert parse_event("ADT|A01|20261019|P1|ER")["timestamp"] == datetime(2026, 10, 19).timestamp()
+    offset = parse_event("ADT|A03|202610190830-0500|P1|ER")["timestamp"]
+    assert offset == datetime(2026, 10, 19, 8, 30, tzinfo=timezone(timedelta(hours=-5))).timestamp()
+    # 10-digit epoch seconds are not mistaken for YYYYMMDDHH
+    assert parse_event("ADT|A01|1760862600|P1|ER")["timestamp"] == 1760862600.0
+
+    census = CensusState()
+    census.apply(event)
+    flow = census.to_metrics(now=event["timestamp"] + 60)["patient_flow"]
+    assert flow["rate_windows"]["admission"]["1h"] == 1.0
+
+def test_census_counters():
+    """Test occupancy and waiting counts follow events"""
+    census = CensusState()
+    for line in ["ADT|A04|0|p1|ER", "ADT|A01|60|p1|ER", "ADT|A02|120|p1|ER|ICU", "ADT|A03|180|p1|ICU"]:
+        census.apply(parse_event(line))
+
+    flow = census.to_metrics(now=180)["patient_flow"]
+    assert flow["occupied_beds"] == 0
+    assert flow["waiting_patients"] == 0
+    assert flow["department_metrics"]["ER"]["admissions"] == 1
+    assert flow["department_metrics"]["ICU"]["discharges"] == 1
+    assert flow["admission_rate"] > 0
+
+def test_ingestor_tails_file_and_resumes_from_checkpoint(tmp_path):
+    """Test incremental polling, partial lines and checkpoint restart"""
+    events = tmp_path / "adt.log"
+    checkpoint = tmp_path / "checkpoint.json"
+    events.write_text("ADT|A01|0|p1|ER\nADT|A01|10|p2|ER\nADT|A03|2")
+
+    provider = _seed_provider()
+    ingestor = EventIngestor(str(events), provider, checkpoint_path=str(checkpoint))
+    assert ingestor.poll() == 2
+    assert provider.current.metrics["patient_flow"]["occupied_beds"] == 12
+    department = provider.current.metrics["patient_flow"]["department_metrics"]["ER"]
+    assert department["current_occupancy"] == 12
+    assert department["capacity"] == 20
+
+    with open(events, "a") as f:
+        f.write("0|p1|ER\n")
+
+    restarted = EventIngestor(str(events), provider, checkpoint_path=str(checkpoint))
+    assert restarted.poll() == 1
+    assert provider.current.metrics["patient_flow"]["occupied_beds"] == 11
+
+    # Quiet polls leave the checkpoint alone
+    checkpoint.unlink()
+    assert restarted.poll() == 0
+    assert not checkpoint.exists()
+
+def test_quiet_polls_republish_decayed_rates(tmp_path):
+    """Test rates decay to zero without new events and unchanged rates are not republished"""
+    events = tmp_path / "adt.log"
+    events.write_text("ADT|A01|0|p1|ER\nADT|A01|30|p2|ER\n")
+    now = [60.0]
+
+    provider = _seed_provider()
+    ingestor = EventIngestor(str(events), provider, clock=lambda: now[0])
+    assert ingestor.poll() == 2
+    assert provider.current.metrics["patient_flow"]["admission_rate"] == 2.0
+    version = provider.current.version
+
+    assert ingestor.poll() == 0
+    assert provider.current.version == version
+
+    now[0] = 2 * 3600
+    assert ingestor.poll() == 0
+    flow = provider.current.metrics["patient_flow"]
+    assert provider.current.version == version + 1
+    assert flow["admission_rate"] == 0.0
+    assert flow["rate_windows"]["admission"]["1h"] == 0.0
+    assert flow["department_metrics"]["ER"]["admission_rate"] == 0.0
+    assert flow["department_metrics"]["ER"]["current_occupancy"] == 12
+    assert flow["occupied_beds"] == 12
@@ -0,0 +1,57 @@
+import json
+import os
+import pytest
+from datetime import datetime
+from src.models.state import create_initial_state, update_state_metrics
+from src.metrics.provider import MetricsProvider, FileMetricsSource
+
+def test_states_share_snapshot_by_reference():
+    """Test requests receive the same immutable metrics object"""
+    provider = MetricsProvider()
+    first = create_initial_state("a", provider.current.metrics)
+    second = create_initial_state("b", provider.current.metrics)
+
+    assert first["metrics"] is second["metrics"]
+    with pytest.raises(TypeError):
+        first["metrics"]["quality"]["incident_count"] = 10
+
+def test_update_state_metrics_copies_on_write():
+    """Test per-state updates leave the shared snapshot untouched"""
+    provider = MetricsProvider()
+    state = create_initial_state("a", provider.current.metrics)
+
+    update_state_metrics(state, {"incident_count": 9}, "quality")
+
+    assert state["metrics"]["quality"]["incident_count"] == 9
+    assert provider.current.metrics["quality"]["incident_count"] == 2
+
+def test_publish_bumps_version_and_merges():
+    """Test publishing merges over the current metrics"""
+    provider = MetricsProvider()
+    version = provider.publish({"patient_flow": {"occupied_beds": 280}})
+
+    assert version.version == 1
+    assert provider.current.metrics["patient_flow"]["occupied_beds"] == 280
+    assert provider.current.metrics["patient_flow"]["total_beds"] == 300
+
+def test_file_sources_reload_only_on_change(tmp_path):
+    """Test JSON and CSV file drops are loaded once per change"""
+    json_path = tmp_path / "metrics.json"
+    json_path.write_text(json.dumps({
+        "quality": {"patient_satisfaction": 6.5, "last_audit_date": "2024-01-01T00:00:00"}
+    }))
+    provider = MetricsProvider(source=FileMetricsSource(str(json_path)))
+
+    assert provider.version == 1
+    assert provider.current.metrics["quality"]["last_audit_date"] == datetime(2024, 1, 1)
+    assert provider.refresh() is False
+
+    csv_path = tmp_path / "departments.csv"
+    csv_path.write_text(
+        "name,capacity,current_occupancy,wait_time,staff_nurses\n"
+        "ER,40,35,50,12\nICU,20,18,0,10\n"
+    )
+    provider = MetricsProvider(source=FileMetricsSource(str(csv_path)))
+
+    assert provider.current.metrics["patient_flow"]["total_beds"] == 60
+    assert provider.current.snapshot.department("ER").staff_count == {"nurses": 12}
@@ -0,0 +1,35 @@
+from src.metrics.windows import WindowedCounter, RateWindows
+
+def test_counter_slides_out_old_events():
+    """Test buckets expire as the window moves forward"""
+    counter = WindowedCounter(bucket_seconds=60, num_buckets=15)
+    for minute in range(30):
+        counter.add(minute * 60)
+
+    assert counter.count(29 * 60) == 15
+    assert counter.count(40 * 60) == 4
+    assert counter.count(10_000 * 60) == 0
+    assert len(counter.counts) == 15
+
+def test_rate_windows_per_department_and_hospital():
+    """Test per-hour rates for each window and the hospital-wide key"""
+    windows = RateWindows()
+    now = 100 * 3600.0
+    for i in range(12):
+        windows.record("admit", "ER", now - i * 300)
+    windows.record("admit", "ICU", now - 20 * 3600)
+
+    er = windows.rates("admit", "ER", now=now)
+    assert er["15m"] == 12.0
+    assert er["1h"] == 12.0
+    assert er["24h"] == 0.5
+    assert windows.rate("admit", "24h", now=now) == round(13 / 24, 2)
+    assert windows.rates("discharge", now=now) == {"15m": 0.0, "1h": 0.0, "24h": 0.0}
+
+def test_rate_windows_round_trip():
+    """Test checkpoint serialization keeps counts"""
+    windows = RateWindows()
+    windows.record("admit", "ER", 3600.0)
+    restored = RateWindows.from_dict(windows.to_dict())
+
+    assert restored.rates("admit", "ER", now=3600.0) == windows.rates("admit", "ER", now=3600.0)
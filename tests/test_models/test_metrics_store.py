@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from src.models.state import create_initial_state
+from src.models.metrics_store import MetricsSnapshot
+
+def _departments(count):
+    return [
+        {
+            "id": f"D{i}",
+            "name": f"Dept-{i}",
+            "capacity": 20 + i,
+            "current_occupancy": i % 20,
+            "staff_count": {"doctors": 2, "nurses": 5 + i % 3},
+            "wait_time": i
+        }
+        for i in range(count)
+    ]
+
+def test_department_lookup_reads_columns_without_copy():
+    """Test department views read the shared columns"""
+    snapshot = MetricsSnapshot.from_departments(_departments(500))
+    view = snapshot.department("Dept-42")
+
+    assert view.capacity == 62
+    assert view.staff_count == {"doctors": 2, "nurses": 5}
+    assert np.shares_memory(view.staff_row, snapshot.staff_counts)
+    assert snapshot.occupancy_rates()[42] == pytest.approx(2 / 62)
+    with pytest.raises(KeyError):
+        snapshot.department("missing")
+
+def test_columns_are_read_only():
+    """Test snapshots cannot be mutated in place"""
+    snapshot = MetricsSnapshot.from_departments(_departments(3))
+
+    with pytest.raises(ValueError):
+        snapshot.columns["capacity"][0] = 1
+
+def test_round_trip_with_dict_form():
+    """Test conversion to and from the nested HospitalMetrics dict"""
+    metrics = create_initial_state("t")["metrics"]
+    metrics["patient_flow"]["department_metrics"] = {
+        dept["name"]: dept for dept in _departments(4)
+    }
+
+    restored = MetricsSnapshot.from_metrics(metrics).to_metrics()
+
+    assert restored == metrics
+
+def test_nodes_read_the_published_snapshot():
+    """Test nodes use the state's published snapshot and fall back to converting frozen metrics"""
+    from src.metrics.provider import MetricsProvider
+    from src.nodes.patient_flow import PatientFlowNode
+    provider = MetricsProvider()
+    provider.publish({"patient_flow": {"department_metrics": {
+        dept["name"]: dept for dept in _departments(3)
+    }}})
+    current = provider.current
+    state = create_initial_state("t", current.metrics, current.snapshot)
+    assert MetricsSnapshot.from_state(state) is current.snapshot
+
+    converted = MetricsSnapshot.from_state(create_initial_state("t", current.metrics))
+    assert converted.department("Dept-2").staff_count == {"doctors": 2, "nurses": 7}
+    assert converted.categories["quality"] == current.snapshot.categories["quality"]
+
+    section = PatientFlowNode(None)._get_department_capacity(current.snapshot)
+    assert [section.render_item(dept) for dept in section.items] == [
+        "Dept-2|2/22|2", "Dept-1|1/21|1", "Dept-0|0/20|0"
+    ]
@@ -19,4 +19,28 @@ def test_occupancy_calculation(mock_hospital_state):
     occupancy = node._calculate_occupancy(metrics)
     expected = (metrics["occupied_beds"] / metrics["total_beds"]) * 100
     
-    assert occupancy == expected
\ No newline at end of file
+    assert occupancy == expected
+
+def test_prompt_rates_are_queried_at_build_time(mock_hospital_state, tmp_path):
+    """Test rates come from the event windows now, not the last published metrics"""
+    from src.metrics.provider import MetricsProvider
+    from src.metrics.ingestion import EventIngestor
+
+    events = tmp_path / "adt.log"
+    events.write_text("ADT|A01|0|p1|ER\nADT|A01|30|p2|ER\n")
+    now = [60.0]
+    provider = MetricsProvider()
+    ingestor = EventIngestor(str(events), provider, clock=lambda: now[0])
+    ingestor.poll()
+
+    node = PatientFlowNode(None, provider)
+    metrics = node._with_live_rates(dict(provider.current.metrics["patient_flow"]))
+    assert node._format_rate(metrics, "admission").startswith("2.0")
+
+    # No poll has run since the events left the window
+    now[0] = 2 * 3600
+    metrics = node._with_live_rates(mock_hospital_state["metrics"]["patient_flow"])
+    assert metrics["admission_rate"] == 0.0
+    assert metrics["rate_windows"]["admission"]["1h"] == 0.0
+    assert metrics["occupied_beds"] == 75
+    assert PatientFlowNode(None)._with_live_rates(metrics) is metrics
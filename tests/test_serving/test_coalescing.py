@@ -0,0 +1,79 @@
+import threading
+import time
+import pytest
+from src.agent import HealthcareAgent
+from src.config.settings import Settings
+from src.llm.fake import FakeChatBackend
+from src.serving.coalescing import SingleFlight
+
+ANALYSIS = '{"task_type": "patient_flow", "priority": 3, "department": "ER", "context": {}}'
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(Settings, "OPENAI_API_KEY", "test-api-key")
+    monkeypatch.setattr(Settings, "LLM_BACKEND", "fake")
+    agent = HealthcareAgent()
+    agent.backends = {}
+    for name in ("input_analyzer", "patient_flow", "output_synthesizer"):
+        responses = [ANALYSIS] if name == "input_analyzer" else None
+        backend = agent.backends[name] = FakeChatBackend(responses, latency=0.1)
+        agent.nodes[name].llm.client = backend
+    return agent
+
+def _concurrently(function, arguments):
+    results = [None] * len(arguments)
+
+    def run(index, argument):
+        results[index] = function(argument)
+
+    threads = [threading.Thread(target=run, args=(i, arg)) for i, arg in enumerate(arguments)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+def test_single_flight_shares_result_and_errors():
+    """Test concurrent callers share one execution, including its failure"""
+    flight = SingleFlight()
+    executions = []
+
+    def slow():
+        executions.append(1)
+        time.sleep(0.1)
+        return "answer"
+
+    results = _concurrently(lambda _: flight.do("key", slow), range(4))
+    assert len(executions) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result == "answer" for result, _ in results)
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("backend down")
+
+    errors = _concurrently(lambda _: pytest.raises(ValueError, flight.do, "key", failing), range(3))
+    assert len(errors) == 3
+    assert flight.stats()["coalescing_ratio"] == round(5 / 7, 4)
+    assert flight.stats()["in_flight"] == 0
+
+def test_identical_queries_share_one_graph_run(agent):
+    """Test concurrent identical questions run the graph once"""
+    queries = ["Current ER wait time?", "current ER wait time", "CURRENT  ER WAIT TIME!"]
+    thread_ids = ["nurse-1", "nurse-2", "nurse-3"]
+    responses = _concurrently(
+        lambda pair: agent.process(pair[0], thread_id=pair[1]),
+        list(zip(queries, thread_ids))
+    )
+
+    assert sum(backend.calls for backend in agent.backends.values()) == 3
+    assert [response["thread_id"] for response in responses] == thread_ids
+    assert len({response["response"] for response in responses}) == 1
+    assert set(agent.conversation_states) >= set(thread_ids)
+    assert agent.get_usage_report()["coalescing"]["coalescing_ratio"] == round(2 / 3, 4)
+
+def test_different_queries_are_not_coalesced(agent):
+    """Test distinct questions each run their own graph"""
+    _concurrently(agent.process, ["ER wait time", "ICU wait time"])
+    assert agent.single_flight.stats()["executions"] == 2
+    assert agent.single_flight.stats()["coalesced"] == 0
@@ -0,0 +1,93 @@
+import threading
+import time
+from src.llm.context import current_priority
+from src.models.state import PriorityLevel
+from src.serving.scheduler import RequestScheduler, preclassify_priority
+
+def _gated_scheduler(**kwargs):
+    """Scheduler whose first request blocks until the returned event is set"""
+    gate = threading.Event()
+    order = []
+
+    def handler(text):
+        if text == "hold":
+            gate.wait(2)
+        else:
+            order.append((text, current_priority()))
+        return text
+
+    scheduler = RequestScheduler(handler, max_concurrency=1, **kwargs)
+    scheduler.submit("hold", priority=PriorityLevel.MEDIUM)
+    time.sleep(0.02)
+    return scheduler, gate, order
+
+def test_preclassify_priority():
+    """Test keyword pre-classification of queries"""
+    assert preclassify_priority("ICU capacity is full, code blue in bay 3") == PriorityLevel.CRITICAL
+    assert preclassify_priority("Urgent: ER needs two more nurses") == PriorityLevel.URGENT
+    assert preclassify_priority("Supply shortage in Surgery") == PriorityLevel.HIGH
+    assert preclassify_priority("Monthly quality summary please") == PriorityLevel.LOW
+    assert preclassify_priority("How many beds are in General?") == PriorityLevel.MEDIUM
+
+def test_weighted_fair_order():
+    """Test higher priorities get proportionally more dispatch slots"""
+    scheduler, gate, order = _gated_scheduler(aging_seconds=1e9)
+    futures = [scheduler.submit(f"low-{i}", priority=PriorityLevel.LOW) for i in range(4)]
+    futures += [scheduler.submit(f"critical-{i}", priority=PriorityLevel.CRITICAL) for i in range(4)]
+    gate.set()
+    for future in futures:
+        future.result(2)
+    scheduler.shutdown()
+
+    names = [text for text, _ in order]
+    assert names[:4] == [f"critical-{i}" for i in range(4)]
+    assert all(priority == PriorityLevel.CRITICAL for text, priority in order if text.startswith("critical"))
+
+def test_aging_prevents_starvation():
+    """Test a long-waiting LOW request runs ahead of fresh CRITICAL ones"""
+    scheduler, gate, order = _gated_scheduler(aging_seconds=0.01)
+    low = scheduler.submit("low", priority=PriorityLevel.LOW)
+    time.sleep(0.1)
+    critical = [scheduler.submit(f"critical-{i}", priority=PriorityLevel.CRITICAL) for i in range(3)]
+    gate.set()
+    low.result(2)
+    for future in critical:
+        future.result(2)
+    scheduler.shutdown()
+
+    assert order[0][0] == "low"
+
+def test_concurrency_bound_and_stats():
+    """Test concurrent executions stay within the bound and latency is reported"""
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def handler(text):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return text.upper()
+
+    scheduler = RequestScheduler(handler, max_concurrency=2)
+    futures = [scheduler.submit(f"weekly report {i}") for i in range(6)]
+    assert [future.result(2) for future in futures] == [f"WEEKLY REPORT {i}" for i in range(6)]
+    stats = scheduler.stats()
+    scheduler.shutdown()
+
+    assert active[1] <= 2
+    assert stats["by_priority"]["LOW"]["completed"] == 6
+    assert stats["by_priority"]["LOW"]["p95_latency_ms"] >= stats["by_priority"]["LOW"]["p50_latency_ms"] > 0
+    assert stats["queued"] == 0
+
+def test_handler_errors_reach_future():
+    """Test exceptions from the handler are raised to the caller"""
+    def handler(text):
+        raise ValueError(text)
+
+    scheduler = RequestScheduler(handler, max_concurrency=1)
+    future = scheduler.submit("bad input")
+    scheduler.shutdown()
+    assert isinstance(future.exception(1), ValueError)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from src.agent import HealthcareAgent
+from src.config.settings import Settings
+from src.llm.fake import FakeChatBackend
+from src.serving.semantic_cache import HashedNgramVectorizer, LSHIndex, SemanticCache
+
+ANALYSIS = '{"task_type": "patient_flow", "priority": 3, "department": "ER", "context": {}}'
+
+def test_vectorizer_matches_paraphrases():
+    """Test paraphrases score above the threshold and other departments below"""
+    vectorizer = HashedNgramVectorizer()
+    query = vectorizer.transform("ER wait time?")
+
+    assert query @ vectorizer.transform("How long is the wait in emergency") > 0.85
+    assert query @ vectorizer.transform("What is the current ER wait time") > 0.99
+    assert query @ vectorizer.transform("ICU wait time") < 0.7
+    assert query @ vectorizer.transform("staff overtime this week") < 0.3
+
+def test_lsh_index_recall():
+    """Test the index returns close neighbors as candidates"""
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((300, 256)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = LSHIndex(256)
+    for slot, vector in enumerate(vectors):
+        index.add(slot, vector)
+
+    found = 0
+    for slot, vector in enumerate(vectors[:100]):
+        noisy = vector + 0.3 * rng.standard_normal(256).astype(np.float32) / np.sqrt(256)
+        found += slot in index.candidates(noisy / np.linalg.norm(noisy))
+    assert found >= 95
+
+    index.remove(0)
+    assert 0 not in index.candidates(vectors[0])
+
+def test_cache_hits_paraphrase_for_same_metrics_version():
+    """Test hits require similarity and a matching metrics version"""
+    cache = SemanticCache(capacity=8, threshold=0.85)
+    cache.store("ER wait time?", 1, {"response": "35 minutes"})
+
+    assert cache.lookup("how long is the wait in emergency", 1) == {"response": "35 minutes"}
+    assert cache.lookup("how long is the wait in emergency", 2) is None
+    assert cache.lookup("ICU bed occupancy", 1) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+@pytest.mark.parametrize("cached, query", [
+    ("Should we increase nurse staffing in ICU?", "Should we decrease nurse staffing in ICU?"),
+    ("Patient 12345 discharge status", "Patient 12346 discharge status"),
+    ("supply levels for ward 3", "supply levels for ward 4"),
+    ("What is the occupancy in ward A?", "What is the occupancy in ward B?"),
+    ("Beds free in unit C", "Beds free in unit D"),
+    ("Is the ER at capacity?", "Isn't the ER at capacity?")
+])
+def test_cache_never_serves_opposite_or_other_identifier(cached, query):
+    """Test near-identical queries differing in direction, negation or IDs miss"""
+    cache = SemanticCache(capacity=8, threshold=0.8)
+    cache.store(cached, 1, {"response": cached})
+    assert cache.lookup(query, 1) is None
+    assert cache.lookup(cached.lower(), 1) == {"response": cached}
+
+def test_guard_terms_normalize_direction_words():
+    """Test paraphrased directions share guards while opposites do not"""
+    vectorizer = HashedNgramVectorizer()
+    assert vectorizer.guard_terms("raise ICU staffing") == vectorizer.guard_terms("increase ICU staffing")
+    assert vectorizer.guard_terms("ward 3 beds") == frozenset({"3"})
+    assert vectorizer.guard_terms("Is a bed free in ward A?") == frozenset({"a"})
+    assert vectorizer.guard_terms("occupancy in ward b") == vectorizer.guard_terms("Occupancy, ward B")
+    assert vectorizer.guard_terms("don't add beds") == frozenset({"not", "up"})
+
+def test_cache_evicts_least_recently_used():
+    """Test memory stays bounded and recently used entries survive"""
+    cache = SemanticCache(capacity=3, threshold=0.85)
+    for department in ("emergency", "surgery", "pediatrics"):
+        cache.store(f"{department} wait time", 1, {"response": department})
+    cache.lookup("emergency wait time", 1)
+    cache.store("cardiology wait time", 1, {"response": "cardiology"})
+
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["evictions"] == 1
+    assert cache.lookup("surgery wait time", 1) is None
+    assert cache.lookup("emergency wait time", 1) == {"response": "emergency"}
+
+def test_agent_serves_paraphrase_from_cache(monkeypatch):
+    """Test a paraphrased question is answered without running the graph"""
+    monkeypatch.setattr(Settings, "OPENAI_API_KEY", "test-api-key")
+    monkeypatch.setattr(Settings, "LLM_BACKEND", "fake")
+    agent = HealthcareAgent()
+    backends = [FakeChatBackend([ANALYSIS]), FakeChatBackend(), FakeChatBackend()]
+    for name, backend in zip(("input_analyzer", "patient_flow", "output_synthesizer"), backends):
+        agent.nodes[name].llm.client = backend
+
+    first = agent.process("ER wait time?", thread_id="first")
+    second = agent.process("How long is the wait in emergency", thread_id="second")
+
+    assert sum(backend.calls for backend in backends) == 3
+    assert second["response"] == first["response"]
+    assert second["thread_id"] == "second"
+    assert agent.get_usage_report()["semantic_cache"]["hits"] == 1
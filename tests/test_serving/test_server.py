@@ -0,0 +1,194 @@
+import asyncio
+import http.client
+import json
+import threading
+import time
+import pytest
+from src.agent import HealthcareAgent
+from src.config.settings import Settings
+from src.llm.fake import FakeChatBackend
+from src.models.state import PriorityLevel
+from src.serving.server import HealthcareServer, to_jsonable
+
+ANALYSIS = '{"task_type": "patient_flow", "priority": 3, "department": "ER", "context": {}}'
+
+class BlockingAgent:
+    """Stub agent whose queries wait until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def process(self, input_text, thread_id=None, context=None, deadline=None):
+        self.release.wait(5)
+        return {"response": f"answer to {input_text}\nsecond line", "thread_id": thread_id}
+
+def _start(server):
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(5)
+    return loop, thread
+
+def _stop(server, loop, thread):
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+@pytest.fixture
+def running():
+    servers = []
+
+    def start(agent, **kwargs):
+        server = HealthcareServer(agent, host="127.0.0.1", port=0, **kwargs)
+        servers.append((server,) + _start(server))
+        return server
+
+    yield start
+    for server, loop, thread in servers:
+        if isinstance(server.agent, BlockingAgent):
+            server.agent.release.set()
+        _stop(server, loop, thread)
+
+def _post(connection, path, payload):
+    connection.request("POST", path, json.dumps(payload), {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, response.read(), response
+
+def test_to_jsonable_handles_agent_values():
+    """Test enums, datetimes and tuples convert to JSON values"""
+    from datetime import datetime
+    from types import MappingProxyType
+    value = MappingProxyType({"priority": PriorityLevel.URGENT, "at": datetime(2024, 1, 1), "ids": (1, 2)})
+    assert to_jsonable(value) == {"priority": "URGENT", "at": "2024-01-01T00:00:00", "ids": [1, 2]}
+
+def test_query_over_keep_alive_connection(monkeypatch, running):
+    """Test JSON queries through the real agent reuse one connection"""
+    monkeypatch.setattr(Settings, "OPENAI_API_KEY", "test-api-key")
+    monkeypatch.setattr(Settings, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(Settings, "SEMANTIC_CACHE_SIZE", 0)
+    agent = HealthcareAgent()
+    agent.nodes["input_analyzer"].llm.client = FakeChatBackend([ANALYSIS])
+    server = running(agent)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+    status, body, _ = _post(connection, "/v1/query", {"query": "What is the ER wait time?", "thread_id": "t1"})
+    assert status == 200
+    result = json.loads(body)
+    assert result["thread_id"] == "t1"
+    assert isinstance(result["timestamp"], str)
+    assert result["response"]
+
+    status, body, _ = _post(connection, "/v1/query", {"query": ""})
+    assert status == 400
+    assert server.connections == 1
+
+    connection.request("GET", "/v1/query")
+    response = connection.getresponse()
+    response.read()
+    assert response.status == 405
+    connection.close()
+
+def test_full_queue_returns_503(running):
+    """Test requests past running plus queued capacity are rejected"""
+    agent = BlockingAgent()
+    server = running(agent, max_concurrency=1, max_queue=1)
+    results = []
+
+    def query(text):
+        connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+        results.append(_post(connection, "/v1/query", {"query": text})[0])
+
+    threads = [threading.Thread(target=query, args=(f"query {i}",)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while server.pending < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+    status, _, response = _post(connection, "/v1/query", {"query": "one too many"})
+    assert status == 503
+    assert response.getheader("Retry-After") == "1"
+
+    agent.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [200, 200]
+    assert server.pending == 0
+
+def test_stream_and_metrics(running):
+    """Test SSE events for a query and the Prometheus metrics page"""
+    agent = BlockingAgent()
+    agent.release.set()
+    server = running(agent)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+    status, body, response = _post(connection, "/v1/query/stream", {"query": "ER status", "priority": "urgent"})
+    assert status == 200
+    assert response.getheader("Content-Type") == "text/event-stream"
+    events = [line.split(": ", 1)[1] for line in body.decode().splitlines() if line.startswith("event: ")]
+    assert events == ["queued", "message", "message", "result", "done"]
+
+    connection.request("GET", "/metrics")
+    response = connection.getresponse()
+    metrics = response.read().decode()
+    assert response.status == 200
+    assert 'healthcare_http_responses_total{route="/v1/query/stream",status="200"} 1' in metrics
+    assert 'healthcare_scheduler_completed_total{priority="URGENT"} 1' in metrics
+    assert "healthcare_http_request_seconds{quantile=\"0.95\"}" in metrics
+
+@pytest.mark.parametrize("error, status, code", [
+    ("deadline", 504, "DEADLINE_EXCEEDED"),
+    ("rate", 503, "RATE_LIMITED"),
+    ("circuit", 503, "CIRCUIT_OPEN")
+])
+def test_overload_errors_keep_their_status(monkeypatch, running, error, status, code):
+    """Test shed, open-circuit and deadline failures reach the client as 503/504"""
+    from src.utils.error_handlers import CircuitOpenError, DeadlineExceededError, RateLimitError
+    monkeypatch.setattr(Settings, "OPENAI_API_KEY", "test-api-key")
+    monkeypatch.setattr(Settings, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(Settings, "SEMANTIC_CACHE_SIZE", 0)
+    agent = HealthcareAgent()
+    errors = {"deadline": DeadlineExceededError, "rate": RateLimitError, "circuit": CircuitOpenError}
+
+    def run_graph(input_text, initial_state, deadline):
+        raise errors[error](message=f"{error} failure")
+
+    agent._run_graph = run_graph
+    server = running(agent)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+    response_status, body, _ = _post(connection, "/v1/query", {"query": "What is the ER wait time?"})
+    result = json.loads(body)
+    assert response_status == status
+    assert result["error_code"] == code
+    assert result["message"] == f"{error} failure"
+
+@pytest.mark.parametrize("payload", [
+    {"query": "ER status", "timeout": "abc"},
+    {"query": "ER status", "timeout": -1},
+    {"query": "ER status", "timeout": [5]},
+    {"query": "ER status", "priority": 2.5},
+    {"query": "ER status", "priority": ["HIGH"]},
+    {"query": "ER status", "priority": "extreme"},
+    {"query": "ER status", "context": "icu"}
+])
+def test_invalid_query_fields_return_400(running, payload):
+    """Test malformed timeout, priority and context get a 400 response"""
+    agent = BlockingAgent()
+    agent.release.set()
+    server = running(agent)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+    status, body, _ = _post(connection, "/v1/query", payload)
+    assert status == 400
+    assert json.loads(body)["error"]
+    assert _post(connection, "/v1/query", {"query": "ER status", "timeout": "2.5"})[0] == 200
@@ -0,0 +1,64 @@
+import random
+import pytest
+from src.tools.admission_queue import AdmissionQueue
+
+def test_pop_returns_highest_priority_per_department():
+    """Test patients are popped in score order within their department"""
+    queue = AdmissionQueue()
+    queue.insert("p1", "routine", 10, "ER")
+    queue.insert("p2", "critical", 0, "ER")
+    queue.insert("p3", "urgent", 90, "ER")
+    queue.insert("p4", "critical", 0, "ICU")
+
+    assert queue.pop("ER")["patient_id"] == "p2"
+    assert queue.pop("ER")["patient_id"] == "p3"
+    assert queue.pop("ER")["patient_id"] == "p1"
+    assert queue.pop("ER") is None
+    assert queue.department_size("ICU") == 1
+
+def test_score_matches_assess_admission_priority_formula():
+    """Test queue scores use condition score + wait factor - load penalty"""
+    queue = AdmissionQueue(department_load={"ER": 0.9})
+    entry = queue.insert("p1", "urgent", 45, "ER")
+
+    assert entry["priority_score"] == round(8 + 1.5 - 0.9, 2)
+    assert entry["priority_level"] == "High"
+
+def test_wait_time_update_reorders_queue():
+    """Test updating a wait time moves the patient in the heap"""
+    queue = AdmissionQueue()
+    queue.insert("p1", "moderate", 0, "ER")
+    queue.insert("p2", "moderate", 10, "ER")
+
+    queue.update_wait_time("p1", 60)
+
+    assert queue.peek("ER")["patient_id"] == "p1"
+
+def test_rescore_and_tick_keep_heap_consistent():
+    """Test bulk rescoring agrees with popping order"""
+    rng = random.Random(7)
+    conditions = ["critical", "urgent", "moderate", "routine"]
+    queue = AdmissionQueue()
+    for i in range(200):
+        queue.insert(f"p{i}", rng.choice(conditions), rng.uniform(0, 120), rng.choice(["ER", "ICU"]))
+
+    queue.rescore({"ER": 0.95, "ICU": 0.5})
+    queue.tick(15)
+    queue.remove("p5")
+
+    expected = [e["patient_id"] for e in queue.snapshot("ER")]
+    popped = []
+    while queue.department_size("ER"):
+        popped.append(queue.pop("ER")["patient_id"])
+
+    assert popped == expected
+
+def test_duplicate_and_missing_patients():
+    """Test handling of duplicate inserts and unknown patients"""
+    queue = AdmissionQueue()
+    queue.insert("p1", "routine", 0, "ER")
+
+    with pytest.raises(ValueError):
+        queue.insert("p1", "routine", 0, "ER")
+    with pytest.raises(KeyError):
+        queue.update_wait_time("missing", 10)
@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from src.tools.discharge_forecast import LengthOfStayTable, DischargePredictor
+
+def test_default_table_matches_point_estimates():
+    """Test predictions without history use the condition defaults"""
+    predictor = DischargePredictor()
+    admitted = datetime(2024, 1, 1, 8, 0)
+    result = predictor.predict([admitted, admitted], ["acute", "acute"], ["General", "ICU"])
+
+    expected = result["expected_discharge"].astype(datetime)
+    assert expected[0] == admitted + timedelta(days=5)
+    assert expected[1] == admitted + timedelta(days=7.5)
+
+def test_fitted_quantiles_are_ordered(tmp_path):
+    """Test fitting from history and round-tripping the table"""
+    rng = np.random.default_rng(0)
+    los = rng.gamma(shape=2.0, scale=2.0, size=500)
+    table = LengthOfStayTable(min_samples=50).fit(["acute"] * 500, ["General"] * 500, los)
+
+    path = tmp_path / "los.json"
+    table.save(str(path))
+    loaded = LengthOfStayTable.load(str(path))
+
+    row = loaded.lookup("Acute", "general")
+    assert row["count"] == 500
+    assert row["quantiles"] == sorted(row["quantiles"])
+    assert row["mean"] == pytest.approx(los.mean())
+
+    quantiles = DischargePredictor(loaded).predict(
+        [datetime(2024, 1, 1)], ["acute"], ["General"]
+    )["discharge_quantiles"]
+    assert quantiles["p10"][0] <= quantiles["p50"][0] <= quantiles["p90"][0]
+
+def test_expected_free_beds_curve_is_monotonic():
+    """Test the hourly free-bed curve starts at current free beds and grows"""
+    rng = np.random.default_rng(1)
+    table = LengthOfStayTable(min_samples=10).fit(
+        ["routine"] * 200, ["General"] * 200, rng.uniform(1, 5, size=200)
+    )
+    now = datetime(2024, 1, 10, 12, 0)
+    admitted = [now - timedelta(hours=int(h)) for h in rng.integers(0, 120, size=240)]
+
+    curve = DischargePredictor(table).expected_free_beds(
+        admitted, ["routine"] * 240, ["General"] * 240, now=now, total_beds=300
+    )
+
+    free = curve["expected_free_beds"]
+    assert len(free) == 25
+    assert free[0] == 60
+    assert np.all(np.diff(free) >= 0)
+    assert free[-1] <= 300
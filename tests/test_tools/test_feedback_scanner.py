@@ -0,0 +1,34 @@
+import pytest
+from src.tools.feedback_scanner import FeedbackScanner
+
+def test_word_boundary_matching():
+    """Test terms only match whole words"""
+    scanner = FeedbackScanner()
+    themes = scanner.scan("I was dissatisfied with the slowness")
+
+    assert themes["negative"] == {"dissatisfied": 1}
+    assert not themes["positive"]
+
+def test_negation_flips_polarity():
+    """Test negated terms count toward the opposite polarity"""
+    scanner = FeedbackScanner()
+    themes = scanner.scan("Staff were not very helpful. The food wasn't bad, great view")
+
+    assert themes["negative"] == {"not helpful": 1}
+    assert themes["positive"] == {"not bad": 1, "great": 1}
+    assert themes["negated"] == {"helpful": 1, "bad": 1}
+
+def test_custom_lexicon_with_phrases():
+    """Test a configurable lexicon with multi-word phrases"""
+    scanner = FeedbackScanner(lexicon={"wait_time": ["long wait", "waiting room"]})
+    result = scanner.analyze(["Long  wait in the waiting room", "long wait again"])
+
+    assert result["themes"]["wait_time"] == {"long wait": 2, "waiting room": 1}
+    assert result["comments_scanned"] == 2
+
+def test_parallel_analysis_matches_serial():
+    """Test chunked parallel analysis merges to the serial result"""
+    scanner = FeedbackScanner()
+    comments = ["great care but slow discharge", "not good", "excellent, helpful nurses"] * 10000
+
+    assert scanner.analyze_parallel(comments, workers=2) == scanner.analyze(comments)
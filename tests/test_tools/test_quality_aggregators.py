@@ -0,0 +1,100 @@
+import csv
+import json
+import random
+import pytest
+from src.tools.quality_aggregators import ComplianceAggregator, OutcomesAggregator, iter_records
+
+def _compliance_checks(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "standard": rng.choice(["hand_hygiene", "med_reconciliation", "fall_risk"]),
+            "severity": rng.choice(["low", "medium", "high"]),
+            "compliant": rng.random() > 0.2,
+            "repeat_violation": rng.random() > 0.9,
+            "date": f"2024-01-{rng.randint(1, 28):02d}"
+        }
+        for _ in range(count)
+    ]
+
+def test_compliance_summary_counts():
+    """Test streaming aggregation matches a direct count"""
+    checks = _compliance_checks(500)
+    summary = ComplianceAggregator("2024-Q1").update(iter(checks)).summary()
+
+    passed = sum(1 for c in checks if c["compliant"])
+    assert summary["audit_summary"]["total_checks"] == 500
+    assert summary["audit_summary"]["passed_checks"] == passed
+    assert summary["compliance_rate"] == pytest.approx(passed / 500 * 100)
+    assert sum(v["count"] for v in summary["violations"]) == 500 - passed
+    assert len(summary["violations"]) <= 3
+
+def test_compliance_merge_equals_single_pass():
+    """Test merging chunk aggregates gives the single-pass summary"""
+    checks = _compliance_checks(300, seed=1)
+    whole = ComplianceAggregator("2024").update(checks).summary()
+
+    merged = ComplianceAggregator("2024")
+    for i in range(0, 300, 70):
+        merged.merge(ComplianceAggregator("2024").update(checks[i:i + 70]))
+
+    assert merged.summary() == whole
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+def test_compliance_from_file_in_parallel(tmp_path, suffix):
+    """Test file aggregation across workers matches in-memory aggregation"""
+    checks = _compliance_checks(400, seed=2)
+    path = tmp_path / f"audit{suffix}"
+    with open(path, "w", newline="") as f:
+        if suffix == ".jsonl":
+            for check in checks:
+                f.write(json.dumps(check) + "\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=list(checks[0]))
+            writer.writeheader()
+            writer.writerows(checks)
+
+    assert len(list(iter_records(str(path)))) == 400
+    expected = ComplianceAggregator("2024").update(checks).summary()
+    result = ComplianceAggregator.from_file(str(path), "2024", workers=3).summary()
+    assert result == expected
+
+def test_outcomes_rates_and_single_benchmark_comparison():
+    """Test outcome rates and one benchmark entry per category"""
+    outcomes = (
+        [{"category": "cardiac", "success": 1, "complication": 0, "readmission": 0}] * 60 +
+        [{"category": "cardiac", "success": 0, "complication": 1, "readmission": 1}] * 40 +
+        [{"category": "ortho", "success": True, "complication": False}] * 50
+    )
+    aggregator = OutcomesAggregator().update(outcomes)
+    summary = aggregator.summary({"cardiac": 0.9, "ortho": 0.9})
+
+    cardiac = summary["outcome_metrics"]["cardiac"]
+    assert cardiac["total_cases"] == 100
+    assert cardiac["success_rate"] == pytest.approx(0.6)
+    assert cardiac["complication_rate"] == pytest.approx(0.4)
+    assert cardiac["readmission_rate"] == pytest.approx(0.4)
+    assert [d["category"] for d in summary["critical_deviations"]] == ["cardiac"]
+    assert [s["category"] for s in summary["success_areas"]] == ["ortho"]
+
+def test_outcomes_merge_equals_single_pass():
+    """Test merged outcome aggregates match a single pass"""
+    rng = random.Random(3)
+    outcomes = [
+        {"category": rng.choice(["a", "b"]), "success": rng.random() > 0.3,
+         "complication": rng.random() > 0.8, "readmission": rng.random() > 0.9}
+        for _ in range(500)
+    ]
+    whole = OutcomesAggregator().update(outcomes).summary({"a": 0.7})
+    merged = OutcomesAggregator().update(outcomes[:123]).merge(
+        OutcomesAggregator().update(outcomes[123:])
+    )
+    assert merged.summary({"a": 0.7}) == whole
+
+def test_compliance_tool_delegates_to_aggregator():
+    """Test the compliance tool returns the aggregated per-standard summary"""
+    from src.tools.quality_tools import QualityTools
+    checks = _compliance_checks(200, seed=4)
+    result = QualityTools.track_compliance_metrics.func(None, checks, "2024-Q1")
+    assert result == ComplianceAggregator("2024-Q1").update(checks).summary()
+    assert len(result["risk_areas"]) <= 3
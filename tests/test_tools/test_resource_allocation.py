@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from src.tools.resource_allocation import ResourceAllocator, largest_remainder
+
+def test_all_resources_allocated_without_loss():
+    """Test every resource survives and rounding loses no units"""
+    result = ResourceAllocator().allocate(
+        {"ER": {"demand": 3}, "ICU": {"demand": 3}, "General": {"demand": 3}},
+        {"ventilators": 10, "monitors": 7}
+    )
+    distribution = result["recommended_distribution"]
+
+    assert set(distribution["ER"]) == {"ventilators", "monitors"}
+    assert sum(d["monitors"] for d in distribution.values()) == 7
+    assert sum(d["ventilators"] for d in distribution.values()) == 10
+    assert result["resource_sharing"] == []
+
+def test_scalar_demand_is_weight_and_mapping_is_units():
+    """Test scalar demand shares everything by weight while unit counts cap allocation"""
+    allocator = ResourceAllocator()
+    result = allocator.allocate({"ER": {"demand": 2}, "ICU": {"demand": 1}}, {"beds": 30})
+    assert result["recommended_distribution"] == {"ER": {"beds": 20}, "ICU": {"beds": 10}}
+
+    result = allocator.allocate(
+        {"ER": {"demand": {"beds": 4}}, "ICU": {"demand": {"beds": 2, "monitors": 1}}},
+        {"beds": 30, "monitors": 5}
+    )
+    assert result["recommended_distribution"]["ER"] == {"beds": 4, "monitors": 0}
+    assert result["resource_sharing"] == [
+        {"resource": "beds", "surplus": 24},
+        {"resource": "monitors", "surplus": 4}
+    ]
+
+    # Weights absorb what unit-count demand leaves
+    result = allocator.allocate({"ER": {"demand": {"beds": 4}}, "ICU": {"demand": 1}}, {"beds": 30})
+    assert result["recommended_distribution"] == {"ER": {"beds": 4}, "ICU": {"beds": 26}}
+
+def test_zero_demand_and_minimum_guarantees():
+    """Test zero demand is handled and minimums are served first"""
+    allocator = ResourceAllocator()
+    result = allocator.allocate({"ER": {"demand": 0}, "ICU": {"demand": 0}}, {"beds": 5})
+    assert result["recommended_distribution"] == {"ER": {"beds": 0}, "ICU": {"beds": 0}}
+
+    result = allocator.allocate(
+        {"ER": {"demand": 100, "minimum": 1}, "ICU": {"demand": 1, "minimum": 4}},
+        {"beds": 10}
+    )
+    assert result["recommended_distribution"]["ICU"]["beds"] >= 4
+    assert result["unmet_demands"] == []
+
+def test_lp_mode_prefers_priority():
+    """Test LP mode fills higher priority departments first"""
+    result = ResourceAllocator(mode="lp").allocate(
+        {"ER": {"demand": 8, "priority": 5}, "General": {"demand": 8, "priority": 1}},
+        {"nurses": 10}
+    )
+    assert result["recommended_distribution"]["ER"]["nurses"] == 8
+    assert result["recommended_distribution"]["General"]["nurses"] == 2
+
+def test_matrix_scale_conserves_totals():
+    """Test large matrices allocate exactly the available units"""
+    rng = np.random.default_rng(0)
+    demand = rng.integers(0, 50, size=(2000, 300))
+    available = rng.integers(1000, 20000, size=300)
+
+    allocated = ResourceAllocator().allocate_matrix(demand, available)
+
+    assert np.all(allocated <= demand)
+    np.testing.assert_array_equal(
+        allocated.sum(axis=0), np.minimum(available, demand.sum(axis=0))
+    )
+
+def test_largest_remainder_rounding():
+    """Test largest remainder keeps column totals"""
+    shares = np.array([[1 / 3], [1 / 3], [1 / 3]]) * 10
+    assert largest_remainder(shares, np.array([10])).ravel().tolist() == [4, 3, 3]
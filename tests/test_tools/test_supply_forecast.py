@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from src.tools.supply_forecast import SupplyForecaster
+
+def test_constant_consumption_projects_exact_stockout():
+    """Test a steady burn rate gives inventory / rate days"""
+    history = np.full((2, 30), 10.0)
+    result = SupplyForecaster().forecast(history, [100.0, 1000.0], [3, 3], as_of=datetime(2024, 1, 1))
+
+    assert result["rate"] == pytest.approx([10.0, 10.0])
+    assert result["days_to_stockout"] == pytest.approx([10.0, 100.0])
+    assert str(result["stockout_date"][0]) == "2024-01-11T00:00:00"
+    assert result["reorder_needed"].tolist() == [False, False]
+
+def test_confidence_bounds_and_reorder():
+    """Test noisy consumption widens bounds and triggers reorder near lead time"""
+    rng = np.random.default_rng(0)
+    history = rng.poisson(20, size=(20000, 90)).astype(float)
+    inventory = np.where(np.arange(20000) % 2 == 0, 50.0, 5000.0)
+    forecaster = SupplyForecaster()
+    result = forecaster.forecast(history, inventory, np.full(20000, 5.0))
+
+    assert np.all(result["days_to_stockout_low"] <= result["days_to_stockout"])
+    assert np.all(result["days_to_stockout"] <= result["days_to_stockout_high"])
+    assert result["reorder_needed"][::2].all()
+    assert not result["reorder_needed"][1::2].any()
+    assert result["critical"][::2].all()
+
+    skus = [f"SKU-{i}" for i in range(20000)]
+    recommendations = forecaster.recommendations(result, skus, limit=5)
+    assert len(recommendations) == 5
+    assert recommendations[0]["priority"] == "critical"
+    assert recommendations[0]["reorder_quantity"] > 0
+
+def test_zero_consumption_never_stocks_out():
+    """Test SKUs without consumption have no stock-out date"""
+    result = SupplyForecaster().forecast(np.zeros((1, 10)), [5.0], [2])
+
+    assert np.isinf(result["days_to_stockout"][0])
+    assert np.isnat(result["stockout_date"][0])
+
+def test_supply_tool_forecasts_items_with_history():
+    """Test items with consumption history use the forecaster, others the point estimate"""
+    from src.tools.resource_tools import ResourceTools
+    analysis = ResourceTools.analyze_supply_levels.func(
+        None,
+        {"gowns": 40.0, "gloves": 500.0, "masks": 0.1},
+        {"gowns": 5.0, "masks": 1.0},
+        {},
+        consumption_history={"gowns": [10, 12, 15, 18, 20, 24, 28, 30], "gloves": [20] * 30}
+    )
+
+    # A point estimate of 40 / 5 gives 8 days; the rising trend gives under 2
+    assert [entry["item"] for entry in analysis["critical_items"]] == ["gowns", "masks"]
+    assert analysis["critical_items"][0]["days_remaining"] < 2
+    assert analysis["adequate_supplies"] == ["gloves"]
+    assert analysis["recommendations"][0]["item"] == "gowns"
+    assert analysis["recommendations"][0]["reorder_quantity"] > 0
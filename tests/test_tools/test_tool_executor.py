@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+import numpy as np
+import pytest
+from src.llm.context import request_scope
+from src.tools.executor import ToolExecutor, payload_size
+from src.tools.resource_allocation import ResourceAllocator
+from src.tools.supply_forecast import SupplyForecaster
+from src.utils.error_handlers import DeadlineExceededError
+
+@pytest.fixture(scope="module")
+def executor():
+    executor = ToolExecutor(workers=2, inline_bytes=64 * 1024, pooled_tools=["slow_sleep"])
+    yield executor
+    executor.shutdown()
+
+def _shared_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")} \
+        if os.path.isdir("/dev/shm") else set()
+
+def test_payload_size_counts_arrays_and_items():
+    """Test inline/pool sizing sees array buffers and nested records"""
+    assert payload_size(np.zeros((100, 10))) == 8000
+    assert payload_size([{"id": 1}, {"id": 2}]) > payload_size([{"id": 1}])
+
+def test_small_inputs_run_inline(executor):
+    """Test calls below the threshold never start the pool"""
+    allocator = ResourceAllocator()
+    demand = np.array([[5.0, 2.0], [3.0, 4.0]])
+    result = executor.run("allocate", allocator.allocate_matrix, demand, np.array([6, 5]))
+    assert result.sum(axis=0).tolist() == [6, 5]
+    assert executor.stats()["tools"]["allocate"]["inline"] == 1
+
+def test_large_arrays_run_in_pool_through_shared_memory(executor):
+    """Test pooled results match inline ones and temporary blocks are freed"""
+    forecaster = SupplyForecaster()
+    rng = np.random.default_rng(0)
+    history = rng.poisson(20, size=(2000, 90)).astype(np.float64)
+    inventory = rng.integers(0, 600, size=2000)
+    before = _shared_blocks()
+
+    pooled = executor.run("forecast", forecaster.forecast, history, inventory, 3.0)
+    inline = forecaster.forecast(history, inventory, 3.0)
+    np.testing.assert_allclose(pooled["reorder_point"], inline["reorder_point"])
+
+    stats = executor.stats()["tools"]["forecast"]
+    assert stats["pooled"] == 1
+    assert stats["shared_bytes"] == history.nbytes + inventory.nbytes
+    assert stats["p50_exec_ms"] > 0
+    assert _shared_blocks() == before
+
+def test_shared_array_is_passed_in_place(executor):
+    """Test arrays allocated by the executor are referenced, not copied"""
+    history = executor.shared_array((4000, 30))
+    history[...] = np.random.default_rng(1).poisson(10, size=history.shape)
+    blocks = _shared_blocks()
+    try:
+        result = asyncio.run(
+            executor.arun("forecast_shared", SupplyForecaster().smooth, history[1000:3000])
+        )
+        assert result["level"].shape == (2000,)
+        assert _shared_blocks() == blocks
+
+        # The worker writes into the caller's memory
+        expected = -history[:3000].copy()
+        executor.run("negate", np.negative, history[:3000], out=history[:3000])
+        assert executor.stats()["tools"]["negate"]["pooled"] == 1
+        np.testing.assert_array_equal(history[:3000], expected)
+        assert executor.stats()["shared_arrays"] == 1
+    finally:
+        executor.release(history)
+    assert executor.stats()["shared_arrays"] == 0
+
+def test_pooled_errors_and_deadlines(executor):
+    """Test worker exceptions propagate and waiting stops at the deadline"""
+    with pytest.raises(ValueError, match="Unknown allocation mode"):
+        executor.run("slow_sleep", ResourceAllocator().allocate_matrix,
+                     np.ones((2, 2)), np.array([1, 1]), mode="greedy")
+    assert executor.stats()["tools"]["slow_sleep"]["errors"] == 1
+
+    started = time.monotonic()
+    with request_scope(deadline=time.monotonic() + 0.2):
+        with pytest.raises(DeadlineExceededError):
+            executor.run("slow_sleep", time.sleep, 2)
+    assert time.monotonic() - started < 1.5
@@ -0,0 +1,128 @@
+import asyncio
+import random
+import time
+import pytest
+from src.config.settings import Settings
+from src.llm.fake import FakeBackendError, FakeChatBackend
+from src.llm.pool import ModelPool
+from src.utils.error_handlers import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    ValidationError,
+    is_transient_error
+)
+
+def _flaky(failures, error=FakeBackendError):
+    calls = []
+
+    def operation():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error()
+        return "ok"
+    return operation, calls
+
+def test_transient_error_classification():
+    """Test which failures are considered worth retrying"""
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(FakeBackendError(status_code=503))
+    assert is_transient_error(FakeBackendError(status_code=429))
+    assert not is_transient_error(FakeBackendError(status_code=400))
+    assert not is_transient_error(ValidationError("bad"))
+    assert not is_transient_error(ValueError("bad"))
+
+def test_full_jitter_backoff_bounds():
+    """Test backoff delays are uniform up to the capped exponential"""
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, rng=random.Random(1))
+    delays = [policy.backoff(attempt) for attempt in range(6) for _ in range(50)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert max(policy.backoff(0) for _ in range(50)) <= 1.0
+    assert len(set(delays)) == len(delays)
+
+def test_retries_transient_failures():
+    """Test transient failures are retried and others are raised at once"""
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    operation, calls = _flaky(2)
+    assert policy.call(operation) == "ok"
+    assert len(calls) == 3
+
+    operation, calls = _flaky(1, error=ValueError)
+    with pytest.raises(ValueError):
+        policy.call(operation)
+    assert len(calls) == 1
+    assert policy.stats()["retries"] == 2
+
+def test_retry_respects_deadline_and_budget():
+    """Test retries stop at the deadline and when the budget is spent"""
+    policy = RetryPolicy(max_attempts=5, base_delay=10, max_delay=10, rng=random.Random(0))
+    operation, calls = _flaky(5)
+    with pytest.raises(FakeBackendError):
+        policy.call(operation, deadline=time.monotonic() + 0.05)
+    assert len(calls) == 1
+    assert policy.stats()["deadline_exceeded"] == 1
+
+    policy = RetryPolicy(max_attempts=5, base_delay=0.001, budget_ratio=0.0, budget_burst=2)
+    operation, calls = _flaky(10)
+    with pytest.raises(FakeBackendError):
+        policy.call(operation)
+    assert len(calls) == 3
+    assert policy.stats()["budget_exhausted"] == 1
+
+def test_async_retry():
+    """Test the async policy retries without blocking the event loop"""
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    attempts = []
+
+    async def operation():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError()
+        return "done"
+
+    assert asyncio.run(policy.acall(operation)) == "done"
+    assert len(attempts) == 3
+
+def test_circuit_breaker_half_open_probe():
+    """Test the breaker opens, rejects, then probes before closing"""
+    now = [0.0]
+    breaker = CircuitBreaker("model", failure_threshold=2, recovery_timeout=10, clock=lambda: now[0])
+    for _ in range(2):
+        breaker.record_failure(TimeoutError())
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    now[0] = 11
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 22
+    breaker.allow()
+    breaker.record_success()
+    stats = breaker.stats()
+    assert stats["state"] == CircuitBreaker.CLOSED
+    assert stats["opened"] == 2
+    assert stats["rejected"] == 2
+
+def test_node_model_fails_fast_when_circuit_open(monkeypatch):
+    """Test model calls stop reaching a failing backend once the circuit opens"""
+    monkeypatch.setattr(Settings, "LLM_BREAKER_THRESHOLD", 3)
+    monkeypatch.setattr(Settings, "LLM_RETRY_BASE_DELAY", 0.001)
+    backend = FakeChatBackend(error_rate=1.0)
+    pool = ModelPool(factory=lambda config: backend, overrides={"api_key": "test"})
+    model = pool.for_node("patient_flow")
+
+    with pytest.raises(FakeBackendError):
+        model.invoke("first")
+    with pytest.raises(CircuitOpenError):
+        model.invoke("second")
+
+    stats = pool.resilience_stats()
+    assert backend.calls == 3
+    assert stats["circuits"][model.model]["state"] == CircuitBreaker.OPEN
+    assert stats["retry"]["retries"] == 2